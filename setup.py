@@ -10,6 +10,6 @@ setuptools.setup(
     author='Bryan Cardwell',
     author_email='bryan.cardwell@cern.ch',
     license='BSD 3-clause',
-    packages=['sidm', 'sidm.tools', 'sidm.definitions'],
+    packages=['sidm', 'sidm.tools', 'sidm.definitions', 'sidm.benchmarks'],
     include_package_data=True,
 )
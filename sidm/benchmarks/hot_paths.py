@@ -0,0 +1,125 @@
+"""Benchmark the SidmProcessor hot paths on synthetic events
+
+SidmProcessor.process runs with profile=True on synthetic chunks of several sizes, so that no
+remote ntuples are needed, and the time it reports for each stage is tabulated along with the wall
+time of the whole call. Events are reread from disk for every repetition so that lazy column
+loading is included in the timings, as it would be in a real run.
+
+Usage: python -m sidm.benchmarks.hot_paths [-s 1000 10000] [-c 2mu2e 4mu] [-H base] [-r 3]
+                                           [-l 0.4 0.2] [-m muons=3 electrons=2] [--pushdown]
+                                           [--cascade]
+"""
+
+# python
+import argparse
+import os
+import tempfile
+import time
+import warnings
+# columnar analysis
+import numpy as np
+from tabulate import tabulate
+# local
+from sidm.tools import synthetic
+from sidm.tools.sidm_processor import SidmProcessor
+
+
+def run_stages(p, events):
+    """Run p.process on events and return the time spent per stage, including "total"
+
+    p must have been made with profile=True.
+    """
+    start = time.perf_counter()
+    out = p.process(events)
+    total = time.perf_counter() - start
+    timings = dict(next(iter(out.values()))["timing"])
+    timings["total"] = total
+    return timings
+
+
+def benchmark(chunk_sizes, channels, hist_collections, repeats=3, multiplicities=None, seed=0,
+              work_dir=None, **processor_options):
+    """Return median time per stage and chunk size as {chunk_size: {stage: seconds}}
+
+    processor_options, e.g. pushdown=True, are passed to SidmProcessor.
+    """
+    work_dir = tempfile.mkdtemp(prefix="sidm_bench_") if work_dir is None else work_dir
+    p = SidmProcessor(channels, hist_collections, profile=True, **processor_options)
+
+    def events(chunk_size):
+        path = os.path.join(work_dir, f"synthetic_{chunk_size}_{seed}.root")
+        return synthetic.make_events(chunk_size, multiplicities, seed, path=path)
+
+    # compile numba kernels and load fastjet before timing anything
+    run_stages(p, events(min(chunk_sizes)))
+
+    results = {}
+    for chunk_size in chunk_sizes:
+        all_timings = [run_stages(p, events(chunk_size)) for _ in range(repeats)]
+        # stages in the order the processor first ran them
+        stages = list(dict.fromkeys(s for t in all_timings for s in t))
+        results[chunk_size] = {s: float(np.median([t.get(s, 0.0) for t in all_timings]))
+                               for s in stages}
+    return results
+
+
+def print_results(results):
+    """Print one row per stage with the time and throughput at each chunk size"""
+    headers = ["stage"]
+    for chunk_size in results:
+        headers += [f"{chunk_size} evts [ms]", f"{chunk_size} evts [evts/s]"]
+    # total is the wall time of process, which includes work outside the timed stages
+    stages = [s for s in dict.fromkeys(s for t in results.values() for s in t) if s != "total"]
+    rows = []
+    for stage in stages + ["total"]:
+        row = [stage]
+        for chunk_size, timings in results.items():
+            t = timings.get(stage, 0.0)
+            row += [1000*t, chunk_size/t if t > 0 else float("nan")]
+        rows.append(row)
+    print(tabulate(rows, headers, floatfmt=".1f"))
+
+
+def parse_multiplicities(pairs):
+    """Turn ["muons=3", "genAs=2"] into {"muons": 3.0, "genAs": 2.0}"""
+    multiplicities = {}
+    for pair in pairs:
+        name, val = pair.split("=")
+        if name not in synthetic.default_multiplicities:
+            raise ValueError(f"Unknown collection {name}. "
+                             f"Options are {list(synthetic.default_multiplicities)}")
+        multiplicities[name] = float(val)
+    return multiplicities
+
+
+def main():
+    """Parse arguments, run the benchmark, and print results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-s", "--chunk-sizes", dest="chunk_sizes", type=int, nargs="+",
+                        default=[1000, 10000, 50000])
+    parser.add_argument("-c", "--channels", nargs="+", default=["2mu2e", "4mu"])
+    parser.add_argument("-H", "--hist-collections", dest="hist_collections", nargs="+",
+                        default=["base"])
+    parser.add_argument("-r", "--repeats", type=int, default=3)
+    parser.add_argument("-l", "--lj-reco-choices", dest="lj_reco_choices", nargs="+",
+                        default=["0.4"])
+    parser.add_argument("-m", "--multiplicities", nargs="*", default=[],
+                        help="Mean number of objects per event, e.g. muons=3 dsaMuons=2")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pushdown", action="store_true",
+                        help="Apply shared cheap event cuts before building objects")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Only evaluate event cuts on events that passed preceding cuts")
+    args = parser.parse_args()
+
+    # processor warnings about unfillable hists are not interesting here
+    warnings.filterwarnings("ignore")
+    results = benchmark(args.chunk_sizes, args.channels, args.hist_collections, args.repeats,
+                        parse_multiplicities(args.multiplicities), args.seed,
+                        lj_reco_choices=args.lj_reco_choices, pushdown=args.pushdown,
+                        cascade=args.cascade)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark the cold import time of sidm modules
+
+Each module is imported in a fresh interpreter so that nothing is cached from earlier imports,
+which is what a Dask worker or a new notebook kernel pays at startup. The time to build the hists
+of a hist collection is measured as well, since hist_defs only builds the hists a run requests.
+
+Usage: python -m sidm.benchmarks.import_cost [-m sidm.tools.utilities ...] [-H base] [-r 5]
+"""
+
+# python
+import argparse
+import statistics
+import subprocess
+import sys
+# columnar analysis
+from tabulate import tabulate
+
+
+default_modules = [
+    "sidm.tools.utilities",
+    "sidm.tools.plotting",
+    "sidm.definitions.hists",
+    "sidm.tools.sidm_processor",
+]
+
+# import a module and print the elapsed time; run with python -c in a fresh interpreter
+import_snippet = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(int("matplotlib" in sys.modules))
+"""
+
+# import all definitions, then time building the hists of one collection
+build_snippet = """
+import time
+from sidm import BASE_DIR
+from sidm.tools import utilities
+from sidm.definitions.hists import hist_defs
+names = utilities.flatten(utilities.load_yaml(f"{{BASE_DIR}}/configs/hist_collections.yaml")["{collection}"])
+start = time.perf_counter()
+for name in names:
+    hist_defs[name]
+print(time.perf_counter() - start)
+print(len(names))
+"""
+
+
+def run_snippet(snippet):
+    """Run snippet in a fresh interpreter and return its printed lines"""
+    result = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True,
+                            check=True)
+    return result.stdout.split()
+
+
+def measure_imports(modules, repeats=5):
+    """Return {module: (median seconds, whether matplotlib was imported)}"""
+    results = {}
+    for module in modules:
+        outputs = [run_snippet(import_snippet.format(module=module)) for _ in range(repeats)]
+        results[module] = (statistics.median(float(o[0]) for o in outputs),
+                           bool(int(outputs[0][1])))
+    return results
+
+
+def measure_builds(collections, repeats=5):
+    """Return {hist collection: (median seconds to build its hists, number of hists)}"""
+    results = {}
+    for collection in collections:
+        outputs = [run_snippet(build_snippet.format(collection=collection))
+                   for _ in range(repeats)]
+        results[collection] = (statistics.median(float(o[0]) for o in outputs), int(outputs[0][1]))
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark, and print results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("-m", "--modules", nargs="+", default=default_modules)
+    parser.add_argument("-H", "--hist-collections", dest="hist_collections", nargs="+",
+                        default=["base"])
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = measure_imports(args.modules, args.repeats)
+    print(tabulate([(m, 1000*t, "yes" if mpl else "no") for m, (t, mpl) in imports.items()],
+                   ["module", "cold import [ms]", "imports matplotlib"], floatfmt=".0f"))
+    print()
+    builds = measure_builds(args.hist_collections, args.repeats)
+    print(tabulate([(c, n, 1000*t) for c, (t, n) in builds.items()],
+                   ["hist collection", "N hists", "build time [ms]"], floatfmt=".1f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Compare the read throughput of I/O profiles on local files
+
+Every profile in sidm/configs/io_profiles.yaml (or those given with -p) runs the same processor
+over the same local files, chunk by chunk, with sidm.tools.fileset_planner.WorkUnitProcessor. The
+wall time, events/s, MB/s, and number of read requests of each profile are printed. MB/s counts
+the compressed bytes requested from the files, so it measures how fast columns are delivered to
+the processor rather than the size of the files. By default the files are synthetic (see
+sidm.tools.synthetic); local copies of real ntuples can be given with --files instead.
+
+Local reads are cheap, so this mostly shows the cost of decompression and of coalescing columns
+into one request. The benefit of fewer, larger requests over a high-latency link such as xcache
+can only be measured there, e.g. by passing the root:// paths of real files with --files.
+
+Usage: python -m sidm.benchmarks.io_profiles [-p local-ssd remote-high-latency] [-n 4]
+           [-e 20000] [-c 4mu] [--files a.root b.root]
+"""
+
+# python
+import argparse
+import os
+import tempfile
+import time
+import warnings
+# columnar analysis
+from tabulate import tabulate
+# local
+from sidm import BASE_DIR
+from sidm.tools import synthetic, utilities
+from sidm.tools.fileset_planner import WorkUnit, WorkUnitProcessor, count_entries
+from sidm.tools.io_profile import load_profile
+from sidm.tools.sidm_processor import SidmProcessor
+
+
+def write_files(n_files, n_events, work_dir, seed=0):
+    """Write n_files synthetic files of n_events each and return their paths"""
+    paths = []
+    for i in range(n_files):
+        path = os.path.join(work_dir, f"io_{n_events}_{seed + i}.root")
+        if not os.path.exists(path):
+            synthetic.write_root(path, n_events, seed=seed + i)
+        paths.append(path)
+    return paths
+
+
+def measure(profile, files, channels, hist_collections, chunksize=None):
+    """Return (wall time, events, bytes, requests) of processing files with profile"""
+    p = SidmProcessor(channels, hist_collections)
+    chunksize = profile.chunksize if chunksize is None else chunksize
+    function = WorkUnitProcessor(p, chunksize=chunksize, io_profile=profile)
+    # one work unit per file, split into chunks of chunksize as when running
+    units = [WorkUnit("benchmark", [(path, 0, n)]) for path, n in count_entries(files).items()]
+
+    n_events = n_bytes = n_requests = 0
+    start = time.perf_counter()
+    for unit in units:
+        function.columns = [] # columns are learned anew in every work unit
+        for path, entry_start, entry_stop in function.chunks(unit):
+            _, read_stats = function.process_chunk(path, unit.dataset, entry_start, entry_stop)
+            n_events += entry_stop - entry_start
+            n_bytes += read_stats["bytes"]
+            n_requests += read_stats["requests"]
+    return time.perf_counter() - start, n_events, n_bytes, n_requests
+
+
+def benchmark(profiles, files, channels, hist_collections, chunksize=None):
+    """Return rows of (profile, chunksize, wall time, events/s, MB/s, requests)"""
+    # compile numba kernels and load fastjet before timing anything
+    measure(load_profile("default"), files[:1], channels, hist_collections, chunksize=1000)
+
+    rows = []
+    for name in profiles:
+        profile = load_profile(name)
+        wall_time, n_events, n_bytes, n_requests = measure(profile, files, channels,
+                                                           hist_collections, chunksize)
+        rows.append((name, profile.chunksize if chunksize is None else chunksize, wall_time,
+                     n_events/wall_time, n_bytes/1e6/wall_time, n_requests))
+    return rows
+
+
+def main():
+    """Parse arguments, run the benchmark, and print results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("-p", "--profiles", nargs="+", default=None,
+                        help="Names of profiles in sidm/configs/io_profiles.yaml (default: all)")
+    parser.add_argument("-n", "--n-files", dest="n_files", type=int, default=4)
+    parser.add_argument("-e", "--events-per-file", dest="n_events", type=int, default=20000)
+    parser.add_argument("-s", "--chunksize", type=int, default=None,
+                        help="Entries per processor call for every profile (default: per profile)")
+    parser.add_argument("-c", "--channels", nargs="+", default=["4mu"])
+    parser.add_argument("-H", "--hist-collections", dest="hist_collections", nargs="+",
+                        default=["base"])
+    parser.add_argument("--files", nargs="+", default=None,
+                        help="Files to read instead of synthetic ones")
+    parser.add_argument("--work-dir", dest="work_dir", default=None,
+                        help="Directory in which to write (or reuse) the synthetic files")
+    args = parser.parse_args()
+
+    profiles = args.profiles or list(utilities.load_yaml(f"{BASE_DIR}/configs/io_profiles.yaml"))
+    files = args.files
+    if files is None:
+        work_dir = args.work_dir or tempfile.mkdtemp(prefix="sidm_io_")
+        files = write_files(args.n_files, args.n_events, work_dir)
+
+    # processor warnings about unfillable hists are not interesting here
+    warnings.filterwarnings("ignore")
+    rows = benchmark(profiles, files, args.channels, args.hist_collections, args.chunksize)
+    print(tabulate(rows, ["profile", "chunksize", "wall time [s]", "evts/s", "MB/s", "requests"],
+                   floatfmt=".1f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Track SidmProcessor performance across commits
+
+The run command executes a fixed set of processor configurations on pinned local inputs and
+records events/s, the time spent in each processing stage, and the peak memory of each
+configuration in a history file keyed by git commit. Each configuration runs in a fresh process so
+that peak memory and timings are not polluted by earlier configurations. The report command
+compares one commit with the stored baseline and flags every metric that worsened by more than a
+threshold; it exits with a nonzero status if any metric was flagged.
+
+By default the inputs are synthetic files (see sidm.tools.synthetic) whose seeds and sizes are
+fixed below, so results are comparable between commits and machines with the same hardware. A
+yaml file of the form {dataset: [local files]} can be supplied instead with --fileset.
+
+Usage:
+    python -m sidm.benchmarks.regression run [--set-baseline] [--configs 4mu_base ...]
+    python -m sidm.benchmarks.regression report [--baseline COMMIT] [--threshold 0.1]
+"""
+
+# python
+import argparse
+import concurrent.futures
+import datetime
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import time
+import warnings
+# columnar analysis
+from coffea import processor
+from coffea.nanoevents import NanoAODSchema
+from tabulate import tabulate
+# local
+from sidm import BASE_DIR
+from sidm.tools import synthetic, utilities
+
+
+default_history = os.path.join(os.path.expanduser("~"), ".sidm", "benchmark_history.json")
+default_input_dir = os.path.join(os.path.expanduser("~"), ".sidm", "benchmark_inputs")
+
+# never change these: they define the inputs that all stored results refer to
+pinned_inputs = {
+    "4mu": {"n_events": 20000, "seed": 4, "mu_fraction": 1.0},
+    "2mu2e": {"n_events": 20000, "seed": 22, "mu_fraction": 0.5},
+}
+
+configs = {
+    "4mu_base": {"channels": ["4mu"], "hist_collections": ["base"], "input": "4mu"},
+    "2mu2e_base": {"channels": ["2mu2e"], "hist_collections": ["base"], "input": "2mu2e"},
+    "llpnano_base": {"channels": ["llpnano"], "hist_collections": ["base"], "input": "2mu2e"},
+}
+
+# metrics for which larger values are better; all others are times or memory
+higher_is_better = ["events/s"]
+
+
+def pinned_fileset(input_dir):
+    """Return {input name: [path]}, writing any pinned synthetic inputs that do not exist yet"""
+    os.makedirs(input_dir, exist_ok=True)
+    fileset = {}
+    for name, spec in pinned_inputs.items():
+        path = os.path.join(input_dir, f"{name}_{spec['n_events']}_{spec['seed']}.root")
+        if not os.path.exists(path):
+            synthetic.write_root(path, spec["n_events"], seed=spec["seed"],
+                                 mu_fraction=spec["mu_fraction"])
+        fileset[name] = [path]
+    return fileset
+
+
+def measure(config, fileset, chunksize):
+    """Run one configuration and return its metrics; meant to be called in a fresh process"""
+    # local
+    from sidm.tools.sidm_processor import SidmProcessor # pylint: disable=import-outside-toplevel
+    warnings.filterwarnings("ignore")
+
+    p = SidmProcessor(config["channels"], config["hist_collections"], profile=True)
+
+    # compile numba kernels and load fastjet before timing anything
+    warmup = processor.Runner(executor=processor.IterativeExecutor(), schema=NanoAODSchema,
+                              chunksize=1000, maxchunks=1)
+    warmup({"warmup": next(iter(fileset.values()))[:1]}, "Events", processor_instance=p)
+
+    runner = processor.Runner(executor=processor.IterativeExecutor(), schema=NanoAODSchema,
+                              chunksize=chunksize, savemetrics=True)
+    start = time.perf_counter()
+    out, run_metrics = runner(fileset, "Events", processor_instance=p)
+    wall_time = time.perf_counter() - start
+
+    stage_times = {}
+    for dataset_out in out.values():
+        for stage, seconds in dataset_out["timing"].items():
+            stage_times[stage] = stage_times.get(stage, 0.0) + seconds
+
+    metrics = {
+        "events/s": run_metrics["entries"]/wall_time,
+        "wall time [s]": wall_time,
+        # ru_maxrss is reported in kB on Linux
+        "peak memory [MB]": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024,
+    }
+    for stage, seconds in stage_times.items():
+        metrics[f"{stage} [s]"] = seconds
+    return metrics
+
+
+def git_commit():
+    """Return the current commit hash and whether the working tree has uncommitted changes"""
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=BASE_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    return git("rev-parse", "HEAD"), bool(git("status", "--porcelain", "--untracked-files=no"))
+
+
+def load_history(path):
+    """Load benchmark history, returning an empty history if the file doesn't exist"""
+    if not os.path.exists(path):
+        return {"baseline": None, "runs": {}}
+    with open(path, encoding="utf8") as history_file:
+        return json.load(history_file)
+
+
+def save_history(history, path):
+    """Write benchmark history"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf8") as history_file:
+        json.dump(history, history_file, indent=2, sort_keys=True)
+
+
+def run(config_names, history_path, input_dir, fileset_cfg=None, chunksize=10000,
+        set_baseline=False):
+    """Measure each configuration and store the results under the current commit"""
+    if fileset_cfg is not None:
+        all_inputs = utilities.load_yaml(fileset_cfg)
+    else:
+        all_inputs = pinned_fileset(input_dir)
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name in config_names:
+        config = configs[name]
+        # run on the pinned input for this config, or on every dataset of a custom fileset
+        fileset = all_inputs if fileset_cfg is not None else {name: all_inputs[config["input"]]}
+        print(f"Running {name}")
+        with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as pool:
+            results[name] = pool.submit(measure, config, fileset, chunksize).result()
+
+    commit, dirty = git_commit()
+    history = load_history(history_path)
+    history["runs"][commit] = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "dirty": dirty,
+        "chunksize": chunksize,
+        "inputs": fileset_cfg if fileset_cfg is not None else pinned_inputs,
+        "results": results,
+    }
+    if set_baseline or history["baseline"] is None:
+        history["baseline"] = commit
+    save_history(history, history_path)
+    if dirty:
+        print("Warning: working tree has uncommitted changes; "
+              f"results are stored under {commit} anyway")
+    return commit
+
+
+def resolve_commit(history, commit):
+    """Return the full hash of the stored commit that starts with commit"""
+    matches = [c for c in history["runs"] if commit is not None and c.startswith(commit)]
+    if len(matches) != 1:
+        raise KeyError(f"Expected exactly one stored commit matching {commit}, found {matches}")
+    return matches[0]
+
+
+def compare(baseline_results, results, threshold=0.1, min_time=0.05):
+    """Return rows of (config, metric, baseline, current, relative change, flagged)
+
+    A metric is flagged if it worsened by more than threshold (as a fraction of the baseline).
+    Times below min_time seconds in both runs are too noisy to flag and are never flagged.
+    """
+    rows = []
+    for config, metrics in results.items():
+        if config not in baseline_results:
+            continue
+        for metric, value in metrics.items():
+            ref = baseline_results[config].get(metric)
+            if ref is None or ref == 0:
+                continue
+            change = (value - ref)/ref
+            worsening = -change if metric in higher_is_better else change
+            too_small = metric.endswith("[s]") and max(value, ref) < min_time
+            rows.append((config, metric, ref, value, change,
+                         worsening > threshold and not too_small))
+    return rows
+
+
+def report(history_path, commit=None, baseline=None, threshold=0.1, min_time=0.05,
+           only_flagged=False):
+    """Print comparison of commit with baseline and return True if any metric was flagged"""
+    history = load_history(history_path)
+    if not history["runs"]:
+        raise RuntimeError(f"No benchmark results stored in {history_path}")
+    baseline = history["baseline"] if baseline is None else baseline
+    if commit is None:
+        commit = max(history["runs"], key=lambda c: history["runs"][c]["date"])
+    baseline, commit = (resolve_commit(history, c) for c in (baseline, commit))
+
+    rows = compare(history["runs"][baseline]["results"], history["runs"][commit]["results"],
+                   threshold, min_time)
+    flagged = [r for r in rows if r[-1]]
+    shown = flagged if only_flagged else rows
+    print(f"Comparing {commit[:10]} to baseline {baseline[:10]} (threshold {100*threshold:.0f}%)")
+    print(tabulate(
+        [[c, m, ref, val, f"{100*change:+.1f}%", "REGRESSION" if flag else ""]
+         for c, m, ref, val, change, flag in shown],
+        ["config", "metric", "baseline", "current", "change", ""],
+        floatfmt=".3g",
+    ))
+    print(f"{len(flagged)} of {len(rows)} metrics worsened by more than {100*threshold:.0f}%")
+    return bool(flagged)
+
+
+def main():
+    """Parse arguments and run or report"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--history", default=default_history,
+                        help=f"History file (default {default_history})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Measure configurations at the current commit")
+    run_parser.add_argument("--configs", nargs="+", choices=list(configs), default=list(configs))
+    run_parser.add_argument("--inputs", default=default_input_dir,
+                            help="Directory in which pinned synthetic inputs are stored")
+    run_parser.add_argument("--fileset", default=None,
+                            help="yaml file of {dataset: [local files]} to use instead")
+    run_parser.add_argument("--chunksize", type=int, default=10000)
+    run_parser.add_argument("--set-baseline", dest="set_baseline", action="store_true",
+                            help="Use this commit as the baseline for future reports")
+
+    report_parser = commands.add_parser("report", help="Compare a commit with the baseline")
+    report_parser.add_argument("--commit", default=None, help="Default: most recent run")
+    report_parser.add_argument("--baseline", default=None, help="Default: stored baseline")
+    report_parser.add_argument("--threshold", type=float, default=0.1,
+                               help="Flag metrics that worsen by more than this fraction")
+    report_parser.add_argument("--min-time", dest="min_time", type=float, default=0.05,
+                               help="Never flag stages that take less than this many seconds")
+    report_parser.add_argument("--only-flagged", dest="only_flagged", action="store_true")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.configs, args.history, args.inputs, args.fileset, args.chunksize,
+            args.set_baseline)
+    else:
+        regressed = report(args.history, args.commit, args.baseline, args.threshold,
+                           args.min_time, args.only_flagged)
+        sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare running many small files with Runner and with FilesetPlanner work units
+
+A dataset is written as n_files small synthetic files, like the _part-N files of signal samples,
+and processed twice with the same executor: once with coffea.processor.Runner, which makes one
+task per file, and once with sidm.tools.fileset_planner.FilesetPlanner, which packs files into
+work units of about target_entries events. The number of tasks, wall time, and throughput of both
+are printed, along with a check that both produce the same cutflow.
+
+Usage: python -m sidm.benchmarks.small_files [-n 20] [-e 1000] [-t 5000] [-w 4] [-c 4mu]
+"""
+
+# python
+import argparse
+import os
+import tempfile
+import time
+import warnings
+# columnar analysis
+from coffea import processor
+from coffea.nanoevents import NanoAODSchema
+from tabulate import tabulate
+# local
+from sidm.tools import synthetic
+from sidm.tools.fileset_planner import FilesetPlanner
+from sidm.tools.sidm_processor import SidmProcessor
+
+
+def write_files(n_files, n_events, work_dir, seed=0):
+    """Write n_files synthetic files of n_events each and return {dataset: [paths]}"""
+    paths = []
+    for i in range(n_files):
+        path = os.path.join(work_dir, f"small_{n_events}_part-{i}.root")
+        if not os.path.exists(path):
+            synthetic.write_root(path, n_events, seed=seed + i)
+        paths.append(path)
+    return {"small_files": paths}
+
+
+def make_executor(workers):
+    """Return an iterative executor for one worker and a futures executor otherwise"""
+    if workers == 1:
+        return processor.IterativeExecutor()
+    return processor.FuturesExecutor(workers=workers)
+
+
+def total_events(out, channel):
+    """Return number of events passing all cuts of channel in the first dataset of out"""
+    dataset_out = next(iter(out.values()))
+    return dataset_out["cutflow"][channel].flow[-1].n_all
+
+
+def benchmark(n_files, n_events, target_entries, workers, channels, hist_collections,
+              work_dir=None):
+    """Return rows of (method, tasks, wall time, events/s, passing events)"""
+    work_dir = tempfile.mkdtemp(prefix="sidm_small_") if work_dir is None else work_dir
+    fileset = write_files(n_files, n_events, work_dir)
+    p = SidmProcessor(channels, hist_collections)
+
+    # compile numba kernels and load fastjet before timing anything
+    processor.Runner(executor=processor.IterativeExecutor(), schema=NanoAODSchema,
+                     maxchunks=1)({"warmup": fileset["small_files"][:1]}, "Events",
+                                  processor_instance=p)
+
+    rows = []
+    runner = processor.Runner(executor=make_executor(workers), schema=NanoAODSchema,
+                              savemetrics=True)
+    start = time.perf_counter()
+    out, metrics = runner(fileset, "Events", processor_instance=p)
+    wall_time = time.perf_counter() - start
+    rows.append(("Runner", metrics["chunks"], wall_time, n_files*n_events/wall_time,
+                 total_events(out, channels[0])))
+
+    planner = FilesetPlanner(fileset, target_entries)
+    start = time.perf_counter()
+    n_units = len(planner.plan())
+    out = planner.run(p, make_executor(workers))
+    wall_time = time.perf_counter() - start
+    rows.append(("FilesetPlanner", n_units, wall_time, n_files*n_events/wall_time,
+                 total_events(out, channels[0])))
+    return rows
+
+
+def main():
+    """Parse arguments, run the benchmark, and print results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("-n", "--n-files", dest="n_files", type=int, default=20)
+    parser.add_argument("-e", "--events-per-file", dest="n_events", type=int, default=1000)
+    parser.add_argument("-t", "--target-entries", dest="target_entries", type=int,
+                        default=5000)
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    parser.add_argument("-c", "--channels", nargs="+", default=["4mu"])
+    parser.add_argument("-H", "--hist-collections", dest="hist_collections", nargs="+",
+                        default=["base"])
+    parser.add_argument("--work-dir", dest="work_dir", default=None,
+                        help="Directory in which to write (or reuse) the small files")
+    args = parser.parse_args()
+
+    # processor warnings about unfillable hists are not interesting here
+    warnings.filterwarnings("ignore")
+    rows = benchmark(args.n_files, args.n_events, args.target_entries, args.workers,
+                     args.channels, args.hist_collections, args.work_dir)
+    print(tabulate(rows, ["method", "tasks", "wall time [s]", "evts/s",
+                          f"evts passing {args.channels[0]}"], floatfmt=".1f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,13 @@ hist.Hists storage is weight unless otherwise specified.
 
 # python
 import math
-import importlib
 # columnar analysis
 import hist
 import awkward as ak
 # local
 from sidm.tools import histogram as h
-from sidm.tools.utilities import dR, lxy, matched
+from sidm.tools.utilities import dR, lxy, matched, nearest
 from sidm.definitions.objects import derived_objs
-# always reload local modules to pick up changes during development
-importlib.reload(h)
 
 
 counter_defs = {
@@ -76,6 +73,11 @@ def obj_attr(obj, attr, absval=False, nbins=None, xmin=None, xmax=None, label=No
     label = make_label(obj, attr, absval) if label is None else label
     return h.Histogram.simple_hist(obj, attr, absval, nbins, xmin, xmax, label)
 
+def obj_lj_eff(obj, attr, nbins=None, xmin=None, xmax=None, r=0.4):
+    """Return efficiency hist of obj.attr for each obj to have an LJ within dR < r"""
+    denom = obj_attr(obj, attr, nbins=nbins, xmin=xmin, xmax=xmax)
+    return h.EfficiencyHistogram(denom.axes, lambda objs, mask: dR(objs[obj], objs["ljs"]) < r)
+
 def make_2d(h1, h2):
     return h.Histogram([h1.axes[-1], h2.axes[-1]])
 
@@ -86,13 +88,13 @@ def obj_eta_phi(obj, nbins_x=None, xmin=None, xmax=None, nbins_y=None, ymin=None
     )
 
 
-# define histograms
-hist_defs = {
+# define histograms; each is only built when first requested from hist_defs
+hist_defs = h.HistogramRegistry({
     # pv
-    "pv_n": obj_attr("pvs", "npvs", nbins=50, label="Number of PVs"),
-    "pv_ndof": obj_attr("pvs", "ndof", nbins=25, xmax=100),
-    "pv_z": obj_attr("pvs", "z", xmin=-50, xmax=50),
-    "pv_rho": h.Histogram(
+    "pv_n": lambda: obj_attr("pvs", "npvs", nbins=50, label="Number of PVs"),
+    "pv_ndof": lambda: obj_attr("pvs", "ndof", nbins=25, xmax=100),
+    "pv_z": lambda: obj_attr("pvs", "z", xmin=-50, xmax=50),
+    "pv_rho": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, -0.5, 0.5, name="pv_rho"),
                    lambda objs, mask: objs["pvs"].pos.rho),
@@ -100,13 +102,13 @@ hist_defs = {
     ),
     # GSFelectron: Plottting electron ID varaiables and plotting 2D hists of the leading electron
     # ID variables in barrel within Delta R < .5 of a dark photon vs the lxy of the dark photon
-    "electron_GsfEleDEtaInSeedCut": h.Histogram(
+    "electron_GsfEleDEtaInSeedCut": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(35, 0, .0070, name="electron_GsfEleDEtaInSeedCut"),
                    lambda objs, mask: objs["electrons"].GsfEleDEtaInSeedCut_0),
         ],
     ),
-    "electron_GsfEleDEtaInSeedCut2d": h.Histogram(
+    "electron_GsfEleDEtaInSeedCut2d": lambda: h.Histogram(
         [  # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
                                      label=r"Dark photon $L_{xy}$ [cm]"),
@@ -116,13 +118,13 @@ hist_defs = {
         ],
         evt_mask = lambda objs: ak.num(matched(objs["electrons"], objs["genAs_toE"], 0.5)) > 0,
     ),
-    "electron_GsfEleDPhiInCut": h.Histogram(
+    "electron_GsfEleDPhiInCut": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(45, 0, .0450, name="electron_GsfEleDPhiInCut"),
                    lambda objs, mask: objs["electrons"].GsfEleDPhiInCut_0),
         ],
     ),
-    "electron_GsfEleDPhiInCut2d": h.Histogram(
+    "electron_GsfEleDPhiInCut2d": lambda: h.Histogram(
         [  # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
                                      label=r"Dark photon $L_{xy}$ [cm]"),
@@ -132,13 +134,13 @@ hist_defs = {
         ],
         evt_mask = lambda objs: ak.num(matched(objs["electrons"], objs["genAs_toE"], 0.5)) > 0,
     ),
-    "electron_GsfEleEInverseMinusPInverseCut": h.Histogram(
+    "electron_GsfEleEInverseMinusPInverseCut": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(60, 0, .3, name="electron_GsfEleEInverseMinusPInverseCut"),
                    lambda objs, mask: objs["electrons"].GsfEleEInverseMinusPInverseCut_0),
         ],
     ),
-    "electron_GsfEleEInverseMinusPInverseCut2d": h.Histogram(
+    "electron_GsfEleEInverseMinusPInverseCut2d": lambda: h.Histogram(
         [  # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
                                      label=r"Dark photon $L_{xy}$ [cm]"),
@@ -148,14 +150,14 @@ hist_defs = {
         ],
         evt_mask = lambda objs: ak.num(matched(objs["electrons"], objs["genAs_toE"], 0.5)) > 0,
     ),
-    "electron_GsfEleRelPFIsoScaledCut": h.Histogram(
+    "electron_GsfEleRelPFIsoScaledCut": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(40, 0, .2, name="electron_GsfEleRelPFIsoScaledCut"),
                    lambda objs, mask: (objs["electrons"].GsfEleRelPFIsoScaledCut_0
                                        - .506/objs["electrons"].pt)),
         ],
     ),
-    "electron_GsfEleRelPFIsoScaledCut2d": h.Histogram(
+    "electron_GsfEleRelPFIsoScaledCut2d": lambda: h.Histogram(
         [  # lxy of dark photon that decays to electrons
            # added the alegbra relIso has in the analysis note
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
@@ -167,13 +169,13 @@ hist_defs = {
         ],
         evt_mask = lambda objs: ak.num(matched(objs["electrons"], objs["genAs_toE"], 0.5)) > 0,
     ),
-    "electron_GsfEleFull5x5SigmaIEtaIEtaCut": h.Histogram(
+    "electron_GsfEleFull5x5SigmaIEtaIEtaCut": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(45, 0, .045, name="electron_GsfEleFull5x5SigmaIEtaIEtaCut"),
                    lambda objs, mask: objs["electrons"].GsfEleFull5x5SigmaIEtaIEtaCut_0),
         ],
     ),
-    "electron_GsfEleFull5x5SigmaIEtaIEtaCut2d": h.Histogram(
+    "electron_GsfEleFull5x5SigmaIEtaIEtaCut2d": lambda: h.Histogram(
         [  # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
                                      label=r"Dark photon $L_{xy}$ [cm]"),
@@ -183,13 +185,13 @@ hist_defs = {
         ],
         evt_mask = lambda objs: ak.num(matched(objs["electrons"], objs["genAs_toE"], 0.5)) > 0,
     ),
-    "electron_GsfEleConversionVetoCut": h.Histogram(
+    "electron_GsfEleConversionVetoCut": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(2, 0, 2, name="electron_GsfEleConversionVetoCut"),
                    lambda objs, mask: objs["electrons"].GsfEleConversionVetoCut_0),
         ],
     ),
-    "electron_GsfEleConversionVetoCut2d": h.Histogram(
+    "electron_GsfEleConversionVetoCut2d": lambda: h.Histogram(
         [  # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
                                      label=r"Dark photon $L_{xy}$ [cm]"),
@@ -199,13 +201,13 @@ hist_defs = {
         ],
         evt_mask = lambda objs: ak.num(matched(objs["electrons"], objs["genAs_toE"], 0.5)) > 0,
     ),
-    "electron_GsfEleHadronicOverEMEnergyScaledCut": h.Histogram(
+    "electron_GsfEleHadronicOverEMEnergyScaledCut": lambda: h.Histogram(
          [
              h.Axis(hist.axis.Regular(30, 0, .15, name="electron_GsfEleHadronicOverEMEnergyScaledCut"),
                     lambda objs, mask: objs["electrons"].GsfEleHadronicOverEMEnergyScaledCut_0),
          ],
      ),
-    "electron_GsfEleHadronicOverEMEnergyScaledCut2d": h.Histogram(
+    "electron_GsfEleHadronicOverEMEnergyScaledCut2d": lambda: h.Histogram(
         [  # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
                                      label=r"Dark photon $L_{xy}$ [cm]"),
@@ -215,13 +217,13 @@ hist_defs = {
         ],
         evt_mask = lambda objs: ak.num(matched(objs["electrons"], objs["genAs_toE"], 0.5)) > 0,
     ),
-    "electron_GsfEleMissingHitsCut": h.Histogram(
+    "electron_GsfEleMissingHitsCut": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(10, 0, 10, name="electron_GsfEleMissingHitsCut"),
                    lambda objs, mask: objs["electrons"].GsfEleMissingHitsCut_0),
         ],
     ),
-    "electron_GsfEleMissingHitsCut2d": h.Histogram(
+    "electron_GsfEleMissingHitsCut2d": lambda: h.Histogram(
         [  # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
                                      label=r"Dark photon $L_{xy}$ [cm]"),
@@ -232,22 +234,22 @@ hist_defs = {
         evt_mask = lambda objs: ak.num(matched(objs["electrons"], objs["genAs_toE"], 0.5)) > 0,
     ),
     # pfelectron
-    "electron_n": obj_attr("electrons", "n"),
-    "electron_pt": obj_attr("electrons", "pt"),
-    "electron_eta_phi": obj_eta_phi("electrons"),
-    "electron_eta": h.Histogram(
+    "electron_n": lambda: obj_attr("electrons", "n"),
+    "electron_pt": lambda: obj_attr("electrons", "pt"),
+    "electron_eta_phi": lambda: obj_eta_phi("electrons"),
+    "electron_eta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -3, 3, name="electron_eta"),
                    lambda objs, mask: objs["electrons"].eta),
         ]
     ),
-    "electron_phi": h.Histogram(
+    "electron_phi": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -1*math.pi, math.pi, name="electron_phi"),
                    lambda objs, mask: objs["electrons"].phi),
         ]
     ),
-    "electron_nearGenA_n": h.Histogram(
+    "electron_nearGenA_n": lambda: h.Histogram(
         [
             # number of electrons within dR=0.5 of a genA that decays to electrons
             h.Axis(hist.axis.Integer(0, 10, name="electron_nearGenA_n"),
@@ -255,7 +257,7 @@ hist_defs = {
         ],
     ),
     # pfelectron-genA
-    "electron_nearGenA_n_genA_lxy": h.Histogram(
+    "electron_nearGenA_n_genA_lxy": lambda: h.Histogram(
         [
             # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
@@ -267,7 +269,7 @@ hist_defs = {
         ],
     ),
     # pfelectron-genElectron
-    "electron_genE_dR": h.Histogram(
+    "electron_genE_dR": lambda: h.Histogram(
         [
             # dR(e, nearest gen e)
             h.Axis(hist.axis.Regular(50, 0, 2*math.pi, name="electron_genE_dR"),
@@ -275,10 +277,10 @@ hist_defs = {
         ],
     ),
     # pfphoton
-    "photon_n": obj_attr("photons", "n"),
-    "photon_pt":obj_attr("photons", "pt"),
-    "photon_eta_phi": obj_eta_phi("photons"),
-    "photon_nearGenA_n": h.Histogram(
+    "photon_n": lambda: obj_attr("photons", "n"),
+    "photon_pt":lambda: obj_attr("photons", "pt"),
+    "photon_eta_phi": lambda: obj_eta_phi("photons"),
+    "photon_nearGenA_n": lambda: h.Histogram(
         [
             # number of photons within dR=0.5 of a genA that decays to electrons
             h.Axis(hist.axis.Integer(0, 10, name="photon_nearGenA_n"),
@@ -286,7 +288,7 @@ hist_defs = {
         ],
     ),
     # pfphoton-genA
-    "photon_nearGenA_n_genA_lxy": h.Histogram(
+    "photon_nearGenA_n_genA_lxy": lambda: h.Histogram(
         [
             # lxy of dark photon that decays to electrons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
@@ -298,7 +300,7 @@ hist_defs = {
         ],
     ),
     # pfphoton-genElectron
-    "photon_genE_dR": h.Histogram(
+    "photon_genE_dR": lambda: h.Histogram(
         [
             # dR(photon, nearest gen e)
             h.Axis(hist.axis.Regular(50, 0, 2*math.pi, name="photon_genE_dR"),
@@ -306,12 +308,12 @@ hist_defs = {
         ],
     ),
     # pfmuon
-    "muon_n": obj_attr("muons", "n"),
-    "muon_pt":obj_attr("muons", "pt"),
-    "muon_eta_phi": obj_eta_phi("muons"),
-    "muon_absD0": obj_attr("muons", "dxy", absval=True, xmax=500),
-    "muon_absD0_lowRange": obj_attr("muons", "dxy", absval=True, xmax=10),
-    "muon_nearGenA_n": h.Histogram(
+    "muon_n": lambda: obj_attr("muons", "n"),
+    "muon_pt":lambda: obj_attr("muons", "pt"),
+    "muon_eta_phi": lambda: obj_eta_phi("muons"),
+    "muon_absD0": lambda: obj_attr("muons", "dxy", absval=True, xmax=500),
+    "muon_absD0_lowRange": lambda: obj_attr("muons", "dxy", absval=True, xmax=10),
+    "muon_nearGenA_n": lambda: h.Histogram(
         [
             # number of muons within dR=0.5 of a genA that decays to muons
             h.Axis(hist.axis.Integer(0, 10, name="muon_nearGenA_n"),
@@ -319,7 +321,7 @@ hist_defs = {
         ],
     ),
     # pfmuon-genA
-    "muon_nearGenA_n_genA_lxy": h.Histogram(
+    "muon_nearGenA_n_genA_lxy": lambda: h.Histogram(
         [
             # lxy of dark photon that decays to muons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
@@ -331,7 +333,7 @@ hist_defs = {
         ],
     ),
     # pfmuon-genMuon
-    "muon_genMu_dR": h.Histogram(
+    "muon_genMu_dR": lambda: h.Histogram(
         [
             # dR(mu, nearest gen mu)
             h.Axis(hist.axis.Regular(50, 0, 2*math.pi, name="muon_genMu_dR"),
@@ -339,18 +341,18 @@ hist_defs = {
         ],
     ),
     # dsamuon
-    "dsaMuon_n": obj_attr("dsaMuons", "n"),
-    "dsaMuon_pt":obj_attr("dsaMuons", "pt"),
-    "dsaMuon_eta_phi": obj_eta_phi("dsaMuons"),
-    "dsaMuon_absD0": obj_attr("dsaMuons", "dxy", absval=True, xmax=500),
-    "dsaMuon_absD0_lowRange": obj_attr("dsaMuons", "dxy", absval=True, xmax=10),
-    "totalMuon_n": h.Histogram( # total number of muons
+    "dsaMuon_n": lambda: obj_attr("dsaMuons", "n"),
+    "dsaMuon_pt":lambda: obj_attr("dsaMuons", "pt"),
+    "dsaMuon_eta_phi": lambda: obj_eta_phi("dsaMuons"),
+    "dsaMuon_absD0": lambda: obj_attr("dsaMuons", "dxy", absval=True, xmax=500),
+    "dsaMuon_absD0_lowRange": lambda: obj_attr("dsaMuons", "dxy", absval=True, xmax=10),
+    "totalMuon_n": lambda: h.Histogram( # total number of muons
         [
             h.Axis(hist.axis.Integer(0, 10, name="totalMuon_n"),
                    lambda objs, mask: ak.num(objs["muons"]) + ak.num(objs["dsaMuons"])),
         ],
     ),
-    "dsaMuon_nearGenA_n": h.Histogram(
+    "dsaMuon_nearGenA_n": lambda: h.Histogram(
         [
             # number of muons within dR=0.5 of a genA that decays to muons
             h.Axis(hist.axis.Integer(0, 10, name="dsaMuon_nearGenA_n"),
@@ -358,7 +360,7 @@ hist_defs = {
         ],
     ),
     # dsamuon-genA
-    "dsaMuon_nearGenA_n_genA_lxy": h.Histogram(
+    "dsaMuon_nearGenA_n_genA_lxy": lambda: h.Histogram(
         [
             # lxy of dark photon that decays to dsaMuons
             h.Axis(hist.axis.Regular(100, 0, 500, name="genA_lxy",
@@ -370,7 +372,7 @@ hist_defs = {
         ],
     ),
     # dsaMuon-genMuon
-    "dsaMuon_genMu_dR": h.Histogram(
+    "dsaMuon_genMu_dR": lambda: h.Histogram(
         [
             # dR(dsa mu, nearest gen mu)
             h.Axis(hist.axis.Regular(50, 0, 2*math.pi, name="dsaMuon_genMu_dR"),
@@ -378,18 +380,19 @@ hist_defs = {
         ],
     ),
     # lj
-    "lj_n": obj_attr("ljs", "n"),
-    "egm_lj_n": obj_attr("egm_ljs", "n"),
-    "mu_lj_n": obj_attr("mu_ljs", "n"),
-    "lj_pt": obj_attr("ljs", "pt", xmax=600),
-    "lj_pfIsolation05": h.Histogram(
+    "lj_n": lambda: obj_attr("ljs", "n"),
+    "egm_lj_n": lambda: obj_attr("egm_ljs", "n"),
+    "mu_lj_n": lambda: obj_attr("mu_ljs", "n"),
+    "lj_pt": lambda: obj_attr("ljs", "pt", xmax=600),
+    "lj_invmass": lambda: obj_attr("ljs", "mass", xmax=20, label="Lepton Jet invariant mass [GeV]"),
+    "lj_pfIsolation05": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 1, name="lj_pfIsolation05",
                                      label="LJ Isolation Pt 05"),
                    lambda objs, mask: objs["ljs"].pfIsolation05),
         ],
     ),
-    "lj0_pfIsolation05": h.Histogram(
+    "lj0_pfIsolation05": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(80, 0, 0.8, name="lj_pfIsolation05",
                                      label="Leading lepton jet isolation"),
@@ -397,7 +400,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 0,
     ),
-    "lj1_pfIsolation05": h.Histogram(
+    "lj1_pfIsolation05": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(80, 0, 0.8, name="lj_pfIsolation05",
                                      label="Subleading lepton jet isolation"),
@@ -405,49 +408,49 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_pfIsolationPtNoPU05": h.Histogram( # not in v2 ntuples
+    "lj_pfIsolationPtNoPU05": lambda: h.Histogram( # not in v2 ntuples
         [
             h.Axis(hist.axis.Regular(80, 0, 0.8, name="lj_pfIsolationPtNoPU05",
                                      label="Lepton jet isolation"),
                    lambda objs, mask: objs["ljs"].pfIsolationPtNoPU05),
         ],
     ),
-    "lj_pfIsolationPt05": h.Histogram( # not in v2 ntuples
+    "lj_pfIsolationPt05": lambda: h.Histogram( # not in v2 ntuples
         [
             h.Axis(hist.axis.Regular(100, 0, 1, name="lj_pfIsolationPt05",
                                      label="LJ Isolation Pt 05"),
                    lambda objs, mask: objs["ljs"].pfIsolationPt05),
         ],
     ),
-    "lj_pfIsolation07": h.Histogram(
+    "lj_pfIsolation07": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 1, name="lj_pfIsolation07",
                                      label="LJ Isolation Pt 07"),
                    lambda objs, mask: objs["ljs"].pfIsolation07),
         ],
     ),
-    "lj_pfIsolationPtNoPU07": h.Histogram( # not in v2 ntuples
+    "lj_pfIsolationPtNoPU07": lambda: h.Histogram( # not in v2 ntuples
         [
             h.Axis(hist.axis.Regular(80, 0, 0.8, name="lj_pfIsolationPtNoPU07",
                                      label="Lepton jet isolation"),
                    lambda objs, mask: objs["ljs"].pfIsolationPtNoPU07),
         ],
     ),
-    "lj_pfIsolationPt07": h.Histogram( # not in v2 ntuples
+    "lj_pfIsolationPt07": lambda: h.Histogram( # not in v2 ntuples
         [
             h.Axis(hist.axis.Regular(80, 0, 0.8, name="lj_pfIsolationPt07",
                                      label="Lepton jet isolation"),
                    lambda objs, mask: objs["ljs"].pfIsolationPt07),
         ],
     ),
-    "lj_pfiso": h.Histogram(
+    "lj_pfiso": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 1, name="lj_pfiso",
                                      label="LJ pf Isolation"),
                    lambda objs, mask: objs["ljs"].pfiso),
         ],
     ),
-    "lj0_pt": h.Histogram(
+    "lj0_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 400, name="lj0_pt",
                                      label="Leading lepton jet pT [GeV]"),
@@ -455,7 +458,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 0,
     ),
-    "lj1_pt": h.Histogram(
+    "lj1_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 400, name="lj1_pt",
                                      label="Subleading lepton jet pT [GeV]"),
@@ -463,7 +466,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj0_e": h.Histogram(
+    "lj0_e": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(350, 0, 700, name="lj_e",
                                      label="Leading lepton jet E [GeV]"),
@@ -471,7 +474,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 0,
     ),
-    "lj1_e": h.Histogram(
+    "lj1_e": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(350, 0, 700, name="lj_e",
                                      label="Subleading lepton jet E [GeV]"),
@@ -479,7 +482,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj0_dRSpread": h.Histogram(
+    "lj0_dRSpread": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(250, 0, 1.0, name="lj0_dRSpread",
                                      label="Leading lepton jet dRSpread"),
@@ -487,7 +490,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 0,
     ),
-    "lj1_dRSpread": h.Histogram(
+    "lj1_dRSpread": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(250, 0, 1.0, name="lj1_dRSpread",
                                      label="Subleading lepton jet dRSpread"),
@@ -495,92 +498,92 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_eta_phi": obj_eta_phi("ljs"),
-    "egm_lj_pt": obj_attr("egm_ljs", "pt", xmax=400),
-    "mu_lj_pt": obj_attr("mu_ljs", "pt", xmax=400),
-    "lj_electronN": h.Histogram(
+    "lj_eta_phi": lambda: obj_eta_phi("ljs"),
+    "egm_lj_pt": lambda: obj_attr("egm_ljs", "pt", xmax=400),
+    "mu_lj_pt": lambda: obj_attr("mu_ljs", "pt", xmax=400),
+    "lj_electronN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_electronN"),
                    lambda objs, mask: objs["ljs"].electron_n),
         ],
     ),
-    "mu_lj_pt": h.Histogram(
+    "mu_lj_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 400, name="mu_lj_pt",
                                      label="Mu-type lepton jet pT [GeV]"),
                    lambda objs, mask: derived_objs["mu_ljs"](objs).pt),
         ],
     ),
-    "mu_lj_muonN": h.Histogram(
+    "mu_lj_muonN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="mu_lj_muonN"),
                    lambda objs, mask: objs["mu_ljs"].muon_n),
         ],
     ),
 
-    "egm_lj_electronN": h.Histogram(
+    "egm_lj_electronN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="egm_lj_electronN"),
                    lambda objs, mask: objs["egm_ljs"].electron_n),
         ],
     ),
-    "egm_lj_photonN": h.Histogram(
+    "egm_lj_photonN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="egm_lj_photonN"),
                    lambda objs, mask: objs["egm_ljs"].photon_n),
         ],
     ),
-    "lj_electronN": h.Histogram(
+    "lj_electronN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_electronN"),
                    lambda objs, mask: objs["ljs"].electron_n),
         ],
     ),
-    "lj_photonN": h.Histogram(
+    "lj_photonN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_photonN"),
                    lambda objs, mask: objs["ljs"].photon_n),
         ],
     ),
-    "lj_electronPhotonN": h.Histogram(
+    "lj_electronPhotonN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_electronPhotonN"),
                    lambda objs, mask: objs["ljs"].electron_n + objs["ljs"].photon_n),
         ],
     ),
-    "lj_muonN": h.Histogram(
+    "lj_muonN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_muonN"),
                    lambda objs, mask: objs["ljs"].muon_n),
         ],
     ),
-    "lj_dsaMuN": h.Histogram(
+    "lj_dsaMuN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_dsaMuN"),
                    lambda objs, mask: objs["ljs"].dsaMu_n),
         ],
     ),
-    "lj_pfMuN": h.Histogram(
+    "lj_pfMuN": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_pfMuN"),
                    lambda objs, mask: objs["ljs"].pfMu_n),
         ],
     ),
     # ljsource
-    "ljsource_n": h.Histogram(
+    "ljsource_n": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="ljsource_n"),
                    lambda objs, mask: ak.num(objs["ljsources"])),
         ],
     ),
-    "ljsource_pt": h.Histogram(
+    "ljsource_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 400, name="ljsource_pt",
                                      label="Lepton jet source pT [GeV]"),
                    lambda objs, mask: objs["ljsources"].pt),
         ],
     ),
-    "ljsource_eta_phi": h.Histogram(
+    "ljsource_eta_phi": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -3, 3, name="ljsource_eta"),
                    lambda objs, mask: objs["ljsources"].eta),
@@ -588,27 +591,27 @@ hist_defs = {
                    lambda objs, mask: objs["ljsources"].phi),
         ],
     ),
-    "ljsource_charge": h.Histogram(
+    "ljsource_charge": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(-1, 1, name="ljsource_charge"),
                    lambda objs, mask: objs["ljsources"].charge),
         ],
     ),
-    "ljsource_type": h.Histogram(
+    "ljsource_type": lambda: h.Histogram(
         [
             h.Axis(hist.axis.IntCategory([2, 3, 4, 8], name="lj_type"),
                    lambda objs, mask: objs["ljsources"]["type"]), # avoid ak.Array.type
         ],
     ),
     # pfelectron-lj
-    "electron_lj_dR": h.Histogram(
+    "electron_lj_dR": lambda: h.Histogram(
         [
             # dR(e, nearest LJ)
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="electron_lj_dR"),
                    lambda objs, mask: dR(objs["electrons"], objs["ljs"]))
         ],
     ),
-    "electron_lj_dR_lowRange": h.Histogram(
+    "electron_lj_dR_lowRange": lambda: h.Histogram(
         [
             # dR(e, nearest LJ)
             h.Axis(hist.axis.Regular(100, 0, 1.0, name="electron_lj_dR_lowRange"),
@@ -616,21 +619,21 @@ hist_defs = {
         ],
     ),
     # pfphoton-lj
-    "photon_lj_dR": h.Histogram(
+    "photon_lj_dR": lambda: h.Histogram(
         [
             # dR(e, nearest LJ)
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="photon_lj_dR"),
                    lambda objs, mask: dR(objs["photons"], objs["ljs"]))
         ],
     ),
-    "photon_lj_dR_lowRange": h.Histogram(
+    "photon_lj_dR_lowRange": lambda: h.Histogram(
         [
             # dR(photon, nearest LJ)
             h.Axis(hist.axis.Regular(100, 0, 1.0, name="photon_lj_dR_lowRange"),
                    lambda objs, mask: dR(objs["photons"], objs["ljs"]))
         ],
     ),
-    "photon_lj_dR_reallyLowRange": h.Histogram(
+    "photon_lj_dR_reallyLowRange": lambda: h.Histogram(
         [
             # dR(photon, nearest LJ)
             h.Axis(hist.axis.Regular(100, 0, 0.1, name="photon_lj_dR_reallyLowRange"),
@@ -638,14 +641,14 @@ hist_defs = {
         ],
     ),
     # pfmuon-lj
-    "muon_lj_dR": h.Histogram(
+    "muon_lj_dR": lambda: h.Histogram(
         [
             # dR(mu, nearest LJ)
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="muon_lj_dR"),
                    lambda objs, mask: dR(objs["muons"], objs["ljs"]))
         ],
     ),
-    "muon_lj_dR_lowRange": h.Histogram(
+    "muon_lj_dR_lowRange": lambda: h.Histogram(
         [
             # dR(mu, nearest LJ)
             h.Axis(hist.axis.Regular(100, 0, 1.0, name="muon_lj_dR_lowRange"),
@@ -653,14 +656,14 @@ hist_defs = {
         ],
     ),
     # dsamuon-lj
-    "dsaMuon_lj_dR": h.Histogram(
+    "dsaMuon_lj_dR": lambda: h.Histogram(
         [
             # dR(dsa mu, nearest LJ)
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="dsaMuon_lj_dR"),
                    lambda objs, mask: dR(objs["dsaMuons"], objs["ljs"]))
         ],
     ),
-    "dsaMuon_lj_dR_lowRange": h.Histogram(
+    "dsaMuon_lj_dR_lowRange": lambda: h.Histogram(
         [
             # dR(dsa mu, nearest LJ)
             h.Axis(hist.axis.Regular(50, 0, 1.0, name="dsaMuon_lj_dR_lowRange"),
@@ -668,25 +671,25 @@ hist_defs = {
         ],
     ),
     #lj constituents
-    "lj_pfMu_n": h.Histogram(
+    "lj_pfMu_n": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_pfMu_n"),
                    lambda objs, mask: ak.num(objs["ljs"]["pfMuons"]))
         ],    
     ),
-    "lj_pfMu_pt": h.Histogram(
+    "lj_pfMu_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name="lj_pfMu_pt"),
                    lambda objs, mask: objs["ljs"]["pfMuons"].pt)
         ],    
     ),
-    "lj_dsaMu_n": h.Histogram(
+    "lj_dsaMu_n": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 10, name="lj_dsaMu_n"),
                    lambda objs, mask: ak.num(objs["ljs"]["dsaMuons"]))
         ],    
     ),
-    "lj_dsaMu_pt": h.Histogram(
+    "lj_dsaMu_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name="lj_dsaMu_pt"),
                    lambda objs, mask: objs["ljs"]["dsaMuons"].pt)
@@ -694,28 +697,28 @@ hist_defs = {
     ),
     
     # lj-lj
-    "lj_lj_absdphi": h.Histogram(
+    "lj_lj_absdphi": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="|$\Delta\phi$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].phi - objs["ljs"][mask, 0].phi)),
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdR": h.Histogram(
+    "lj_lj_absdR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 6, name="|$\Delta$R| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: objs["ljs"][mask, 1].delta_r(objs["ljs"][mask, 0])),
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdeta": h.Histogram(
+    "lj_lj_absdeta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 6, name="|$\Delta\eta$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].eta - objs["ljs"][mask, 0].eta)),
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_invmass": h.Histogram(
+    "lj_lj_invmass": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 1200, name="ljlj_mass",
                                      label=r"Invariant Mass ($LJ_{0}$, $LJ_{1}$)"),
@@ -723,7 +726,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_invmass_lowRange": h.Histogram(
+    "lj_lj_invmass_lowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 500, name="ljlj_mass",
                                      label=r"InvMass($LJ_{0}$, $LJ_{1}$)"),
@@ -731,7 +734,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_ptRatio": h.Histogram(
+    "lj_lj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 1.0, 2.0, name="lj_lj_ptRatio",
                    label="Leading LJ PT / Subleading LJ PT"),
@@ -740,7 +743,7 @@ hist_defs = {
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
     # ABCD plane
-    "lj_lj_absdphi_invmass": h.Histogram(
+    "lj_lj_absdphi_invmass": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="|$\Delta\phi$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].phi - objs["ljs"][mask, 0].phi)),
@@ -750,7 +753,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdphi_absdR": h.Histogram(
+    "lj_lj_absdphi_absdR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="|$\Delta\phi$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].phi - objs["ljs"][mask, 0].phi)),
@@ -759,7 +762,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdphi_absdeta": h.Histogram(
+    "lj_lj_absdphi_absdeta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="|$\Delta\phi$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].phi - objs["ljs"][mask, 0].phi)),
@@ -768,7 +771,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdphi_ptRatio": h.Histogram(
+    "lj_lj_absdphi_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="|$\Delta\phi$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].phi - objs["ljs"][mask, 0].phi)),
@@ -778,7 +781,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdR_absdeta": h.Histogram(
+    "lj_lj_absdR_absdeta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 6, name="|$\Delta$R| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: objs["ljs"][mask, 1].delta_r(objs["ljs"][mask, 0])),
@@ -787,7 +790,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdR_invmass": h.Histogram(
+    "lj_lj_absdR_invmass": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 6, name="|$\Delta$R| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: objs["ljs"][mask, 1].delta_r(objs["ljs"][mask, 0])),
@@ -797,7 +800,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdR_ptRatio": h.Histogram(
+    "lj_lj_absdR_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 6, name="|$\Delta$R| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: objs["ljs"][mask, 1].delta_r(objs["ljs"][mask, 0])),
@@ -807,7 +810,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdeta_invmass": h.Histogram(
+    "lj_lj_absdeta_invmass": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 6, name="|$\Delta\eta$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].eta - objs["ljs"][mask, 0].eta)),
@@ -817,7 +820,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdeta_ptRatio": h.Histogram(
+    "lj_lj_absdeta_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 6, name="|$\Delta\eta$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].eta - objs["ljs"][mask, 0].eta)),
@@ -827,7 +830,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
-    "lj_lj_absdphi_lj0_pfIsolationPt05": h.Histogram( # not in v2 ntuples
+    "lj_lj_absdphi_lj0_pfIsolationPt05": lambda: h.Histogram( # not in v2 ntuples
         [
             h.Axis(hist.axis.Regular(100, 0, 2*math.pi, name="|$\Delta\phi$| ($LJ_{0}$, $LJ_{1}$)"),
                    lambda objs, mask: abs(objs["ljs"][mask, 1].phi - objs["ljs"][mask, 0].phi)),
@@ -838,18 +841,18 @@ hist_defs = {
         evt_mask=lambda objs: ak.num(objs["ljs"]) > 1,
     ),
     # gen
-    "gen_abspid": h.Histogram(
+    "gen_abspid": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Integer(0, 40, name="gen_abspid"),
                    lambda objs, mask: abs(objs["gens"].pdgId)),
         ],
     ),
     # genelectron
-    "genE_n": obj_attr("genEs", "n"),
-    "genE_pt": obj_attr("genEs", "pt"),
-    "genE_pt_highRange": obj_attr("genEs", "pt", xmax=700),
+    "genE_n": lambda: obj_attr("genEs", "n"),
+    "genE_pt": lambda: obj_attr("genEs", "pt"),
+    "genE_pt_highRange": lambda: obj_attr("genEs", "pt", xmax=700),
 
-    "genE0_pt": h.Histogram(
+    "genE0_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name="genE0_pt",
                                      label=r"Leading gen-level electron $p_{T}$ [GeV]"),
@@ -857,7 +860,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 0,
     ),
-    "genE0_pt_highRange": h.Histogram(
+    "genE0_pt_highRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(70, 0, 700, name="genE_pt",
                                      label=r"Leading gen-level electron $p_{T}$ [GeV]"),
@@ -865,7 +868,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 0,
     ),
-    "genE1_pt": h.Histogram(
+    "genE1_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name="genE1_pt",
                                      label=r"Sub-leading gen-level electron $p_{T}$ [GeV]"),
@@ -873,7 +876,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genE1_pt_highRange": h.Histogram(
+    "genE1_pt_highRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(70, 0, 700, name="genE_pt",
                                      label=r"Sub-leading gen-level electron $p_{T}$ [GeV]"),
@@ -881,15 +884,15 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genE_eta_phi": obj_eta_phi("genEs"),
-    "genE_parent_absPdgId": h.Histogram(
+    "genE_eta_phi": lambda: obj_eta_phi("genEs"),
+    "genE_parent_absPdgId": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 50, name="genE_parent_absPdgId"),
                    lambda objs, mask: abs(objs["genEs"].parent.pdgId)),
         ],
     ),
     # genelectron-genelectron
-    "genE_genE_dR": h.Histogram(
+    "genE_genE_dR": lambda: h.Histogram(
         [
             # dR(subleading gen E, leading gen E)
             h.Axis(hist.axis.Regular(100, 0, 1.0, name="genE_genE_dR",
@@ -898,7 +901,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genE_genE_dR_lowRange": h.Histogram(
+    "genE_genE_dR_lowRange": lambda: h.Histogram(
         [
             # dR(subleading gen E, leading gen E)
             h.Axis(hist.axis.Regular(75, 0, 0.5, name="genE_genE_dR_lowRange",
@@ -907,7 +910,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genE_genE_dR_XLowRange": h.Histogram(
+    "genE_genE_dR_XLowRange": lambda: h.Histogram(
         [
             # dR(subleading gen E, leading gen E)
             h.Axis(hist.axis.Regular(50, 0, 0.1, name="genE_genE_dR_lowRange",
@@ -916,7 +919,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genE_genE_dR_XXLowRange": h.Histogram(
+    "genE_genE_dR_XXLowRange": lambda: h.Histogram(
         [
             # dR(subleading gen E, leading gen E)
             h.Axis(hist.axis.Regular(50, 0, 0.04, name="genE_genE_dR_lowRange",
@@ -925,7 +928,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genE_genE_dEta": h.Histogram(
+    "genE_genE_dEta": lambda: h.Histogram(
         [
             # abs(dEta(subleading gen E, leading gen E))
             h.Axis(hist.axis.Regular(50, 0, 1.0, name="genE_genE_dEta",
@@ -935,7 +938,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genE_genE_pt": h.Histogram(
+    "genE_genE_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name="genE_genE_pt"),
                    lambda objs, mask: objs["genEs"][mask, :2].sum().pt),
@@ -943,10 +946,10 @@ hist_defs = {
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
     # genmuon
-    "genMu_n": obj_attr("genMus", "n"),
-    "genMu_pt": obj_attr("genMus", "pt"),
-    "genMu_pt_highRange": obj_attr("genMus", "pt", xmax=700),
-    "genMu0_pt": h.Histogram(
+    "genMu_n": lambda: obj_attr("genMus", "n"),
+    "genMu_pt": lambda: obj_attr("genMus", "pt"),
+    "genMu_pt_highRange": lambda: obj_attr("genMus", "pt", xmax=700),
+    "genMu0_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 200, name="genMu0_pt",
                                      label=r"Leading gen-level muon $p_{T}$ [GeV]"),
@@ -954,7 +957,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 0,
     ),
-    "genMu0_pt_highRange": h.Histogram(
+    "genMu0_pt_highRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(70, 0, 700, name="genMu0_pt",
                                      label=r"Leading gen-level muon $p_{T}$ [GeV]"),
@@ -962,7 +965,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 0,
     ),
-    "genMu1_pt": h.Histogram(
+    "genMu1_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name="genMu1_pt",
                                      label=r"Sub-leading gen-level muon $p_{T}$ [GeV]"),
@@ -970,7 +973,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu1_pt_highRange": h.Histogram(
+    "genMu1_pt_highRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(70, 0, 700, name="genMu1_pt",
                                      label=r"Sub-leading gen-level muon $p_{T}$ [GeV]"),
@@ -978,15 +981,15 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu_eta_phi": obj_eta_phi("genMus"),
-    "genMu_parent_absPdgId": h.Histogram(
+    "genMu_eta_phi": lambda: obj_eta_phi("genMus"),
+    "genMu_parent_absPdgId": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 50, name="genMu_parent_absPdgId"),
                    lambda objs, mask: abs(objs["genMus"].parent.pdgId)),
         ],
     ),
     # genmuon-genmuon
-    "genMu_genMu_dR": h.Histogram(
+    "genMu_genMu_dR": lambda: h.Histogram(
         [
             # dR(subleading gen Mu, leading gen Mu)
             h.Axis(hist.axis.Regular(50, 0, 1.0, name="genMu_genMu_dR",
@@ -996,7 +999,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu_genMu_dR_lowRange": h.Histogram(
+    "genMu_genMu_dR_lowRange": lambda: h.Histogram(
         [
             # dR(subleading gen Mu, leading gen Mu)
             h.Axis(hist.axis.Regular(100, 0, 0.5, name="genMu_genMu_dR_lowRange",
@@ -1006,7 +1009,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu_genMu_dR_XLowRange": h.Histogram(
+    "genMu_genMu_dR_XLowRange": lambda: h.Histogram(
         [
             # dR(subleading gen Mu, leading gen Mu)
             h.Axis(hist.axis.Regular(100, 0, 0.1, name="genMu_genMu_dR_lowRange",
@@ -1016,7 +1019,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu_genMu_dR_XXLowRange": h.Histogram(
+    "genMu_genMu_dR_XXLowRange": lambda: h.Histogram(
         [
             # dR(subleading gen Mu, leading gen Mu)
             h.Axis(hist.axis.Regular(100, 0, 0.04, name="genMu_genMu_dR_lowRange",
@@ -1026,7 +1029,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu_genMu_dEta": h.Histogram(
+    "genMu_genMu_dEta": lambda: h.Histogram(
         [
             # abs(dEta(subleading gen Mu, leading gen Mu))
             h.Axis(hist.axis.Regular(50, 0, 1.0, name="genMu_genMu_dEta",
@@ -1036,7 +1039,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu_genMu_pt": h.Histogram(
+    "genMu_genMu_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name="genMu_genMu_pt"),
                    lambda objs, mask: objs["genMus"][mask, :2].sum().pt),
@@ -1044,7 +1047,7 @@ hist_defs = {
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
     #dsamuon-genAs_toMu
-    "dsamuon_absd0_genAs_toMu_lxy": h.Histogram(
+    "dsamuon_absd0_genAs_toMu_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsamuon_absd0",
                                      label=r"dsa muon $|d_0|$ [cm]"),
@@ -1057,7 +1060,7 @@ hist_defs = {
         #evt_mask=lambda objs: ak.num(objs["genAs_toMu"]) > 0,
     ),
     #dsamuon-genmuon
-    "dsaMuon_absD0_genMus_dR": h.Histogram(
+    "dsaMuon_absD0_genMus_dR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"DSA muon $|d_0|$ [cm]"),
@@ -1071,7 +1074,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1
     ),
-    "leadingDsaMuon_absD0_genMus_dR": h.Histogram(
+    "leadingDsaMuon_absD0_genMus_dR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"Leading DSA muon $|d_0|$ [cm]"),
@@ -1083,7 +1086,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ((ak.num(objs["genMus"]) > 1) & (ak.num(objs["dsaMuons"]) > 0))
     ),
-    "subLeadingDsaMuon_absD0_genMus_dR": h.Histogram(
+    "subLeadingDsaMuon_absD0_genMus_dR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"Sub Leading DSA muon $|d_0|$ [cm]"),
@@ -1095,7 +1098,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ((ak.num(objs["genMus"]) > 1) & (ak.num(objs["dsaMuons"]) > 1))
     ),
-    "dsaMuon_absD0_genMus_dR_XLowRange": h.Histogram(
+    "dsaMuon_absD0_genMus_dR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"DSA muon $|d_0|$ [cm]"),
@@ -1109,7 +1112,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1
     ),
-    "leadingDsaMuon_absD0_genMus_dR_XLowRange": h.Histogram(
+    "leadingDsaMuon_absD0_genMus_dR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"Leading DSA muon $|d_0|$ [cm]"),
@@ -1121,7 +1124,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ((ak.num(objs["genMus"]) > 1) & (ak.num(objs["dsaMuons"]) > 0))
     ),
-    "subLeadingDsaMuon_absD0_genMus_dR_XLowRange": h.Histogram(
+    "subLeadingDsaMuon_absD0_genMus_dR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"Sub Leading DSA muon $|d_0|$ [cm]"),
@@ -1133,7 +1136,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ((ak.num(objs["genMus"]) > 1) & (ak.num(objs["dsaMuons"]) > 1))
     ),
-    "dsaMuon_absD0_genMus_dR_XXLowRange": h.Histogram(
+    "dsaMuon_absD0_genMus_dR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"DSA muon $|d_0|$ [cm]"),
@@ -1147,7 +1150,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1
     ),
-    "leadingDsaMuon_absD0_genMus_dR_XXLowRange": h.Histogram(
+    "leadingDsaMuon_absD0_genMus_dR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"Leading DSA muon $|d_0|$ [cm]"),
@@ -1159,7 +1162,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ((ak.num(objs["genMus"]) > 1) & (ak.num(objs["dsaMuons"]) > 0))
     ),
-    "subLeadingDsaMuon_absD0_genMus_dR_XXLowRange": h.Histogram(
+    "subLeadingDsaMuon_absD0_genMus_dR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 200, name="dsaMuon_absD0",
                                      label=r"Sub Leading DSA muon $|d_0|$ [cm]"),
@@ -1172,79 +1175,79 @@ hist_defs = {
         evt_mask=lambda objs: ((ak.num(objs["genMus"]) > 1) & (ak.num(objs["dsaMuons"]) > 1))
     ),
     # dsamuon-genmuon, dR 0.4 window
-    "dsaMuon_genMu_ptRatio": h.Histogram(
+    "dsaMuon_genMu_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="dsaMuon_genMu_ptRatio"),
                    lambda objs, mask: objs["dsaMuons"].pt
-                       / objs["dsaMuons"].nearest(objs["genMus"], threshold=0.4).pt),
+                       / nearest(objs["dsaMuons"], objs["genMus"], 0.4).pt),
         ],
     ),
-    "dsaMuon0_genMu_ptRatio": h.Histogram(
+    "dsaMuon0_genMu_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="dsaMuon0_genMu_ptRatio"),
                    lambda objs, mask: (objs["dsaMuons"][mask, 0:1].pt
-                       / objs["dsaMuons"][mask, 0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                       / nearest(objs["dsaMuons"], objs["genMus"], 0.4)[mask, 0:1].pt)),
         ],
         evt_mask=lambda objs: ak.num(matched(objs["dsaMuons"] ,objs["genMus"], 0.4)) > 0,
     ),
-    "dsaMuon1_genMu_ptRatio": h.Histogram(
+    "dsaMuon1_genMu_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="dsaMuon1_genMu_ptRatio"),
                    lambda objs, mask: (objs["dsaMuons"][mask, 1:2].pt
-                       / objs["dsaMuons"][mask, 1:2].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                       / nearest(objs["dsaMuons"], objs["genMus"], 0.4)[mask, 1:2].pt)),
         ],
         evt_mask=lambda objs: ak.num(matched(objs["dsaMuons"], objs["genMus"], 0.4)) > 1,
     ),
     # pfmuon-genmuon, dR 0.4 window
-    "pfMuon_genMu_ptRatio": h.Histogram(
+    "pfMuon_genMu_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="pfMuon_genMu_ptRatio"),
                    lambda objs, mask: objs["muons"].pt
-                       / objs["muons"].nearest(objs["genMus"], threshold=0.4).pt),
+                       / nearest(objs["muons"], objs["genMus"], 0.4).pt),
         ],
     ),
-    "pfMuon0_genMu_ptRatio": h.Histogram(
+    "pfMuon0_genMu_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="pfMuon0_genMu_ptRatio"),
                    lambda objs, mask: (objs["muons"][mask,0:1].pt
-                       / objs["muons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                       / nearest(objs["muons"], objs["genMus"], 0.4)[mask,0:1].pt)),
         ],
         evt_mask=lambda objs: ak.num(matched(objs["muons"], objs["genMus"], 0.4)) > 0,
     ),
-    "pfMuon1_genMu_ptRatio": h.Histogram(
+    "pfMuon1_genMu_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="pfMuon1_genMu_ptRatio"),
                    lambda objs, mask: (objs["muons"][mask,1:2].pt
-                       / objs["muons"][mask,1:2].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                       / nearest(objs["muons"], objs["genMus"], 0.4)[mask,1:2].pt)),
         ],
         evt_mask=lambda objs: ak.num(matched(objs["muons"], objs["genMus"], 0.4)) > 1,
     ),
     # gen dark photons (A)
-    "genAs_eta": h.Histogram(
+    "genAs_eta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -3, 3, name=r"$Z_d$ $\eta$"),
                    lambda objs, mask: objs["genAs"].eta),
         ],
     ),
-    "genAs_n": obj_attr("genAs", "n"),
-    "genAs_toMu_n": obj_attr("genAs_toMu", "n"),
-    "genAs_toE_n": obj_attr("genAs_toE", "n"),
-    "genAs_toMu_matched_muLj_n": h.Histogram(
+    "genAs_n": lambda: obj_attr("genAs", "n"),
+    "genAs_toMu_n": lambda: obj_attr("genAs_toMu", "n"),
+    "genAs_toE_n": lambda: obj_attr("genAs_toE", "n"),
+    "genAs_toMu_matched_muLj_n": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(10, 0, 10, name="genA_n"),
                    lambda objs, mask: ak.num(derived_objs["genAs_toMu_matched_muLj"](objs, 0.4)))
         ],
     ),
-    "genAs_toE_matched_egmLj_n": h.Histogram(
+    "genAs_toE_matched_egmLj_n": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(10, 0, 10, name="genA_n"),
                    lambda objs, mask: ak.num(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4)))
         ],
     ),
-    "genAs_pt": obj_attr("genAs", "pt", xmax=200),
-    "genAs_pt_highRange": obj_attr("genAs", "pt", xmax=700),
-    "genAs_eta_phi": obj_eta_phi("genAs"),
-    "genAs_x_y": h.Histogram(
+    "genAs_pt": lambda: obj_attr("genAs", "pt", xmax=200),
+    "genAs_pt_highRange": lambda: obj_attr("genAs", "pt", xmax=700),
+    "genAs_eta_phi": lambda: obj_eta_phi("genAs"),
+    "genAs_x_y": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0.000, 0.025, name="genAs_x"),
                    lambda objs, mask: objs["genAs"].vx),
@@ -1252,7 +1255,7 @@ hist_defs = {
                    lambda objs, mask: objs["genAs"].vy),
         ],
     ),
-    "genAs_children_x_y": h.Histogram(
+    "genAs_children_x_y": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, -200, 200, name="genAs_children_x"),
                    lambda objs, mask: objs["genAs"].children.vx),
@@ -1260,162 +1263,169 @@ hist_defs = {
                    lambda objs, mask: objs["genAs"].children.vy),
         ],
     ),
-    "genAs_lxy": obj_attr("genAs", "lxy", xmax=500),
-    "genAs_lxy_lowRange": obj_attr("genAs", "lxy", xmax=10),
-    "genAs_children_n": h.Histogram(
+    "genAs_lxy": lambda: obj_attr("genAs", "lxy", xmax=500),
+    "genAs_lxy_lowRange": lambda: obj_attr("genAs", "lxy", xmax=10),
+    "genAs_children_n": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(10, 0, 10, name="genAs_children_n"),
                    lambda objs, mask: ak.num(objs["genAs"].children)),
         ],
     ),
-    "genAs_children_absPdgId": h.Histogram(
+    "genAs_children_absPdgId": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 50, name="genAs_children_absPdgId"),
                    lambda objs, mask: abs(objs["genAs"].children.pdgId)),
         ],
     ),
-    "genAs_toMu_lxy": obj_attr("genAs_toMu", "lxy", xmax=500),
-    "genAs_toMu_pt": obj_attr("genAs_toMu", "pt", xmax=200),
-    "genAs_toMu_pt_highRange": obj_attr("genAs_toMu", "pt", xmax=700),
-    "genAs_toMu_eta": h.Histogram(
+    "genAs_toMu_lxy": lambda: obj_attr("genAs_toMu", "lxy", xmax=500),
+    "genAs_toMu_pt": lambda: obj_attr("genAs_toMu", "pt", xmax=200),
+    "genAs_toMu_pt_highRange": lambda: obj_attr("genAs_toMu", "pt", xmax=700),
+    "genAs_toMu_eta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -3, 3, name=r"$Z_d$ $\eta$"),
                    lambda objs, mask: objs["genAs_toMu"].eta ),
         ],
     ),
-    "genAs_toE_lxy": obj_attr("genAs_toE", "lxy", xmax=500),
-    "genAs_toE_lxy_lowRange": obj_attr("genAs_toE", "lxy", xmax=20),
-    "genAs_toE_lxy_midRange": obj_attr("genAs_toE", "lxy", xmin=40, xmax=80),
-    "genAs_toE_lxy_ecal": obj_attr("genAs_toE", "lxy", xmin=125, xmax=135),
-    "genAs_toE_pt": obj_attr("genAs_toE", "pt", xmax=200),
-    "genAs_toE_pt_highRange": obj_attr("genAs_toE", "pt", xmax=700),
-    "genAs_toE_eta": h.Histogram(
+    "genAs_toE_lxy": lambda: obj_attr("genAs_toE", "lxy", xmax=500),
+    "genAs_toE_lxy_lowRange": lambda: obj_attr("genAs_toE", "lxy", xmax=20),
+    "genAs_toE_lxy_midRange": lambda: obj_attr("genAs_toE", "lxy", xmin=40, xmax=80),
+    "genAs_toE_lxy_ecal": lambda: obj_attr("genAs_toE", "lxy", xmin=125, xmax=135),
+    "genAs_toE_pt": lambda: obj_attr("genAs_toE", "pt", xmax=200),
+    "genAs_toE_pt_highRange": lambda: obj_attr("genAs_toE", "pt", xmax=700),
+    "genAs_toE_eta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -3, 3, name=r"$Z_d$ $\eta$"),
                    lambda objs, mask: objs["genAs_toE"].eta ),
         ],
     ),
-    "genAs_matched_lj_lxy": h.Histogram(
+    "genAs_matched_lj_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 500, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_matched_lj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_toMu_matched_lj_lxy": h.Histogram(
+    "genAs_toMu_matched_lj_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 500, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_toMu_matched_lj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_toE_matched_lj_lxy": h.Histogram(
+    "genAs_toE_matched_lj_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 500, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_toE_matched_lj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_matched_muLj_lxy": h.Histogram(
+    # LJ reconstruction efficiencies, filled with a pass axis; see histogram.efficiency
+    "genAs_lj_eff_lxy": lambda: obj_lj_eff("genAs", "lxy", xmax=500),
+    "genAs_lj_eff_pt": lambda: obj_lj_eff("genAs", "pt", xmax=700),
+    "genAs_toMu_lj_eff_lxy": lambda: obj_lj_eff("genAs_toMu", "lxy", xmax=500),
+    "genAs_toMu_lj_eff_pt": lambda: obj_lj_eff("genAs_toMu", "pt", xmax=700),
+    "genAs_toE_lj_eff_lxy": lambda: obj_lj_eff("genAs_toE", "lxy", xmax=500),
+    "genAs_toE_lj_eff_pt": lambda: obj_lj_eff("genAs_toE", "pt", xmax=700),
+    "genAs_matched_muLj_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 500, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_matched_muLj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_toMu_matched_muLj_lxy": h.Histogram(
+    "genAs_toMu_matched_muLj_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 500, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_toMu_matched_muLj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_toMu_matched_muLj_pt": h.Histogram(
+    "genAs_toMu_matched_muLj_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name=r"$Z_d$ $p_T$ $(GeV)$"),
                    lambda objs, mask: abs(derived_objs["genAs_toMu_matched_muLj"](objs, 0.4).pt) ),
         ],
     ),
-    "genAs_toMu_matched_muLj_pt_highRange": h.Histogram(
+    "genAs_toMu_matched_muLj_pt_highRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(140, 0, 700, name=r"$Z_d$ $p_T$ $(GeV)$"),
                    lambda objs, mask: abs(derived_objs["genAs_toMu_matched_muLj"](objs, 0.4).pt) ),
         ],
     ),
-    "genAs_toMu_matched_muLj_eta": h.Histogram(
+    "genAs_toMu_matched_muLj_eta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -3, 3, name=r"$Z_d$ $\eta$"),
                    lambda objs, mask: derived_objs["genAs_toMu_matched_muLj"](objs, 0.4).eta ),
         ],
     ),
-    "genAs_matched_egmLj_lxy": h.Histogram(
+    "genAs_matched_egmLj_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 500, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_matched_egmLj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_toE_matched_egmLj_lxy": h.Histogram(
+    "genAs_toE_matched_egmLj_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 500, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_toE_matched_egmLj_lxy_lowRange": h.Histogram(
+    "genAs_toE_matched_egmLj_lxy_lowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 20, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_toE_matched_egmLj_lxy_midRange": h.Histogram(
+    "genAs_toE_matched_egmLj_lxy_midRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 40, 80, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_toE_matched_egmLj_lxy_ecal": h.Histogram(
+    "genAs_toE_matched_egmLj_lxy_ecal": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 125, 135, name=r"$Z_d$ $L_{xy}$ $(cm)$"),
                    lambda objs, mask: lxy(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_matched_lj_n": h.Histogram(
+    "genAs_matched_lj_n": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(10, 0, 10, name="genAs_matched_lj_n"),
                    lambda objs, mask: ak.num(derived_objs["genAs_matched_lj"](objs, 0.4)) ),
         ],
     ),
-    "genAs_matched_lj_pt": h.Histogram(
+    "genAs_matched_lj_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name=r"$Z_d$ $p_T$ $(GeV)$"),
                    lambda objs, mask: abs(derived_objs["genAs_matched_lj"](objs, 0.4).pt) ),
         ],
     ),
-    "genAs_matched_lj_pt_highRange": h.Histogram(
+    "genAs_matched_lj_pt_highRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(140, 0, 700, name=r"$Z_d$ $p_T$ $(GeV)$"),
                    lambda objs, mask: abs(derived_objs["genAs_matched_lj"](objs, 0.4).pt) ),
         ],
     ),
-    "genAs_matched_lj_eta": h.Histogram(
+    "genAs_matched_lj_eta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -3, 3, name=r"$Z_d$ $\eta$"),
                    lambda objs, mask: derived_objs["genAs_matched_lj"](objs, 0.4).eta ),
         ],
     ),
-    "genAs_toE_matched_egmLj_pt": h.Histogram(
+    "genAs_toE_matched_egmLj_pt": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name=r"$Z_d$ $p_T$ $(GeV)$"),
                    lambda objs, mask: abs(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4).pt) ),
         ],
     ),
-    "genAs_toE_matched_egmLj_pt_highRange": h.Histogram(
+    "genAs_toE_matched_egmLj_pt_highRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(140, 0, 700, name=r"$Z_d$ $p_T$ $(GeV)$"),
                    lambda objs, mask: abs(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4).pt) ),
         ],
     ),
-    "genAs_toE_matched_egmLj_eta": h.Histogram(
+    "genAs_toE_matched_egmLj_eta": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, -3, 3, name=r"$Z_d$ $\eta$"),
                    lambda objs, mask: derived_objs["genAs_toE_matched_egmLj"](objs, 0.4).eta ),
         ],
     ),
-    "genAs_pt_lxy": h.Histogram(
+    "genAs_pt_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 200, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs"].pt)),
@@ -1423,7 +1433,7 @@ hist_defs = {
                    lambda objs, mask: lxy(objs["genAs"])),
         ],
     ),
-    "genMu0_pt_MuMudR": h.Histogram(
+    "genMu0_pt_MuMudR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 200, name="genMu0_pt",
                                      label=r"Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1433,7 +1443,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu0_pt_MuMudR_XLowRange": h.Histogram(
+    "genMu0_pt_MuMudR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 200, name="genMu0_pt",
                                      label=r"Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1443,7 +1453,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu0_pt_MuMudR_XXLowRange": h.Histogram(
+    "genMu0_pt_MuMudR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 200, name="genMu0_pt",
                                      label=r"Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1453,7 +1463,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu0_pt_highRange_MuMudR": h.Histogram(
+    "genMu0_pt_highRange_MuMudR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 700, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1463,7 +1473,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu0_pt_highRange_MuMudR_XLowRange": h.Histogram(
+    "genMu0_pt_highRange_MuMudR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 700, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1473,7 +1483,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu0_pt_highRange_MuMudR_XXLowRange": h.Histogram(
+    "genMu0_pt_highRange_MuMudR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 700, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1483,7 +1493,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu1_pt_MuMudR": h.Histogram(
+    "genMu1_pt_MuMudR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 200, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1493,7 +1503,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu1_pt_MuMudR_XLowRange": h.Histogram(
+    "genMu1_pt_MuMudR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 200, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1503,7 +1513,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu1_pt_MuMudR_XXLowRange": h.Histogram(
+    "genMu1_pt_MuMudR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 200, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1513,7 +1523,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu1_pt_highRange_MuMudR": h.Histogram(
+    "genMu1_pt_highRange_MuMudR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 700, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1523,7 +1533,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu1_pt_highRange_MuMudR_XLowRange": h.Histogram(
+    "genMu1_pt_highRange_MuMudR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 700, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1533,7 +1543,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genMu1_pt_highRange_MuMudR_XXLowRange": h.Histogram(
+    "genMu1_pt_highRange_MuMudR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 700, name="genMu0_pt",
                                      label=r"Sub-Leading gen-level muon $p_{T}$ [GeV]"),
@@ -1543,7 +1553,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genAs_toMu_pt_MuMudR_lowRange": h.Histogram(
+    "genAs_toMu_pt_MuMudR_lowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,200, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toMu"].pt)),
@@ -1552,7 +1562,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genAs_toMu_pt_MuMudR_XLowRange": h.Histogram(
+    "genAs_toMu_pt_MuMudR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,200, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toMu"].pt)),
@@ -1561,7 +1571,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genAs_toMu_pt_MuMudR_XXLowRange": h.Histogram(
+    "genAs_toMu_pt_MuMudR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,200, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toMu"].pt)),
@@ -1570,7 +1580,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genAs_toMu_lxy_MuMudR": h.Histogram(
+    "genAs_toMu_lxy_MuMudR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,400, name="genAs_lxy"),
                    lambda objs, mask: lxy(objs["genAs_toMu"])),
@@ -1579,7 +1589,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genAs_toMu_lxy_MuMudR_XLowRange": h.Histogram(
+    "genAs_toMu_lxy_MuMudR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,400, name="genAs_lxy"),
                    lambda objs, mask: lxy(objs["genAs_toMu"])),
@@ -1588,7 +1598,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genAs_toMu_lxy_MuMudR_XXLowRange": h.Histogram(
+    "genAs_toMu_lxy_MuMudR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,400, name="genAs_lxy"),
                    lambda objs, mask: lxy(objs["genAs_toMu"])),
@@ -1597,7 +1607,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genAs_toMu_lxy_pt_lowRange": h.Histogram(
+    "genAs_toMu_lxy_pt_lowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 400, name="genAs_lxy"),
                    lambda objs, mask: lxy(objs["genAs_toMu"])),
@@ -1605,7 +1615,7 @@ hist_defs = {
                    lambda objs, mask: abs(objs["genAs_toMu"].pt)),
         ],
     ),
-    "genAs_toE_pt_EEdR_lowRange": h.Histogram(
+    "genAs_toE_pt_EEdR_lowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,200, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toE"].pt)),
@@ -1614,7 +1624,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genAs_toE_pt_EEdR_XLowRange": h.Histogram(
+    "genAs_toE_pt_EEdR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,200, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toE"].pt)),
@@ -1623,7 +1633,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genAs_toE_pt_EEdR_XXLowRange": h.Histogram(
+    "genAs_toE_pt_EEdR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,200, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toE"].pt)),
@@ -1632,7 +1642,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genAs_toE_lxy_EEdR": h.Histogram(
+    "genAs_toE_lxy_EEdR": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,150, name="genAs_lxy"),
                    lambda objs, mask: lxy(objs["genAs_toE"])),
@@ -1641,7 +1651,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genAs_toE_lxy_EEdR_XLowRange": h.Histogram(
+    "genAs_toE_lxy_EEdR_XLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,150, name="genAs_lxy"),
                    lambda objs, mask: lxy(objs["genAs_toE"])),
@@ -1650,7 +1660,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genAs_toE_lxy_EEdR_XXLowRange": h.Histogram(
+    "genAs_toE_lxy_EEdR_XXLowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,150, name="genAs_lxy"),
                    lambda objs, mask: lxy(objs["genAs_toE"])),
@@ -1659,7 +1669,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genEs"]) > 1,
     ),
-    "genAs_toE_lxy_pt_lowRange": h.Histogram(
+    "genAs_toE_lxy_pt_lowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 150, name="genAs_lxy"),
                    lambda objs, mask: lxy(objs["genAs_toE"])),
@@ -1667,7 +1677,7 @@ hist_defs = {
                    lambda objs, mask: abs(objs["genAs_toE"].pt)),
         ],
     ),
-    "genAs_toE_pt_lxy": h.Histogram(
+    "genAs_toE_pt_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(140, 0,700, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toE"].pt)),
@@ -1675,7 +1685,7 @@ hist_defs = {
                    lambda objs, mask: lxy(objs["genAs_toE"])),
         ],
     ),
-    "genAs_toE_matched_egmLj_pt_lxy": h.Histogram(
+    "genAs_toE_matched_egmLj_pt_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(140, 0, 700, name="genAs_pt"),
                    lambda objs, mask: abs(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4).pt)),
@@ -1683,7 +1693,7 @@ hist_defs = {
                    lambda objs, mask: lxy(derived_objs["genAs_toE_matched_egmLj"](objs, 0.4))),
         ],
     ),
-    "genAs_toMu_pt_lxy": h.Histogram(
+    "genAs_toMu_pt_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0, 500, name="genAs_lxy", label =r"$Z_d$ $L_{xy}$"),
                    lambda objs, mask: lxy(objs["genAs_toMu"])),
@@ -1691,7 +1701,7 @@ hist_defs = {
                    lambda objs, mask: abs(objs["genAs_toMu"].pt)),
         ],
     ),
-    "genAs_toMu_matched_muLj_pt_lxy": h.Histogram(
+    "genAs_toMu_matched_muLj_pt_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(50, 0, 500, name="genAs_lxy"),
                    lambda objs, mask: lxy(derived_objs["genAs_toMu_matched_muLj"](objs, 0.4))),
@@ -1699,7 +1709,7 @@ hist_defs = {
                    lambda objs, mask: abs(derived_objs["genAs_toMu_matched_muLj"](objs, 0.4).pt)),
         ],
     ),
-    "genAs_toMu_pt_MuMudR_highRange": h.Histogram(
+    "genAs_toMu_pt_MuMudR_highRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,700, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toMu"].pt)),
@@ -1708,7 +1718,7 @@ hist_defs = {
         ],
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
-    "genAs_toMu_pt_highRange_MuMudR_lowRange": h.Histogram(
+    "genAs_toMu_pt_highRange_MuMudR_lowRange": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(25, 0,700, name="genAs_pt"),
                    lambda objs, mask: abs(objs["genAs_toMu"].pt)),
@@ -1718,7 +1728,7 @@ hist_defs = {
         evt_mask=lambda objs: ak.num(objs["genMus"]) > 1,
     ),
     # genA-genA
-    "genAs_genAs_absdphi": h.Histogram(
+    "genAs_genAs_absdphi": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, math.pi, name="genAs_genAs_absdphi",
                                      label=r"|$\Delta\phi$ between $Z_d$|"),
@@ -1727,21 +1737,21 @@ hist_defs = {
         evt_mask=lambda objs: ak.num(objs["genAs"]) > 1,
     ),
     # genA-LJ
-    "genAs_lj_dR": h.Histogram(
+    "genAs_lj_dR": lambda: h.Histogram(
         [
             # dR(A, nearest LJ)
             h.Axis(hist.axis.Regular(200, 0, 2*math.pi, name="genAs_lj_dR"),
                    lambda objs, mask: dR(objs["genAs"], objs["ljs"]))
         ],
     ),
-    "genAs_toE_lj_dR": h.Histogram(
+    "genAs_toE_lj_dR": lambda: h.Histogram(
         [
             # dR(A, nearest LJ)
             h.Axis(hist.axis.Regular(200, 0, 2*math.pi, name="genAs_toE_lj_dR"),
                    lambda objs, mask: dR(objs["genAs_toE"], objs["ljs"]))
         ],
     ),
-    "genAs_lj_dR_lowRange": h.Histogram(
+    "genAs_lj_dR_lowRange": lambda: h.Histogram(
         [
             # dR(A, nearest LJ)
             h.Axis(hist.axis.Regular(200, 0, 1.0, name="genAs_lj_dR_lowRange"),
@@ -1749,245 +1759,245 @@ hist_defs = {
         ],
     ),
     # genA - LJ 0.4 matching radius, pT Ratios
-    "genA_lj_ptRatio": h.Histogram(
+    "genA_lj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_lj_ptRatio",
                    label=r"Lepton Jet pT / (closest) $Z_d$ pT"),
                    lambda objs, mask: objs["ljs"].pt
-                       / objs["ljs"].nearest(objs["genAs"], threshold=0.4).pt),
+                       / nearest(objs["ljs"], objs["genAs"], 0.4).pt),
         ],
     ),
-    "genA_egmLj_ptRatio": h.Histogram(
+    "genA_egmLj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_egmLj_ptRatio",
                    label=r"EGM Lepton Jet pT / (closest) $Z_d$ pT"),
                    lambda objs, mask: objs["egm_ljs"].pt
-                       / objs["egm_ljs"].nearest(objs["genAs_toE"], threshold=0.4).pt),
+                       / nearest(objs["egm_ljs"], objs["genAs_toE"], 0.4).pt),
         ],
     ),
-    "genA_oneElectronLj_ptRatio": h.Histogram(
+    "genA_oneElectronLj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_oneElectronLj_ptRatio",
                    label=r"(1) Electron Lepton Jet / (closest) $Z_d$ pT"),
                    lambda objs, mask: derived_objs["n_electron_ljs"](objs, 1).pt
-                       / derived_objs["n_electron_ljs"](objs, 1).nearest(objs["genAs_toE"], threshold=0.4).pt),
+                       / nearest(derived_objs["n_electron_ljs"](objs, 1), objs["genAs_toE"], 0.4).pt),
         ],
     ),
-    "genA_twoElectronLj_ptRatio": h.Histogram(
+    "genA_twoElectronLj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_twoElectronLj_ptRatio",
                    label=r"(2) Electron Lepton Jet / (closest) $Z_d$ pT"),
                    lambda objs, mask: derived_objs["n_electron_ljs"](objs, 2).pt
-                       / derived_objs["n_electron_ljs"](objs, 2).nearest(objs["genAs_toE"], threshold=0.4).pt),
+                       / nearest(derived_objs["n_electron_ljs"](objs, 2), objs["genAs_toE"], 0.4).pt),
         ],
     ),
-    "genA_onePhotonLj_ptRatio": h.Histogram(
+    "genA_onePhotonLj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_onePhotonLj_ptRatio",
                    label=r"(1) Photon Lepton Jet / (closest) $Z_d$ pT"),
                    lambda objs, mask: derived_objs["n_photon_ljs"](objs, 1).pt
-                       / derived_objs["n_photon_ljs"](objs, 1).nearest(objs["genAs_toE"], threshold=0.4).pt),
+                       / nearest(derived_objs["n_photon_ljs"](objs, 1), objs["genAs_toE"], 0.4).pt),
         ],
     ),
-    "genA_twoPhotonLj_ptRatio": h.Histogram(
+    "genA_twoPhotonLj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_twoPhotonLj_ptRatio",
                    label=r"(2) Photon Lepton Jet / (closest) $Z_d$ pT"),
                    lambda objs, mask: derived_objs["n_photon_ljs"](objs, 2).pt
-                       / derived_objs["n_photon_ljs"](objs, 2).nearest(objs["genAs_toE"], threshold=0.4).pt),
+                       / nearest(derived_objs["n_photon_ljs"](objs, 2), objs["genAs_toE"], 0.4).pt),
         ],
     ),
-    "genA_muLj_ptRatio": h.Histogram(
+    "genA_muLj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_muLj_ptRatio",
                    label=r"Muon Lepton Jet pT / (closest) $Z_d$ pT"),
                    lambda objs, mask: objs["mu_ljs"].pt
-                       / objs["mu_ljs"].nearest(objs["genAs_toMu"], threshold=0.4).pt),
+                       / nearest(objs["mu_ljs"], objs["genAs_toMu"], 0.4).pt),
         ],
     ),
-    "genA_dsaMuonLj_ptRatio": h.Histogram(
+    "genA_dsaMuonLj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_dsaMuonLj_ptRatio",
                    label=r"DSA Muon Lepton Jet pT / (closest) $Z_d$ pT"),
-                   lambda objs, mask: (objs["dsaMuons"][mask]).nearest(objs["ljs"][mask], threshold=0.4).pt
-                       / (objs["dsaMuons"][mask]).nearest(objs["genAs_toMu"][mask], threshold=0.4).pt),
+                   lambda objs, mask: nearest(objs["dsaMuons"], objs["ljs"], 0.4)[mask].pt
+                       / nearest(objs["dsaMuons"], objs["genAs_toMu"], 0.4)[mask].pt),
         ],
     ),
-    "genA_pfMuonLj_ptRatio": h.Histogram(
+    "genA_pfMuonLj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_pfMuonLj_ptRatio",
                    label=r"PF Muon Lepton Jet pT / (closest) $Z_d$ pT"),
-                   lambda objs, mask: (objs["muons"][mask]).nearest(objs["ljs"][mask], threshold=0.4).pt
-                       / (objs["muons"][mask]).nearest(objs["genAs_toMu"][mask], threshold=0.4).pt),
+                   lambda objs, mask: nearest(objs["muons"], objs["ljs"], 0.4)[mask].pt
+                       / nearest(objs["muons"], objs["genAs_toMu"], 0.4)[mask].pt),
         ],
     ),
-    "genA_dsaMuon0Lj_ptRatio": h.Histogram(
+    "genA_dsaMuon0Lj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_dsaMuonLj_ptRatio",
                    label=r"Lead DSA Muon Lepton Jet / (closest) $Z_d$ pT"),
-                   lambda objs, mask: ((objs["dsaMuons"][mask, 0:1]).nearest(objs["ljs"][mask], threshold=0.4).pt
-                       / (objs["dsaMuons"][mask, 0:1]).nearest(objs["genAs_toMu"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["dsaMuons"], objs["ljs"], 0.4)[mask, 0:1].pt
+                       / nearest(objs["dsaMuons"], objs["genAs_toMu"], 0.4)[mask, 0:1].pt)),
         ],
         evt_mask=lambda objs: ((ak.num(matched(objs["dsaMuons"], objs["genAs_toMu"], 0.4)) > 0)
                                & (ak.num(matched(objs["dsaMuons"], objs["ljs"], 0.4)) > 0)),
     ),
-    "genA_pfMuon0Lj_ptRatio": h.Histogram(
+    "genA_pfMuon0Lj_ptRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_pfMuonLj_ptRatio",
                    label=r"Lead PF Muon Lepton Jet / (closest) $Z_d$ pT"),
-                   lambda objs, mask: ((objs["muons"][mask, 0:1]).nearest(objs["ljs"][mask], threshold=0.4).pt
-                       / (objs["muons"][mask, 0:1]).nearest(objs["genAs_toMu"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["muons"], objs["ljs"], 0.4)[mask, 0:1].pt
+                       / nearest(objs["muons"], objs["genAs_toMu"], 0.4)[mask, 0:1].pt)),
         ],
         evt_mask=lambda objs: ((ak.num(matched(objs["muons"], objs["genAs_toMu"], 0.4)) > 0)
                                & (ak.num(matched(objs["muons"], objs["ljs"], 0.4)) > 0)),
     ),
     # genA - LJ 0.4 matching radius, LJ Reco Lxy / True Lxy
-    "genA_muLj_lxyRatio": h.Histogram(
+    "genA_muLj_lxyRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_muLj_lxyRatio",
                                     label=r"Muon Lepton Jet Reco L$_{xy}$ / (closest) $Z_d$ L$_{xy}$"),
                    lambda objs, mask: objs["mu_ljs"].kinvtx.lxy
-                       / lxy(objs["mu_ljs"].nearest(objs["genAs"], threshold=0.4))),
+                       / lxy(nearest(objs["mu_ljs"], objs["genAs"], 0.4))),
         ],
     ),
-    "genA_egmLj_lxyRatio": h.Histogram(
+    "genA_egmLj_lxyRatio": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="genA_egmLj_lxyRatio",
                                     label=r"EGM Lepton Jet Reco L$_{xy}$ / (closest) $Z_d$ L$_{xy}$"),
                    lambda objs, mask: objs["egm_ljs"].kinvtx.lxy
-                       / lxy(objs["egm_ljs"].nearest(objs["genAs"], threshold=0.4))),
+                       / lxy(nearest(objs["egm_ljs"], objs["genAs"], 0.4))),
         ],
     ),
     # LJ Res vs Reco Lxy
-    "mu_lj_genA_ptRatio_vs_recolxy": h.Histogram(
+    "mu_lj_genA_ptRatio_vs_recolxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="mu_lj_genA_ptRatio"),
                    lambda objs, mask: objs["mu_ljs"].pt
-                       / objs["mu_ljs"].nearest(objs["genAs"]).pt),
+                       / nearest(objs["mu_ljs"], objs["genAs"]).pt),
             h.Axis(hist.axis.Regular(100, 0, 300, name="mu_lj_recolxy"),
                    lambda objs, mask: objs["mu_ljs"].kinvtx.lxy),
         ],
     ),
-    "egm_lj_genA_ptRatio_vs_recolxy": h.Histogram(
+    "egm_lj_genA_ptRatio_vs_recolxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="egm_lj_genA_ptRatio"),
                    lambda objs, mask: objs["egm_ljs"].pt
-                       / objs["egm_ljs"].nearest(objs["genAs"]).pt),
+                       / nearest(objs["egm_ljs"], objs["genAs"]).pt),
             h.Axis(hist.axis.Regular(100, 0, 300, name="egm_lj_recolxy"),
                    lambda objs, mask: objs["egm_ljs"].kinvtx.lxy),
         ],
     ),
     # LJ Res vs True Lxy, 0.4 thresholds on dR matching
-    "egm_lj_genA_ptRatio_vs_truelxy": h.Histogram(
+    "egm_lj_genA_ptRatio_vs_truelxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="egm_lj_genA_ptRatio"),
                    lambda objs, mask: objs["egm_ljs"].pt
-                       / objs["egm_ljs"].nearest(objs["genAs"], threshold=0.4).pt),
+                       / nearest(objs["egm_ljs"], objs["genAs"], 0.4).pt),
             h.Axis(hist.axis.Regular(100, 0, 300, name="egm_lj_truelxy"),
-                   lambda objs, mask: lxy(objs["egm_ljs"].nearest(objs["genAs"], threshold=0.4))),
+                   lambda objs, mask: lxy(nearest(objs["egm_ljs"], objs["genAs"], 0.4))),
         ],
     ),
-    "mu_lj_genA_ptRatio_vs_truelxy": h.Histogram(
+    "mu_lj_genA_ptRatio_vs_truelxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 2.0, name="mu_lj_genA_ptRatio"),
                    lambda objs, mask: objs["mu_ljs"].pt
-                       / objs["mu_ljs"].nearest(objs["genAs"], threshold=0.4).pt),
+                       / nearest(objs["mu_ljs"], objs["genAs"], 0.4).pt),
             h.Axis(hist.axis.Regular(100, 0, 300, name="mu_lj_truelxy"),
-                   lambda objs, mask: lxy(objs["mu_ljs"].nearest(objs["genAs"], threshold=0.4))),
+                   lambda objs, mask: lxy(nearest(objs["mu_ljs"], objs["genAs"], 0.4))),
         ],
     ),
-    "dsaMuon0_genMu0_ptRatio_vs_truelxy": h.Histogram(
+    "dsaMuon0_genMu0_ptRatio_vs_truelxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0., 2.0, name="dsaMuon0_genMu0_ptRatio"),
                    lambda objs, mask: (objs["dsaMuons"][mask,0:1].pt
-                       / objs["dsaMuons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                       / nearest(objs["dsaMuons"], objs["genMus"], 0.4)[mask,0:1].pt)),
             h.Axis(hist.axis.Regular(100, 0, 300, name="dsaMuon0_lj_truelxy"),
-                   lambda objs, mask: lxy(objs["dsaMuons"][mask,0:1].nearest(objs["genAs"][mask], threshold=0.4))),
+                   lambda objs, mask: lxy(nearest(objs["dsaMuons"], objs["genAs"], 0.4)[mask,0:1])),
         ],
         evt_mask=lambda objs: ((ak.num(matched(objs["genMus"], objs["dsaMuons"], 0.4)) > 0)
                                & (ak.num(matched(objs["genAs"], objs["dsaMuons"], 0.4)) > 0)),
     ),
-    "muon0_genMu0_ptRatio_vs_truelxy": h.Histogram(
+    "muon0_genMu0_ptRatio_vs_truelxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0., 2.0, name="muon0_genMu0_ptRatio"),
                    lambda objs, mask: (objs["muons"][mask,0:1].pt
-                       / objs["muons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                       / nearest(objs["muons"], objs["genMus"], 0.4)[mask,0:1].pt)),
             h.Axis(hist.axis.Regular(100, 0, 300, name="pfMuon0_lj_truelxy"),
-                   lambda objs, mask: lxy(objs["muons"][mask,0:1].nearest(objs["genAs"][mask], threshold=0.4))),
+                   lambda objs, mask: lxy(nearest(objs["muons"], objs["genAs"], 0.4)[mask,0:1])),
         ],
         evt_mask=lambda objs: ((ak.num(matched(objs["genMus"], objs["muons"], 0.4)) > 0)
                                & (ak.num(matched(objs["genAs"], objs["muons"], 0.4)) > 0)),
     ),
     # LJ Res vs True pT, dR 0.4 matching window
-    "dsaMuon0_genMu0_ptRatio_vs_truept": h.Histogram(
+    "dsaMuon0_genMu0_ptRatio_vs_truept": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 2.0, name="dsaMuon0_genMu0_ptRatio"),
                    lambda objs, mask: (objs["dsaMuons"][mask,0:1].pt
-                       / objs["dsaMuons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                       / nearest(objs["dsaMuons"], objs["genMus"], 0.4)[mask,0:1].pt)),
             h.Axis(hist.axis.Regular(200, 0, 1000, name="genMu0_pt"),
-                   lambda objs, mask: (objs["dsaMuons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["dsaMuons"], objs["genMus"], 0.4)[mask,0:1].pt)),
         ],
         evt_mask=lambda objs: (ak.num(objs["dsaMuons"]) > 0),
     ),
-    "muon0_genMu0_ptRatio_vs_truept": h.Histogram(
+    "muon0_genMu0_ptRatio_vs_truept": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 2.0, name="muon0_genMu0_ptRatio"),
                    lambda objs, mask: (objs["muons"][mask,0:1].pt
-                       / objs["muons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                       / nearest(objs["muons"], objs["genMus"], 0.4)[mask,0:1].pt)),
             h.Axis(hist.axis.Regular(200, 0, 1000, name="genMu0_pt"),
-                   lambda objs, mask: (objs["muons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["muons"], objs["genMus"], 0.4)[mask,0:1].pt)),
         ],
         evt_mask=lambda objs: (ak.num(objs["muons"]) > 0),
     ),
-    "dsaMuon0_muLj_ptRatio_vs_truept": h.Histogram(
+    "dsaMuon0_muLj_ptRatio_vs_truept": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0, 2.0, name="dsaMuon0_genMu0_ptRatio"),
-                   lambda objs, mask: (objs["dsaMuons"][mask,0:1].nearest(objs["ljs"][mask], threshold=0.4).pt
-                       / objs["dsaMuons"][mask,0:1].nearest(objs["genAs"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["dsaMuons"], objs["ljs"], 0.4)[mask,0:1].pt
+                       / nearest(objs["dsaMuons"], objs["genAs"], 0.4)[mask,0:1].pt)),
             h.Axis(hist.axis.Regular(200, 0, 1000, name="genMu0_pt"),
-                   lambda objs, mask: (objs["dsaMuons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["dsaMuons"], objs["genMus"], 0.4)[mask,0:1].pt)),
         ],
         evt_mask=lambda objs: (ak.num(objs["dsaMuons"]) > 0),
     ),
-    "muon0_muLj_ptRatio_vs_truept": h.Histogram(
+    "muon0_muLj_ptRatio_vs_truept": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0., 2.0, name="muon0_muLj_ptRatio"),
-                   lambda objs, mask: (objs["muons"][mask,0:1].nearest(objs["ljs"][mask], threshold=0.4).pt
-                       / objs["muons"][mask,0:1].nearest(objs["genAs"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["muons"], objs["ljs"], 0.4)[mask,0:1].pt
+                       / nearest(objs["muons"], objs["genAs"], 0.4)[mask,0:1].pt)),
             h.Axis(hist.axis.Regular(200, 0, 1000, name="genMu0_pt"),
-                   lambda objs, mask: (objs["muons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["muons"], objs["genMus"], 0.4)[mask,0:1].pt)),
         ],
         evt_mask=lambda objs: ((ak.num(matched(objs["ljs"], objs["muons"], 0.4)) > 0)
                                & (ak.num(matched(objs["genMus"], objs["muons"], 0.4)) > 0)),
     ),
-    "egmLj_ptRatio_vs_egm_truept": h.Histogram(
+    "egmLj_ptRatio_vs_egm_truept": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(100, 0., 2.0, name="egm_lj_genA_ptRatio"),
                    lambda objs, mask: objs["egm_ljs"].pt
-                       / objs["egm_ljs"].nearest(objs["genAs"], threshold=0.4).pt),
+                       / nearest(objs["egm_ljs"], objs["genAs"], 0.4).pt),
             h.Axis(hist.axis.Regular(100, 0, 1000, name="genE_pt"),
-                   lambda objs, mask: (objs["egm_ljs"].nearest(objs["genEs"], threshold=0.4).pt)[mask,0]),
+                   lambda objs, mask: (nearest(objs["egm_ljs"], objs["genEs"], 0.4).pt)[mask,0]),
         ],
     ),
     # LJ True pT vs True Lxy, dR 0.4 matching window
-    "genMu0_truept_vs_dsaMuon0_lxy": h.Histogram(
+    "genMu0_truept_vs_dsaMuon0_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 1000, name="genMu0_pt"),
-                   lambda objs, mask: (objs["dsaMuons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["dsaMuons"], objs["genMus"], 0.4)[mask,0:1].pt)),
             h.Axis(hist.axis.Regular(100, 0, 300, name="dsaMuon0_lj_truelxy"),
-                   lambda objs, mask: lxy(objs["dsaMuons"][mask,0:1].nearest(objs["genAs"][mask], threshold=0.4))),
+                   lambda objs, mask: lxy(nearest(objs["dsaMuons"], objs["genAs"], 0.4)[mask,0:1])),
         ],
         evt_mask=lambda objs: ((ak.num(matched(objs["genMus"], objs["dsaMuons"], 0.4)) > 0)
                                & (ak.num(matched(objs["genAs"], objs["dsaMuons"], 0.4)) > 0)),
     ),
-    "genMu0_truept_vs_muon0_lxy": h.Histogram(
+    "genMu0_truept_vs_muon0_lxy": lambda: h.Histogram(
         [
             h.Axis(hist.axis.Regular(200, 0, 1000, name="genMu0_pt"),
-                   lambda objs, mask: (objs["muons"][mask,0:1].nearest(objs["genMus"][mask], threshold=0.4).pt)),
+                   lambda objs, mask: (nearest(objs["muons"], objs["genMus"], 0.4)[mask,0:1].pt)),
             h.Axis(hist.axis.Regular(100, 0, 300, name="pfMuon0_lj_truelxy"),
-                   lambda objs, mask: lxy(objs["muons"][mask,0:1].nearest(objs["genAs"][mask], threshold=0.4))),
+                   lambda objs, mask: lxy(nearest(objs["muons"], objs["genAs"], 0.4)[mask,0:1])),
         ],
         evt_mask=lambda objs: ((ak.num(matched(objs["genMus"], objs["muons"], 0.4)) > 0)
                                & (ak.num(matched(objs["genAs"], objs["muons"], 0.4)) > 0)),
     ),
-}
+})
@@ -0,0 +1,29 @@
+"""Define all available cut threshold scans
+
+Each scan replaces a family of hand-written threshold cuts (e.g. "lxy <= 150 cm", "lxy <= 250 cm")
+with one variable and a grid of thresholds; see sidm.tools.scan.
+"""
+
+# columnar analysis
+import numpy as np
+# local
+from sidm.tools.scan import Scan
+from sidm.tools.utilities import lxy
+
+
+scan_defs = {
+    # decay length of the dark photons
+    "genAs_lxy": Scan(lambda objs: lxy(objs["genAs"]), np.linspace(0, 500, 51),
+                      label="genA $L_{xy}$ [cm]"),
+    "genAs_toMu_lxy": Scan(lambda objs: lxy(objs["genAs_toMu"]), np.linspace(0, 500, 51),
+                           label="genA->mumu $L_{xy}$ [cm]"),
+    "genAs_toE_lxy": Scan(lambda objs: lxy(objs["genAs_toE"]), np.linspace(0, 500, 51),
+                          label="genA->ee $L_{xy}$ [cm]"),
+    # pT thresholds
+    "genAs_pt": Scan(lambda objs: objs["genAs"].pt, np.linspace(0, 500, 51), keep="above",
+                     label="genA $p_{T}$ [GeV]"),
+    "ljs_pt": Scan(lambda objs: objs["ljs"].pt, np.linspace(0, 200, 41), keep="above",
+                   label="LJ $p_{T}$ [GeV]"),
+    "two_ljs_pt": Scan(lambda objs: objs["ljs"].pt, np.linspace(0, 200, 41), keep="above",
+                       min_count=2, label="Subleading LJ $p_{T}$ [GeV]"),
+}
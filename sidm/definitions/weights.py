@@ -0,0 +1,28 @@
+"""Define all available event weight variations
+
+Each variation is a function of the events that returns one weight per event. SidmProcessor can
+fill hists and cutflows for several variations in a single pass (see its weight_variations
+argument), in which case hists gain a "variation" axis.
+
+Variations in unnormalized_variations count events rather than weight them, so normalization to
+cross section times luminosity (see sidm.tools.normalization) leaves them unscaled. All other
+variations are scaled by xsec*lumi/sum(genWeight).
+"""
+
+# columnar analysis
+import numpy as np
+import awkward as ak
+# local
+from sidm.definitions.objects import preLj_objs
+
+
+weight_defs = {
+    # generator weight, as used for all weighted hists by default
+    "nominal": lambda evts: preLj_objs["weight"](evts),
+    # raw event counts
+    "unit": lambda evts: ak.ones_like(preLj_objs["weight"](evts)),
+    # sign of the generator weight, e.g. for samples with negative weights but no normalization
+    "genWeight sign": lambda evts: np.sign(preLj_objs["weight"](evts)),
+}
+
+unnormalized_variations = ["unit", "genWeight sign"]
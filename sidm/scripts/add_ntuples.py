@@ -2,15 +2,22 @@
 
 Developed and tested on FNAL LPC. Will be updated after issue
 https://github.com/CoffeaTeam/coffea-casa/issues/374 is resolved. Note that cmsenv or equivalent
-is needed to import XRootD.
+is needed to import XRootD when crawling a root:// directory. Local directories, e.g. mirrored or
+test trees, are crawled with the standard library instead.
+
+Directory listings of all samples are issued concurrently by up to WORKERS threads. The size of
+each file is recorded under file_sizes so that chunk planning doesn't need to reopen files.
 
 Usage: python add_ntuples.py -o OUTPUT_CONFIG -n NTUPLE_NAME -c NTUPLE_COMMENT -d NTUPLE_ROOT_DIR
+           [-w WORKERS]
 """
 
 from __future__ import print_function
 import argparse
+import collections
+import concurrent.futures
+import os
 import yaml
-from XRootD import client
 
 
 parser = argparse.ArgumentParser()
@@ -26,6 +33,8 @@ parser.add_argument("-d", "--directory", dest="directory", required=True,
                     "'root://cmseos.fnal.gov//store/group/lpcmetx/SIDM/ffNtupleV4/2018/'"))
 parser.add_argument("-f", "--first-dir", dest="first_dir", action='store_true',
                     help="Choose first option when encountering unexpected directory structure")
+parser.add_argument("-w", "--workers", type=int, default=16,
+                    help="Number of directory listings to issue concurrently")
 # fixme: add option to associate multiple subdirectories with one process name
 args = parser.parse_args()
 
@@ -76,10 +85,66 @@ def parse_name(name):
     return simplified_name
 
 
-def descend(ntuple_path, sample_path, choose_first_dir=False):
-    path = ntuple_path + "/" + sample_path
-    dir_contents = xrd_client.dirlist(path)[1]
-    num_found = dir_contents.size
+# Directory entry returned by FileSystem.listdir; size is in bytes
+Entry = collections.namedtuple("Entry", ["name", "is_dir", "size"])
+
+
+class XRootDFileSystem:
+    """List directories on an XRootD server, e.g. root://cmseos.fnal.gov"""
+
+    def __init__(self, redirector):
+        # only import XRootD when it is needed, since it requires cmsenv or equivalent
+        from XRootD import client # pylint: disable=import-outside-toplevel
+        from XRootD.client.flags import DirListFlags, StatInfoFlags # pylint: disable=import-outside-toplevel
+        self.client = client.FileSystem(redirector)
+        self.stat_flag = DirListFlags.STAT
+        self.dir_flag = StatInfoFlags.IS_DIR
+
+    def listdir(self, path):
+        """Return list of Entry for the contents of path"""
+        status, listing = self.client.dirlist(path, self.stat_flag)
+        if not status.ok:
+            raise OSError(f"Cannot list {path}: {status.message}")
+        return [Entry(e.name, bool(e.statinfo.flags & self.dir_flag), e.statinfo.size)
+                for e in listing]
+
+
+class LocalFileSystem:
+    """List directories on a local (POSIX) filesystem"""
+
+    def listdir(self, path):
+        """Return list of Entry for the contents of path"""
+        with os.scandir(path) as entries:
+            return sorted((Entry(e.name, e.is_dir(), e.stat().st_size) for e in entries),
+                          key=lambda e: e.name)
+
+
+def make_filesystem(directory):
+    """Return filesystem and path of ntuple root directory, e.g. //store/... for XRootD"""
+    if directory.startswith("root://"):
+        redirector = directory.split("//store")[0]
+        return XRootDFileSystem(redirector), directory.split(redirector)[1]
+    return LocalFileSystem(), directory
+
+
+def join(*paths):
+    """Join path components, keeping leading double slashes as in XRootD paths"""
+    return "/".join([paths[0].rstrip("/")] + [p.strip("/") for p in paths[1:]])
+
+
+def list_sample(fs, ntuple_path, sample_path):
+    """Return (sample_path, entries), with entries None if listing failed"""
+    try:
+        return sample_path, fs.listdir(join(ntuple_path, sample_path))
+    except OSError as e:
+        print(f"{e}. Skipping.")
+        return sample_path, None
+
+
+def descend(ntuple_path, sample_path, dir_contents, choose_first_dir=False):
+    """Return path of the directory in sample_path that holds the ntuples, or None to skip"""
+    path = join(ntuple_path, sample_path)
+    num_found = len(dir_contents)
 
     if [r for r in dir_contents if r.name.endswith("root")]:
         print("Root files found at this layer. Assuming that these are the ntuples")
@@ -104,61 +169,80 @@ def descend(ntuple_path, sample_path, choose_first_dir=False):
     if dir_ix == "S":
         return None
 
-    return sample_path + "/" + dir_contents.dirlist[int(dir_ix)].name
+    return sample_path + "/" + dir_contents[int(dir_ix)].name
 
 
-# Set up xrd client
-redirector = args.directory.split("//store")[0]
-xrd_client = client.FileSystem(redirector)
+def list_files(fs, ntuple_path, sample_path):
+    """Return (sample_path, {root file: size in bytes}) of the ntuples in sample_path
 
-coffea_casa_dir = args.directory.replace("cmseos.fnal.gov", "xcache")
-output = {
-    args.name: {
-        "path": coffea_casa_dir,
-        "samples": {},
-    }
-}
-ntuple_path = args.directory.split(redirector)[1]
-samples = xrd_client.dirlist(ntuple_path)[1]
-
-# Traverse ntuple directory and construct output dictionary
-# Assumes same structure as root://cmseos.fnal.gov//store/group/lpcmetx/SIDM/ffNtupleV4/2018/
-for sample in samples:
-    simple_name = parse_name(sample.name)
-    print(f"{sample.name} --> {simple_name}")
-    if simple_name is None:
-        continue
-    output[args.name]["samples"][simple_name] = {}
-    sample_path = sample.name
-
-    # Descend one layer, expecting to find a single directory
-    try:
-        for _ in range(1):
-            sample_path = descend(ntuple_path, sample_path, args.first_dir)
-            if sample_path is None:
-                raise StopIteration()
-    except StopIteration:
-        continue
-
-    # If traversal was successful, add path and files to output dictionary
+    Returns None as file sizes if listing failed.
+    """
     try:
-        files = [f.name for f in xrd_client.dirlist(ntuple_path + sample_path)[1]]
+        entries = fs.listdir(join(ntuple_path, sample_path))
         # Handle cases with additional directory layer
-        if len(files) == 1 and "0000" in files:
+        if len(entries) == 1 and entries[0].name == "0000":
             sample_path += "/0000"
-            files = [f.name for f in xrd_client.dirlist(ntuple_path + sample_path)[1]]
-    except TypeError:
+            entries = fs.listdir(join(ntuple_path, sample_path))
+    except OSError:
         print("Unexpected directory structure. Skipping {}".format(sample_path))
+        return sample_path, None
     # remove non-root files
-    files = [f for f in files if f.endswith("root")]
-    output[args.name]["samples"][simple_name]["path"] = sample_path + "/"
-    output[args.name]["samples"][simple_name]["files"] = files
+    return sample_path, {e.name: e.size for e in entries if e.name.endswith("root")}
+
 
-# Avoid yaml references, a la stackoverflow.com/questions/13518819
-yaml.Dumper.ignore_aliases = lambda *args: True
+def crawl(fs, ntuple_path, choose_first_dir=False, workers=16):
+    """Return {simplified sample name: {"path", "files", "file_sizes"}} for all samples
+
+    Listings are issued concurrently; choosing among unexpected directories happens in between,
+    since it may ask the user.
+    """
+    samples = {}
+    for sample in fs.listdir(ntuple_path):
+        simple_name = parse_name(sample.name)
+        print(f"{sample.name} --> {simple_name}")
+        if simple_name is not None:
+            samples[simple_name] = sample.name
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        # Descend one layer, expecting to find a single directory
+        listings = pool.map(lambda path: list_sample(fs, ntuple_path, path), samples.values())
+        sample_paths = {}
+        for simple_name, (sample_path, dir_contents) in zip(samples, listings):
+            if dir_contents is None:
+                continue
+            sample_path = descend(ntuple_path, sample_path, dir_contents, choose_first_dir)
+            if sample_path is not None:
+                sample_paths[simple_name] = sample_path
+
+        # If traversal was successful, add path and files to output dictionary
+        listings = pool.map(lambda path: list_files(fs, ntuple_path, path), sample_paths.values())
+        output = {}
+        for simple_name, (sample_path, file_sizes) in zip(sample_paths, listings):
+            if file_sizes is None:
+                continue
+            output[simple_name] = {
+                "path": sample_path + "/",
+                "files": sorted(file_sizes),
+                "file_sizes": file_sizes,
+            }
+    return output
+
+
+if __name__ == "__main__":
+    # Traverse ntuple directory and construct output dictionary
+    # Assumes same structure as root://cmseos.fnal.gov//store/group/lpcmetx/SIDM/ffNtupleV4/2018/
+    filesystem, root_path = make_filesystem(args.directory)
+    output = {
+        args.name: {
+            "path": args.directory.replace("cmseos.fnal.gov", "xcache"),
+            "samples": crawl(filesystem, root_path, args.first_dir, args.workers),
+        }
+    }
 
-with open(args.cfg, 'a') as out_file:
-    out_file.write("\n\n# " + args.comment + "\n")
-    yaml.dump(output, out_file, default_flow_style=False)
-    out_file.write("\n")
+    # Avoid yaml references, a la stackoverflow.com/questions/13518819
+    yaml.Dumper.ignore_aliases = lambda *args: True
 
+    with open(args.cfg, 'a') as out_file:
+        out_file.write("\n\n# " + args.comment + "\n")
+        yaml.dump(output, out_file, default_flow_style=False)
+        out_file.write("\n")
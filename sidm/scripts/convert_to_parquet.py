@@ -0,0 +1,51 @@
+"""Convert ntuples to a Parquet store with sidm.tools.parquet_store.
+
+Each ROOT file is written to OUTPUT_DIR/<sample>/<file name>.parquet. If channels are given, only
+the branches of the collections that SidmProcessor reads for those channels and hist collections
+are kept; otherwise every branch is kept. Files that were already converted with the same settings
+are skipped, so an interrupted conversion can be resumed by running the same command again.
+
+Usage: python convert_to_parquet.py -s SAMPLE [SAMPLE ...] -v NTUPLE_VERSION -o OUTPUT_DIR
+           [-l signal_v8.yaml] [-c 4mu 2mu2e] [-H base] [-m MAX_FILES] [-w 4]
+"""
+
+import argparse
+from sidm.tools import utilities
+from sidm.tools.parquet_store import ParquetConverter, processor_branches
+from sidm.tools.sidm_processor import SidmProcessor
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-s", "--samples", nargs="+", required=True,
+                    help="Names of samples, e.g. '4Mu_500GeV_5p0GeV_0p08mm'")
+parser.add_argument("-v", "--ntuple-version", dest="ntuple_version", required=True,
+                    help="Name of group of ntuples, e.g. 'llpNanoAOD_v2'")
+parser.add_argument("-l", "--location-cfg", dest="location_cfg", default="signal_v8.yaml",
+                    help="Ntuple location config in sidm/configs/ntuples/")
+parser.add_argument("-o", "--output-dir", dest="output_dir", required=True,
+                    help="Directory in which to write the Parquet store")
+parser.add_argument("-c", "--channels", nargs="+", default=None,
+                    help="Only keep branches read for these channels (default: keep all branches)")
+parser.add_argument("-H", "--hist-collections", dest="hist_collections", nargs="+",
+                    default=["base"], help="Hist collections used to choose branches")
+parser.add_argument("-m", "--max-files", dest="max_files", type=int, default=-1,
+                    help="Maximum number of files per sample")
+parser.add_argument("-r", "--row-group-entries", dest="row_group_entries", type=int,
+                    default=100000, help="Number of events per Parquet row group")
+parser.add_argument("-w", "--workers", type=int, default=4,
+                    help="Number of files to convert in parallel")
+args = parser.parse_args()
+
+fileset = utilities.make_fileset(args.samples, args.ntuple_version, args.max_files,
+                                 location_cfg=args.location_cfg)
+branches = None
+if args.channels is not None:
+    first_file = next(f for files in fileset.values() for f in files)
+    branches = processor_branches(SidmProcessor(args.channels, args.hist_collections), first_file)
+    print(f"Keeping {len(branches)} branches: {branches}")
+
+converter = ParquetConverter(fileset, args.output_dir, branches,
+                             row_group_entries=args.row_group_entries)
+result = converter.run(args.workers)
+print(f"Converted {result['converted']} files, skipped {result['skipped']} converted files, "
+      f"failed to convert {result['failed']}")
@@ -0,0 +1,32 @@
+"""Draw sets of plots from saved processor output with sidm.tools.batch_plot.
+
+Plots are saved under OUTPUT_DIR/<dataset>/<lj_reco>/<channel>/ and only redrawn when their
+hists or options change. Plot sets are defined in sidm/configs/plot_specs.yaml.
+
+Usage: python make_plots.py -i processor.coffea -s lj_review [genA_lj_eff ...] -o OUTPUT_DIR
+           [-f png pdf] [-j 8]
+"""
+
+import argparse
+from coffea import util as coffea_util
+from sidm.tools.batch_plot import BatchPlotter
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-i", "--input", required=True,
+                    help="Processor output saved with coffea.util.save, e.g. 'processor.coffea'")
+parser.add_argument("-s", "--plot-sets", dest="plot_sets", nargs="+", required=True,
+                    help="Names of plot sets in sidm/configs/plot_specs.yaml, e.g. 'lj_review'")
+parser.add_argument("-o", "--output-dir", dest="output_dir", required=True,
+                    help="Directory in which to save plots")
+parser.add_argument("-f", "--formats", nargs="+", default=["png"],
+                    help="File formats to save, e.g. 'png pdf'")
+parser.add_argument("-j", "--workers", type=int, default=1,
+                    help="Number of processes to draw plots in")
+args = parser.parse_args()
+
+out = coffea_util.load(args.input)
+for plot_set in args.plot_sets:
+    result = BatchPlotter(out, plot_set, args.output_dir, args.formats).run(args.workers)
+    print(f"{plot_set}: drew {result['rendered']} plots, skipped {result['skipped']} unchanged "
+          f"plots, failed to draw {result['failed']}")
@@ -0,0 +1,152 @@
+"""Module to fill ABCD regions in a single processor pass and check the closure of the estimate
+
+An ABCD plane is defined by two discriminating variables, each given as the name of a 1D
+histogram in sidm.definitions.hists that has one entry per event (e.g. "lj_lj_absdphi" and
+"lj_lj_invmass"), and a boundary on each. The side of each boundary that is enriched in signal
+defines the regions:
+
+        y signal-like | C | A |
+        y bkg-like    | D | B |
+                        x bkg-like, x signal-like
+
+so that A is the signal region and, for uncorrelated variables, the background in A is predicted
+to be N_B*N_C/N_D. Passing an ABCD to SidmProcessor adds a "region" category axis to every hist
+and fills the x-y plane per region and channel, so all four regions come out of one run.
+
+Usage:
+    abcd = ABCD("lj_lj_absdphi", "lj_lj_invmass", x_boundary=2.0, y_boundary=300)
+    p = SidmProcessor(["2mu2e"], ["base"], abcd=abcd)
+    ...
+    print_closure(out["hists"]["abcd_plane"], ["2mu2e"])
+"""
+
+# python
+import copy
+# columnar analysis
+import numpy as np
+import awkward as ak
+from tabulate import tabulate
+# local
+from sidm.tools.histogram import Histogram, Axis, select_for_yields
+from sidm.definitions.hists import hist_defs
+
+
+class ABCD:
+    """Class to assign events to ABCD regions from two per-event variables"""
+
+    regions = ["A", "B", "C", "D"]
+    hist_name = "abcd_plane"
+
+    def __init__(self, x, y, x_boundary, y_boundary, x_signal_above=True, y_signal_above=True):
+        for var in (x, y):
+            if var not in hist_defs:
+                raise ValueError(f"Unknown ABCD variable {var}. Options are the names of 1D "
+                                 "hists in sidm.definitions.hists")
+            if len(hist_defs[var].axes) != 1:
+                raise ValueError(f"ABCD variable {var} must be a 1D hist")
+        if x == y:
+            raise ValueError("ABCD variables must be different")
+        self.x = x
+        self.y = y
+        self.x_boundary = x_boundary
+        self.y_boundary = y_boundary
+        self.x_signal_above = x_signal_above
+        self.y_signal_above = y_signal_above
+
+    def funcs(self):
+        """Return the event masks and fill functions used to evaluate both variables"""
+        return [f for var in (self.x, self.y)
+                for f in (hist_defs[var].evt_mask, hist_defs[var].axes[0].fill_func)]
+
+    @staticmethod
+    def values(var, objs):
+        """Return numpy array of var for every event, with nan where var is undefined"""
+        h = hist_defs[var]
+        mask = h.evt_mask(objs)
+        vals = h.axes[0].fill_func(objs, mask)
+        if vals.ndim != 1:
+            raise ValueError(f"ABCD variable {var} does not have one value per event")
+        vals = ak.to_numpy(ak.fill_none(vals, np.nan)).astype(float)
+        if isinstance(mask, slice):
+            return vals
+        mask = ak.to_numpy(mask)
+        full = np.full(len(mask), np.nan)
+        full[mask] = vals
+        return full
+
+    def evaluate(self, objs):
+        """Return {"x": x values, "y": y values, "region": region index} for every event
+
+        The region index points into ABCD.regions and is len(ABCD.regions) for events where either
+        variable is undefined, so that they fall into no region.
+        """
+        x = self.values(self.x, objs)
+        y = self.values(self.y, objs)
+        with np.errstate(invalid="ignore"):
+            x_signal = x >= self.x_boundary if self.x_signal_above else x < self.x_boundary
+            y_signal = y >= self.y_boundary if self.y_signal_above else y < self.y_boundary
+        region = np.full(len(x), len(self.regions))
+        defined = ~(np.isnan(x) | np.isnan(y))
+        region[defined & x_signal & y_signal] = 0
+        region[defined & x_signal & ~y_signal] = 1
+        region[defined & ~x_signal & y_signal] = 2
+        region[defined & ~x_signal & ~y_signal] = 3
+        return {"x": x, "y": y, "region": region}
+
+    def plane_hist(self):
+        """Return Histogram of y vs x, one entry per event"""
+        x_axis = copy.deepcopy(hist_defs[self.x].axes[0].axis)
+        y_axis = copy.deepcopy(hist_defs[self.y].axes[0].axis)
+        return Histogram([
+            Axis(x_axis, lambda objs, mask: objs["abcd"]["x"]),
+            Axis(y_axis, lambda objs, mask: objs["abcd"]["y"]),
+        ])
+
+
+def region_yields(h, variation="nominal", **selection):
+    """Return {region: (sum of weights, variance)} of a hist with a region axis
+
+    All other axes are summed over, including flow bins, after applying selection and choosing
+    variation if h has a variation axis, e.g. region_yields(h, channel="4mu"). If h has an lj_reco
+    axis, one lj_reco must be selected.
+    """
+    h = select_for_yields(h, variation, **selection)
+    yields = {}
+    for region in h.axes["region"]:
+        total = h[{"region": region}].sum(flow=True)
+        value = getattr(total, "value", total)
+        variance = getattr(total, "variance", total)
+        yields[region] = (float(value), float(variance))
+    return yields
+
+
+def closure(yields):
+    """Return observed and predicted yield in A and their ratio, each as (value, uncertainty)
+
+    The prediction is N_B*N_C/N_D, with uncorrelated statistical uncertainties propagated.
+    """
+    (n_a, var_a), (n_b, var_b), (n_c, var_c), (n_d, var_d) = (
+        np.array(yields[r], dtype=float) for r in ABCD.regions)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        predicted = n_b*n_c/n_d
+        rel_var_predicted = var_b/n_b**2 + var_c/n_c**2 + var_d/n_d**2
+        ratio = n_a/predicted
+        rel_var_ratio = var_a/n_a**2 + rel_var_predicted
+    return {
+        "observed": (float(n_a), float(np.sqrt(var_a))),
+        "predicted": (float(predicted), float(abs(predicted)*np.sqrt(rel_var_predicted))),
+        "observed/predicted": (float(ratio), float(abs(ratio)*np.sqrt(rel_var_ratio))),
+    }
+
+
+def print_closure(h, channels, variation="nominal", **selection):
+    """Print yields per region, predicted and observed A, and their ratio for each channel"""
+    rows = []
+    for channel in channels:
+        yields = region_yields(h, variation, channel=channel, **selection)
+        result = closure(yields)
+        rows.append([channel] + [yields[r][0] for r in ABCD.regions]
+                    + [f"{val:.3g} ± {err:.2g}" for val, err in result.values()])
+    headers = ["channel"] + [f"N_{r}" for r in ABCD.regions] + ["observed A", "predicted A",
+                                                                 "observed/predicted"]
+    print(tabulate(rows, headers, floatfmt=".3g"))
@@ -0,0 +1,250 @@
+"""Module to draw many plots from processor output in parallel, skipping unchanged plots
+
+A plot set from sidm/configs/plot_specs.yaml maps plot names to the hists to draw and how to
+overlay them. BatchPlotter expands it into one job per dataset, lj_reco, and channel (minus the
+overlaid dimension), renders the jobs in a pool of worker processes that each set the plot style
+once and reuse one figure, and saves every plot as e.g. PNG and PDF under
+output_dir/<dataset>/<lj_reco>/<channel>/<plot name>.<format>.
+
+Every job is identified by a content hash of the hists it draws (axes and bin contents) and its
+options. The hashes of rendered plots are kept in a manifest in output_dir, and plots whose hash
+and output files are unchanged since the last run are skipped, so rerunning after adding a
+dataset or changing one hist only redraws what changed.
+
+Usage:
+    plotter = BatchPlotter(out, "lj_review", "plots", formats=["png", "pdf"])
+    plotter.run(workers=8)
+"""
+
+# python
+import concurrent.futures
+import hashlib
+import json
+import os
+# columnar analysis
+import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+# local
+from sidm import BASE_DIR
+from sidm.tools import plotting, utilities
+from sidm.tools.histogram import efficiency
+
+
+# dimensions that are plotted separately or overlaid, in the order used for output directories
+dimensions = ["dataset", "lj_reco", "channel"]
+
+manifest_name = "plot_manifest.json"
+figure_name = "sidm batch plot"
+
+
+class PlotJob:
+    """Class to represent one plot: the hists to draw, their legend labels, and options"""
+
+    def __init__(self, path, hists, labels, options):
+        self.path = path # output path without extension
+        self.hists = hists
+        self.labels = labels
+        self.options = options
+
+    def digest(self, render_options):
+        """Return content hash of everything that determines the rendered files"""
+        sha = hashlib.sha256()
+        sha.update(json.dumps([self.labels, self.options, render_options], sort_keys=True,
+                              default=str).encode())
+        for h in self.hists:
+            sha.update(repr(h.axes).encode())
+            sha.update(str(h.storage_type).encode())
+            sha.update(np.ascontiguousarray(h.view(flow=True)).tobytes())
+        return sha.hexdigest()
+
+
+class BatchPlotter:
+    """Class to expand a plot set into PlotJobs and render them"""
+
+    def __init__(self, out, plot_set, output_dir, formats=None, plot_cfg="configs/plot_specs.yaml",
+                 style="cms", dpi=100):
+        self.out = out # {dataset: processor output}
+        if isinstance(plot_set, str):
+            plot_set = utilities.load_yaml(f"{BASE_DIR}/{plot_cfg}")[plot_set]
+        self.plot_set = plot_set
+        self.output_dir = output_dir
+        self.formats = formats or ["png"]
+        self.style = style
+        self.dpi = dpi
+
+    def jobs(self):
+        """Return list of PlotJobs for every plot in the plot set"""
+        jobs = []
+        for plot_name, options in self.plot_set.items():
+            options = dict(options or {})
+            overlay = options.pop("overlay", "hists")
+            if overlay != "hists" and overlay not in dimensions:
+                print(f"Warning: unknown overlay {overlay} for {plot_name}. Options are "
+                      f"{['hists'] + dimensions}. Skipping.")
+                continue
+            hist_names = options.pop("hists", [plot_name])
+            legend = options.pop("legend", None)
+
+            # group the entries of every hist by the dimensions that aren't overlaid
+            groups = {}
+            for coords, h in self.entries(plot_name, hist_names, options):
+                key = tuple(coords[d] for d in dimensions if d != overlay)
+                label = coords["hist"] if overlay == "hists" else coords[overlay]
+                groups.setdefault(key, ([], []))
+                groups[key][0].append(h)
+                groups[key][1].append(str(label))
+
+            for key, (hists, labels) in groups.items():
+                dims = [plotted_dim(h, options) for h in hists]
+                if len(set(dims)) != 1 or (len(hists) > 1 and dims[0] != 1):
+                    print(f"Warning: cannot overlay {labels} for {plot_name}. Skipping.")
+                    continue
+                path = os.path.join(self.output_dir, *[str(k) for k in key if k is not None],
+                                    plot_name)
+                jobs.append(PlotJob(path, hists, legend or labels, options))
+        return jobs
+
+    def entries(self, plot_name, hist_names, options):
+        """Yield ({"hist", "dataset", "lj_reco", "channel"}, sliced hist.Hist) for every plot"""
+        selection = {"variation": "nominal", "region": sum}
+        if not options.get("efficiency", False):
+            selection["pass"] = sum
+        selection.update(options.get("select", {}))
+        datasets = options.get("datasets", list(self.out))
+        for dataset in datasets:
+            for hist_name in hist_names:
+                try:
+                    h = self.out[dataset]["hists"][hist_name]
+                except KeyError:
+                    print(f"Warning: {hist_name} not found in {dataset} for {plot_name}. Skipping.")
+                    continue
+                h = h[{a: v for a, v in selection.items() if a in h.axes.name}]
+                lj_recos = list(h.axes["lj_reco"]) if "lj_reco" in h.axes.name else [None]
+                channels = list(h.axes["channel"]) if "channel" in h.axes.name else [None]
+                channels = [c for c in channels if c in options.get("channels", channels)]
+                for lj_reco in lj_recos:
+                    for channel in channels:
+                        coords = {"hist": hist_name, "dataset": dataset, "lj_reco": lj_reco,
+                                  "channel": channel}
+                        index = {a: coords[a] for a in ("lj_reco", "channel")
+                                 if coords[a] is not None}
+                        yield coords, h[index]
+
+    def run(self, workers=1):
+        """Render every job whose content changed since the last run
+
+        Returns {"rendered", "skipped", "failed"} counts.
+        """
+        manifest_path = os.path.join(self.output_dir, manifest_name)
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf8") as manifest_file:
+                manifest = json.load(manifest_file)
+
+        # only render plots whose content changed or whose files are missing
+        todo = []
+        skipped = 0
+        for job in self.jobs():
+            digest = job.digest([self.formats, self.style, self.dpi])
+            files_exist = all(os.path.exists(f"{job.path}.{fmt}") for fmt in self.formats)
+            if manifest.get(self.manifest_key(job)) == digest and files_exist:
+                skipped += 1
+            else:
+                todo.append((job, digest))
+
+        results = self.render_all([job for job, _ in todo], workers)
+
+        failed = 0
+        for (job, digest), error in zip(todo, results):
+            if error is None:
+                manifest[self.manifest_key(job)] = digest
+            else:
+                failed += 1
+                manifest.pop(self.manifest_key(job), None)
+                print(f"Warning: cannot draw {job.path}: {error}. Skipping.")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(manifest_path, "w", encoding="utf8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+        return {"rendered": len(todo) - failed, "skipped": skipped, "failed": failed}
+
+    def manifest_key(self, job):
+        """Return path of job relative to output_dir, so that output_dir can be moved"""
+        return os.path.relpath(job.path, self.output_dir)
+
+    def render_all(self, jobs, workers):
+        """Return None or an error message for each job, rendering in workers processes"""
+        if not jobs:
+            return []
+        args = [(job, self.formats) for job in jobs]
+        if workers == 1:
+            # keep the caller's (e.g. a notebook's) style and figures untouched
+            with matplotlib.rc_context():
+                init_worker(self.style, self.dpi, switch_backend=False)
+                results = [render(a) for a in args]
+            plt.close(figure_name)
+            return results
+        chunksize = max(1, len(jobs)//(4*workers))
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=init_worker,
+                                                    initargs=(self.style, self.dpi)) as pool:
+            return list(pool.map(render, args, chunksize=chunksize))
+
+
+def plotted_dim(h, options):
+    """Return number of axes drawn for h; efficiency hists are drawn without their pass axis"""
+    return len(h.axes) - (options.get("efficiency", False) and "pass" in h.axes.name)
+
+
+def init_worker(style, dpi, switch_backend=True):
+    """Set the plot style once per worker process"""
+    if switch_backend:
+        matplotlib.use("Agg")
+    plotting.set_plot_style(style, dpi)
+
+
+def render(args):
+    """Draw one PlotJob on the reused figure and save it; return None or an error message"""
+    job, formats = args
+    options = job.options
+    try:
+        # reuse one figure per process rather than creating one per plot
+        fig = plt.figure(figure_name)
+        fig.clf()
+        ax = fig.add_subplot()
+
+        hists = job.hists
+        kwargs = {}
+        if options.get("efficiency", False):
+            effs = [efficiency(h) for h in hists]
+            hists = [eff for eff, _ in effs]
+            kwargs["yerr"] = [errors for _, errors in effs] if len(effs) > 1 else effs[0][1]
+            kwargs["flow"] = "none"
+        for opt in ("density", "flow"):
+            if opt in options:
+                kwargs[opt] = options[opt]
+
+        if len(hists[0].axes) == 1:
+            if len(hists) > 1:
+                kwargs["label"] = job.labels
+            plotting.plot(hists if len(hists) > 1 else hists[0], ax=ax, **kwargs)
+            if len(hists) > 1:
+                ax.legend()
+        else:
+            plotting.plot(hists[0], ax=ax, **kwargs)
+        if options.get("efficiency", False):
+            ax.set_ylabel("Efficiency")
+            ax.set_ylim(0, 1.2)
+        if options.get("logy", False):
+            ax.set_yscale("log")
+        if "xlabel" in options:
+            ax.set_xlabel(options["xlabel"])
+        if "ylabel" in options:
+            ax.set_ylabel(options["ylabel"])
+
+        os.makedirs(os.path.dirname(job.path) or ".", exist_ok=True)
+        for fmt in formats:
+            fig.savefig(f"{job.path}.{fmt}")
+    except (KeyError, ValueError, TypeError, NotImplementedError, OSError) as e:
+        return f"{type(e).__name__}: {e}"
+    return None
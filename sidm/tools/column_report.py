@@ -0,0 +1,182 @@
+"""Module to attribute branch reads to the definitions that cause them
+
+Coffea only reports the overall list of columns read by a processor. ColumnReport runs a
+SidmProcessor over (part of) one file and records, for each branch that is read, the object
+definition, cut, histogram, or counter that first touched it, along with the branch's compressed
+and uncompressed size in the file. This makes it possible to see which hists or cuts are
+responsible for expensive reads, e.g. to prune hist collections or decide what to skim.
+
+NanoEvents load columns lazily, so a branch is often read only after the function that requested
+it has returned (e.g. when Histogram.fill flattens the arrays returned by its fill functions).
+Labels are therefore "sticky": every read is attributed to the most recently started definition.
+"""
+
+# python
+import contextlib
+import functools
+# columnar analysis
+import uproot
+from coffea.nanoevents import NanoEventsFactory, NanoAODSchema
+from tabulate import tabulate
+# local
+from sidm import BASE_DIR
+from sidm.tools import histogram, utilities
+from sidm.definitions.cuts import obj_cut_defs, evt_cut_defs
+from sidm.definitions.hists import counter_defs
+from sidm.definitions.objects import postLj_objs
+
+
+class AccessTracker(list):
+    """NanoEvents access log that remembers which definition was active during each read"""
+
+    def __init__(self):
+        super().__init__()
+        self.label = "unattributed"
+        self.first_touch = {} # branch name: label of definition that first read it
+
+    def append(self, branch):
+        super().append(branch)
+        if branch not in self.first_touch:
+            self.first_touch[branch] = self.label
+
+    def labeled(self, label, func):
+        """Wrap func so that reads made during and after its execution are attributed to label"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.label = label
+            return func(*args, **kwargs)
+        return wrapper
+
+
+@contextlib.contextmanager
+def patched_items(mapping, wrap):
+    """Temporarily replace every value in mapping with wrap(key, value)"""
+    original = dict(mapping)
+    try:
+        for key, val in original.items():
+            mapping[key] = wrap(key, val)
+        yield
+    finally:
+        mapping.clear()
+        mapping.update(original)
+
+
+class ColumnReport:
+    """Class to report which definitions read which branches and how large those branches are
+
+    Usage:
+        report = ColumnReport(SidmProcessor(["2mu2e"], ["base"]))
+        report.run("ntuple.root", entry_stop=10000)
+        report.print_table(by="definition")
+    """
+
+    def __init__(self, processor_instance, hist_collections_cfg="configs/hist_collections.yaml"):
+        self.processor = processor_instance
+        self.hist_collections_cfg = hist_collections_cfg
+        self.first_touch = {}
+        self.branch_bytes = {} # branch name: (compressed bytes, uncompressed bytes)
+
+    @contextlib.contextmanager
+    def instrumented(self, tracker):
+        """Label all definitions used by the processor for the duration of the with block"""
+        p = self.processor
+        label = tracker.labeled
+        original_fill = histogram.Histogram.fill
+        original_obj_defs = p.obj_defs
+        original_build_lepton_jets = p.build_lepton_jets
+
+        def fill(hist_self, *args, **kwargs):
+            tracker.label = f"hist: {hist_self.name}"
+            return original_fill(hist_self, *args, **kwargs)
+
+        with contextlib.ExitStack() as stack:
+            for obj, cuts in obj_cut_defs.items():
+                stack.enter_context(patched_items(
+                    cuts, lambda cut, f, obj=obj: label(f"obj cut: {obj} {cut}", f)))
+            stack.enter_context(patched_items(evt_cut_defs,
+                                              lambda cut, f: label(f"evt cut: {cut}", f)))
+            stack.enter_context(patched_items(postLj_objs,
+                                              lambda obj, f: label(f"object: {obj}", f)))
+            stack.enter_context(patched_items(counter_defs,
+                                              lambda name, f: label(f"counter: {name}", f)))
+            p.obj_defs = {obj: label(f"object: {obj}", f) for obj, f in original_obj_defs.items()}
+            p.build_lepton_jets = label("lepton jets", original_build_lepton_jets)
+            histogram.Histogram.fill = fill
+            try:
+                yield
+            finally:
+                p.obj_defs = original_obj_defs
+                p.build_lepton_jets = original_build_lepton_jets
+                histogram.Histogram.fill = original_fill
+
+    def run(self, file, treepath="Events", entry_stop=None, schemaclass=NanoAODSchema):
+        """Process file and record which definition first read each branch"""
+        tracker = AccessTracker()
+        events = NanoEventsFactory.from_root(
+            file,
+            treepath=treepath,
+            entry_stop=entry_stop,
+            schemaclass=schemaclass,
+            metadata={"dataset": "column_report"},
+            access_log=tracker,
+        ).events()
+        with self.instrumented(tracker):
+            self.processor.process(events)
+        self.first_touch = tracker.first_touch
+
+        tree = uproot.open(file)[treepath]
+        self.branch_bytes = {b: (tree[b].compressed_bytes, tree[b].uncompressed_bytes)
+                             for b in self.first_touch if b in tree}
+        return self
+
+    def by_branch(self):
+        """Return rows of (branch, label, compressed bytes, uncompressed bytes)"""
+        return [(b, label, *self.branch_bytes.get(b, (0, 0)))
+                for b, label in self.first_touch.items()]
+
+    def by_definition(self):
+        """Return {label: (branches, compressed bytes, uncompressed bytes)}"""
+        summary = {}
+        for branch, label, compressed, uncompressed in self.by_branch():
+            branches, total_compressed, total_uncompressed = summary.get(label, ([], 0, 0))
+            summary[label] = (branches + [branch], total_compressed + compressed,
+                              total_uncompressed + uncompressed)
+        return summary
+
+    def by_hist_collection(self):
+        """Return {hist collection: (branches, compressed bytes, uncompressed bytes)}
+
+        Only branches first read by hists are included, so each collection is charged for the
+        branches that no cut, object, or hist outside that collection needed before it.
+        """
+        hist_menu = utilities.load_yaml(f"{BASE_DIR}/{self.hist_collections_cfg}")
+        per_hist = {label[len("hist: "):]: vals for label, vals in self.by_definition().items()
+                    if label.startswith("hist: ")}
+        summary = {}
+        for collection in self.processor.hist_collection_names:
+            branches = []
+            for hist_name in utilities.flatten(hist_menu[collection]):
+                branches += per_hist.get(hist_name, ([], 0, 0))[0]
+            summary[collection] = (
+                branches,
+                sum(self.branch_bytes.get(b, (0, 0))[0] for b in branches),
+                sum(self.branch_bytes.get(b, (0, 0))[1] for b in branches),
+            )
+        return summary
+
+    def print_table(self, by="definition", sort_by_size=True):
+        """Print report grouped by "branch", "definition", or "hist_collection" """
+        if by == "branch":
+            rows = self.by_branch()
+            headers = ["branch", "first read by", "compressed [kB]", "uncompressed [kB]"]
+            rows = [(b, label, c/1e3, u/1e3) for b, label, c, u in rows]
+        elif by in ("definition", "hist_collection"):
+            summary = self.by_definition() if by == "definition" else self.by_hist_collection()
+            headers = [by.replace("_", " "), "N branches", "compressed [kB]", "uncompressed [kB]"]
+            rows = [(label, len(b), c/1e3, u/1e3) for label, (b, c, u) in summary.items()]
+        else:
+            raise ValueError(f"Unknown grouping {by}. Options are branch, definition, "
+                             "hist_collection")
+        if sort_by_size:
+            rows = sorted(rows, key=lambda r: r[2], reverse=True)
+        print(tabulate(rows, headers, floatfmt=".1f"))
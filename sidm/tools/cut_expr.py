@@ -0,0 +1,286 @@
+"""Module to define cuts as parsed expressions instead of hand-written lambdas
+
+Any cut name that isn't defined in sidm.definitions.cuts is parsed as an expression, so new cuts
+can be declared directly in selections.yaml. Object cuts are written in terms of the fields of
+the collection they cut, optionally prefixed with the collection name:
+
+    electrons:
+      - "pt > 10 & abs(eta) < 2.4"
+    genAs_toE:
+      - "genAs_toE: 10 <= lxy < 100"
+
+Event cuts are written in terms of the collections in objs:
+
+    evt_cuts:
+      - "num(ljs) >= 2"
+      - "any(ljs.pt > 30) & genMus[0].pt >= 50"
+
+Expressions support numbers, field access, comparisons (including chains like 10 <= lxy < 100),
+arithmetic, & | ~ (read as and, or, not, so that comparisons bind tighter than them, unlike in
+plain python), integer indices that pick the n-th object of every event, and the functions listed
+in functions below. Derived quantities such as lxy are computed with the same helpers as in
+sidm.definitions.cuts.
+
+Expressions compile to trees of vectorized awkward operations. Every subexpression is keyed on its
+canonical form and the collections it reads, so when all cuts of a chunk are evaluated with a
+shared memo (as JaggedSelection and EvtCutCache do), a quantity like abs(eta) or lxy is computed
+once per collection no matter how many cuts use it.
+"""
+
+# python
+import ast
+import io
+import operator
+import tokenize
+# columnar analysis
+import numpy as np
+import awkward as ak
+# local
+from sidm.tools.utilities import lxy
+from sidm.definitions.cuts import obj_cut_defs, evt_cut_defs
+
+
+# functions that can be called in expressions; reductions act on the objects of each event
+functions = {
+    "abs": abs,
+    "sqrt": np.sqrt,
+    "num": lambda x: ak.num(x, axis=1),
+    "any": lambda x: ak.any(x, axis=1),
+    "all": lambda x: ak.all(x, axis=1),
+    "min": lambda x: ak.min(x, axis=1),
+    "max": lambda x: ak.max(x, axis=1),
+    "lxy": lxy,
+}
+
+# quantities computed from a collection rather than read from one of its fields
+derived_fields = {
+    "lxy": lxy,
+}
+
+binary_ops = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+}
+
+# & | ~ are given the precedence of and, or, not so that "pt > 10 & abs(eta) < 2.4" needs no
+# parentheses
+logical_tokens = {
+    "&": "and",
+    "|": "or",
+    "~": "not",
+}
+
+compare_ops = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+class Node:
+    """Class to represent one subexpression
+
+    key is a canonical, hashable form of the subexpression, so identical subexpressions of
+    different cuts share results. collections are the names of collections in objs that it reads,
+    which is empty for object cuts, whose only input is the collection being cut.
+    """
+
+    def __init__(self, key, func, children=(), collections=frozenset()):
+        self.key = key
+        self.func = func
+        self.children = children
+        self.collections = frozenset(collections).union(*[c.collections for c in children])
+
+    def evaluate(self, objs, collection, memo):
+        """Return value of subexpression, computing it only if it isn't in memo yet"""
+        inputs = tuple(objs[name] for name in sorted(self.collections))
+        if collection is not None:
+            inputs += (collection,)
+        # memo entries keep references to their inputs so that their ids can't be reused
+        memo_key = (self.key, tuple(id(i) for i in inputs))
+        if memo_key not in memo:
+            args = [c.evaluate(objs, collection, memo) for c in self.children]
+            memo[memo_key] = (inputs, self.func(objs, collection, *args))
+        return memo[memo_key][1]
+
+
+class CutExpression:
+    """Class to represent a cut compiled from an expression
+
+    Calling a CutExpression with objs (and optionally a memo dict shared between cuts) returns the
+    cut result, like the lambdas in sidm.definitions.cuts.
+    """
+
+    def __init__(self, text, obj=None):
+        self.text = text
+        self.obj = obj
+        expr = text
+        if ":" in text:
+            prefix, expr = text.split(":", 1)
+            prefix = prefix.strip()
+            if obj is None:
+                raise ValueError(f"Event cut {text} can't be prefixed with a collection")
+            if prefix != obj:
+                raise ValueError(f"Cut {text} is listed under {obj}, not {prefix}")
+        try:
+            tree = ast.parse(self.translate(expr.strip()), mode="eval")
+        except (SyntaxError, tokenize.TokenError) as e:
+            raise ValueError(f"Cannot parse cut expression {text}") from e
+        self.root = self.compile(tree.body)
+        self.collections = self.root.collections | ({obj} if obj is not None else set())
+
+    def __call__(self, objs, memo=None):
+        memo = {} if memo is None else memo
+        collection = objs[self.obj] if self.obj is not None else None
+        return self.root.evaluate(objs, collection, memo)
+
+    def __repr__(self):
+        return f"CutExpression({self.text!r})"
+
+    @staticmethod
+    def translate(expr):
+        """Return expr with & | ~ replaced by and, or, not"""
+        tokens = tokenize.generate_tokens(io.StringIO(expr).readline)
+        return " ".join(logical_tokens.get(tok.string, tok.string) if tok.type == tokenize.OP
+                        else tok.string for tok in tokens
+                        if tok.type not in (tokenize.NEWLINE, tokenize.ENDMARKER))
+
+    def compile(self, node):
+        """Return Node for an ast node, rejecting anything outside the supported syntax"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            value = node.value
+            return Node(("const", value), lambda objs, coll: value)
+
+        if isinstance(node, ast.Name):
+            return self.compile_name(node.id)
+
+        if isinstance(node, ast.Attribute):
+            value = self.compile(node.value)
+            attr = node.attr
+            if attr.startswith("_"):
+                raise ValueError(f"Private attribute {attr} in cut expression {self.text}")
+            if attr in derived_fields:
+                derived = derived_fields[attr]
+                return Node(("derived", attr, value.key), lambda objs, coll, x: derived(x),
+                            (value,))
+            return Node(("attr", attr, value.key), lambda objs, coll, x: getattr(x, attr),
+                        (value,))
+
+        if isinstance(node, ast.Subscript):
+            index = node.slice.value if isinstance(node.slice, ast.Index) else node.slice
+            if not (isinstance(index, ast.Constant) and isinstance(index.value, int)):
+                raise ValueError("Only integer indices are supported in cut expression "
+                                 f"{self.text}")
+            i = index.value
+            value = self.compile(node.value)
+            return Node(("index", i, value.key), lambda objs, coll, x: x[:, i], (value,))
+
+        if isinstance(node, ast.Call):
+            if (not isinstance(node.func, ast.Name) or node.func.id not in functions
+                    or node.keywords):
+                raise ValueError(f"Unsupported function call in cut expression {self.text}. "
+                                 f"Options are {list(functions)}")
+            func = functions[node.func.id]
+            args = tuple(self.compile(a) for a in node.args)
+            return Node(("call", node.func.id) + tuple(a.key for a in args),
+                        lambda objs, coll, *xs: func(*xs), args)
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self.compile(node.operand)
+            if isinstance(node.op, (ast.Invert, ast.Not)):
+                return Node(("not", operand.key), lambda objs, coll, x: ~x, (operand,))
+            if isinstance(node.op, ast.USub):
+                return Node(("neg", operand.key), lambda objs, coll, x: -x, (operand,))
+
+        if isinstance(node, ast.BinOp) and type(node.op) in binary_ops:
+            return self.combine(type(node.op).__name__, binary_ops[type(node.op)],
+                                [self.compile(node.left), self.compile(node.right)])
+
+        if isinstance(node, ast.BoolOp):
+            op = ast.BitAnd if isinstance(node.op, ast.And) else ast.BitOr
+            return self.combine(op.__name__, binary_ops[op], [self.compile(v) for v in node.values])
+
+        if isinstance(node, ast.Compare) and all(type(op) in compare_ops for op in node.ops):
+            # a chain like 10 <= lxy < 100 is the & of its pairwise comparisons
+            operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+            comparisons = []
+            for op, left, right in zip(node.ops, operands[:-1], operands[1:]):
+                func = compare_ops[type(op)]
+                comparisons.append(Node((type(op).__name__, left.key, right.key),
+                                        lambda objs, coll, x, y, func=func: func(x, y),
+                                        (left, right)))
+            if len(comparisons) == 1:
+                return comparisons[0]
+            return self.combine("BitAnd", operator.and_, comparisons)
+
+        raise ValueError(f"Unsupported syntax {ast.dump(node)} in cut expression {self.text}")
+
+    def compile_name(self, name):
+        """Return Node for a bare name: a field of the cut collection or a collection in objs"""
+        if name.startswith("_"):
+            raise ValueError(f"Private name {name} in cut expression {self.text}")
+        if self.obj is not None:
+            if name in derived_fields:
+                derived = derived_fields[name]
+                return Node(("derived", name), lambda objs, coll: derived(coll))
+            return Node(("field", name), lambda objs, coll: getattr(coll, name))
+        return Node(("collection", name), lambda objs, coll: objs[name], collections={name})
+
+    @staticmethod
+    def combine(name, func, operands):
+        """Return Node that applies func pairwise to operands
+
+        & and | are commutative, so their operands are put in a canonical order to let e.g.
+        "a & b" and "b & a" share results.
+        """
+        commutative = name in ("BitAnd", "BitOr", "Add", "Mult")
+        if commutative:
+            operands = sorted(operands, key=lambda n: repr(n.key))
+        result = operands[0]
+        for operand in operands[1:]:
+            result = Node((name, result.key, operand.key),
+                          lambda objs, coll, x, y: func(x, y), (result, operand))
+        return result
+
+
+compiled = {} # (obj, cut): CutExpression; obj is None for event cuts
+
+
+def obj_cut_def(obj, cut):
+    """Return the definition of an object cut, compiling cut as an expression if it isn't in
+    obj_cut_defs; raise KeyError if it is neither"""
+    if cut in obj_cut_defs.get(obj, {}):
+        return obj_cut_defs[obj][cut]
+    return compile_cut(cut, obj)
+
+
+def evt_cut_def(cut):
+    """Return the definition of an event cut, compiling cut as an expression if it isn't in
+    evt_cut_defs; raise KeyError if it is neither"""
+    if cut in evt_cut_defs:
+        return evt_cut_defs[cut]
+    return compile_cut(cut)
+
+
+def compile_cut(cut, obj=None):
+    """Return the cached CutExpression for cut"""
+    if (obj, cut) not in compiled:
+        try:
+            compiled[(obj, cut)] = CutExpression(cut, obj)
+        except ValueError as e:
+            raise KeyError(f"{cut} is neither a defined cut nor a valid cut expression: {e}") from e
+    return compiled[(obj, cut)]
+
+
+def evaluate(cut_def, objs, memo=None):
+    """Evaluate a cut definition, sharing subexpressions through memo if it is a CutExpression"""
+    if isinstance(cut_def, CutExpression):
+        return cut_def(objs, memo)
+    return cut_def(objs)
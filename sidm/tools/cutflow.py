@@ -17,11 +17,19 @@ class Cutflow(processor.AccumulatorABC):
     - f_ind: fraction of events that pass each cut individually
     - f_mar: fraction of events passing all preceding cuts that pass the current cut
     - f_all: fraction of events that pass the logical AND of the current and all preceding cuts
+
+    If individual is False, cuts were not evaluated on all events (see Selection's cascade mode),
+    so the individual values are not meaningful; they are set to nan and left out of tables.
+
+    Rows are kept for the nominal weights, for unit weights (unweighted), and optionally for each
+    weight variation given as variation_weights={variation: per-event weights}. Methods that
+    return or print rows accept variation=<name> to use the rows of that variation.
     """
 
-    def __init__(self, all_cuts, selection, weights):
+    def __init__(self, all_cuts, selection, weights, individual=True, variation_weights=None):
         """Make Cutflow, starting with 'No selection' row"""
         self.selection = selection # list of cut names to apply
+        self.individual = individual
         # make behavior-free array with weights set to zero for making additive identity Cutflows
         self.zero_weights = ak.without_parameters(ak.zeros_like(weights), behavior={})
 
@@ -37,28 +45,61 @@ class Cutflow(processor.AccumulatorABC):
         for cut in selection:
             self.unweighted_flow.append(CutflowElement(cut, all_cuts, self, one_weights))
 
+        # make cutflow rows for each weight variation
+        self.variation_flows = {}
+        for variation, variation_weight in (variation_weights or {}).items():
+            variation_weight = ak.without_parameters(variation_weight, behavior={})
+            self.variation_flows[variation] = [CutflowElement("No selection", all_cuts, self,
+                                                              variation_weight,
+                                                              is_first_element=True)]
+            for cut in selection:
+                self.variation_flows[variation].append(CutflowElement(cut, all_cuts, self,
+                                                                      variation_weight))
+
     def identity(self):
         """Create additive identity Cutflow to allow accumlator behavior"""
         all_cuts = PackedSelection()
         for cut in self.selection:
             all_cuts.add(cut, ak.values_astype(self.zero_weights, bool))
-        return Cutflow(all_cuts, self.selection, self.zero_weights)
+        return Cutflow(all_cuts, self.selection, self.zero_weights, self.individual,
+                       {v: self.zero_weights for v in self.variation_flows})
 
     def add(self, other):
         """Add two cutflows"""
         for i, _ in enumerate(self.flow):
             self.flow[i] = self.flow[i] + other.flow[i]
             self.unweighted_flow[i] = self.unweighted_flow[i] + other.unweighted_flow[i]
+            for variation, flow in self.variation_flows.items():
+                flow[i] = flow[i] + other.variation_flows[variation][i]
+
+    def scale(self, factor, unscaled_variations=()):
+        """Scale weighted rows by factor, e.g. to normalize to cross section times luminosity
+
+        Unweighted rows and the rows of unscaled_variations are left as they are.
+        """
+        for e in self.flow:
+            e.scale(factor)
+        for variation, flow in self.variation_flows.items():
+            if variation in unscaled_variations:
+                continue
+            for e in flow:
+                e.scale(factor)
+
+    def get_flow(self, unweighted=False, variation=None):
+        """Return the rows for nominal weights, unit weights, or a weight variation"""
+        if variation is not None:
+            return self.variation_flows[variation]
+        return self.unweighted_flow if unweighted else self.flow
 
     def efficiency(self):
         """Outputs the fraction of events passing the cutflow as a fraction of 1"""
         return float(list(enumerate(self.flow))[-1][1].n_all / list(enumerate(self.flow))[-1][1].n_evts)
 
-    def cut_breakdown(self, fraction=False, unweighted=False, give_cuts=False):
+    def cut_breakdown(self, fraction=False, unweighted=False, give_cuts=False, variation=None):
         """Outputs a list of the number of events passing each cut. Effectively isolates the
         cumulative column of the cut table. The give_cuts argument decides whether the function
         returns the column of cut names, useful for plotting / making a table"""
-        flow = self.unweighted_flow if unweighted else self.flow
+        flow = self.get_flow(unweighted, variation)
         data = []
         if give_cuts:
             data = [e.cut for e in flow]
@@ -69,9 +110,9 @@ class Cutflow(processor.AccumulatorABC):
                 data = [100.0 * x / list(enumerate(flow))[-1][1].n_evts for x in data]
         return data
 
-    def print_table(self, fraction=False, unweighted=False):
+    def print_table(self, fraction=False, unweighted=False, variation=None):
         """Print simple cutflow table to stdout"""
-        flow = self.unweighted_flow if unweighted else self.flow
+        flow = self.get_flow(unweighted, variation)
         if fraction:
             data = []
             for i, e in enumerate(flow):
@@ -91,15 +132,19 @@ class Cutflow(processor.AccumulatorABC):
                 "individual cut N",
                 "all cut N",
             ]
+        if not self.individual:
+            data = [row[:1] + row[2:] for row in data]
+            headers = headers[:1] + headers[2:]
         print(tabulate(data, headers, floatfmt=".1f"))
 
-    def print_multi_table(self, cutflows, headers, fraction=False, unweighted=False, title=""):
+    def print_multi_table(self, cutflows, headers, fraction=False, unweighted=False, title="",
+                          variation=None):
         """Prints a table with multiple cutflows listed, one in each column. Total number of cuts on each sample are listed.
-        It would be better to make this its own function independent of the cutflow class. That would allow a complete list of cutflows to be passed
-        rather than just removing one and calling the function from it."""
-        data = np.array([self.cut_breakdown(fraction, unweighted, give_cuts=True), self.cut_breakdown(fraction, unweighted)])
+        To tabulate or export the cutflows of a whole processor output instead, see
+        sidm.tools.cutflow_report.CutflowReport."""
+        data = np.array([self.cut_breakdown(fraction, unweighted, give_cuts=True), self.cut_breakdown(fraction, unweighted, variation=variation)])
         for cutflow in cutflows:
-            data = np.append(data, [cutflow.cut_breakdown(fraction, unweighted)], axis=0)
+            data = np.append(data, [cutflow.cut_breakdown(fraction, unweighted, variation=variation)], axis=0)
         data = data.transpose()
         headerline = ["cut name"]
         for header in headers:
@@ -115,9 +160,9 @@ class Cutflow(processor.AccumulatorABC):
                 print("----", end='')
         print('\n' + tabulate(data, headerline, floatfmt=".2f") + '\n')
 
-    def n_input_evts(self, unweighted=False):
+    def n_input_evts(self, unweighted=False, variation=None):
         """Return number of events in sample before applying any cuts"""
-        flow = self.unweighted_flow if unweighted else self.flow
+        flow = self.get_flow(unweighted, variation)
         return flow[0].n_evts
 
 class CutflowElement(processor.AccumulatorABC):
@@ -138,7 +183,10 @@ class CutflowElement(processor.AccumulatorABC):
             self.n_all = self.n_evts
         else:
             cumulative_cuts = self.cutflow.selection[:self.cutflow.selection.index(cut) + 1]
-            self.n_ind = ak.sum(weights[all_cuts.all(cut)])
+            if self.cutflow.individual:
+                self.n_ind = ak.sum(weights[all_cuts.all(cut)])
+            else:
+                self.n_ind = np.nan
             self.n_all = ak.sum(weights[all_cuts.all(*cumulative_cuts)])
 
     def identity(self):
@@ -152,6 +200,12 @@ class CutflowElement(processor.AccumulatorABC):
         self.n_ind = self.n_ind + other.n_ind
         self.n_all = self.n_all + other.n_all
 
+    def scale(self, factor):
+        """Scale number of events by factor"""
+        self.n_evts = self.n_evts*factor
+        self.n_ind = self.n_ind*factor
+        self.n_all = self.n_all*factor
+
     def calculate_fractions(self, previous_element):
         """Calculate individual, cumulative, and marginal fractional cutflow values"""
         # only calculate if fractions have not already been calculated
@@ -0,0 +1,220 @@
+"""Module to tabulate and export the cutflows of many datasets and channels at once
+
+CutflowReport takes the cutflows of a whole processor output, {dataset: {channel: Cutflow}}, and
+collects every row into arrays of shape (datasets, channels, cuts) for each weighting ("weighted",
+"unweighted", and any weight variations shared by all cutflows) and each quantity:
+- n_ind, n_all: events passing each cut individually and all cuts up to and including it
+- f_ind, f_mar, f_all: the same as fractions of all events and, for f_mar, of the events passing
+  the preceding cuts (see Cutflow)
+
+Channels can have different numbers of cuts; rows past the last cut of a channel are nan. All
+fractions are computed in one vectorized step, so reports over a full signal grid and background
+set are immediate, and the report can be exported to CSV (one row per dataset, channel, weighting,
+and cut), JSON, or Markdown tables with one column per dataset.
+
+Usage:
+    report = CutflowReport.from_output(out)
+    report.print_table("4mu", "f_all")
+    report.to_csv("cutflows.csv")
+"""
+
+# python
+import csv
+import json
+# columnar analysis
+import numpy as np
+from tabulate import tabulate
+
+
+quantities = ["n_ind", "n_all", "f_ind", "f_mar", "f_all"]
+fractions = ["f_ind", "f_mar", "f_all"]
+
+
+class CutflowReport:
+    """Class to hold cutflow values of many datasets and channels as (dataset, channel, cut) arrays"""
+
+    def __init__(self, cutflows):
+        """Collect the rows of {dataset: {channel: Cutflow}}
+
+        Nested channels, e.g. {lj_reco: {channel: Cutflow}} from runs with several lj_reco
+        choices, are flattened into channel names like "0.4/4mu".
+        """
+        cutflows = {dataset: flatten_cutflows(channels) for dataset, channels in cutflows.items()}
+        self.datasets = list(cutflows)
+        self.channels = []
+        for channels in cutflows.values():
+            self.channels += [c for c in channels if c not in self.channels]
+
+        # cut names per channel, which must agree between datasets
+        self.cuts = {}
+        for dataset, channels in cutflows.items():
+            for channel, cutflow in channels.items():
+                cuts = [e.cut for e in cutflow.flow]
+                if self.cuts.setdefault(channel, cuts) != cuts:
+                    raise ValueError(f"Channel {channel} of {dataset} has cuts {cuts}, but other "
+                                     f"datasets have {self.cuts[channel]}")
+
+        # weight variations are only reported if every cutflow has them
+        variations = None
+        for channels in cutflows.values():
+            for cutflow in channels.values():
+                names = list(cutflow.variation_flows)
+                variations = names if variations is None else [v for v in variations
+                                                               if v in names]
+        self.weightings = ["weighted", "unweighted"] + (variations or [])
+
+        # fill (weighting, quantity, dataset, channel, cut) arrays; missing entries stay nan
+        shape = (len(self.datasets), len(self.channels),
+                 max((len(c) for c in self.cuts.values()), default=0))
+        self.values = {w: {q: np.full(shape, np.nan) for q in ("n_evts", "n_ind", "n_all")}
+                       for w in self.weightings}
+        for i, dataset in enumerate(self.datasets):
+            for j, channel in enumerate(self.channels):
+                if channel not in cutflows[dataset]:
+                    continue
+                cutflow = cutflows[dataset][channel]
+                for weighting in self.weightings:
+                    flow = get_flow(cutflow, weighting)
+                    values = self.values[weighting]
+                    n = len(flow)
+                    values["n_evts"][i, j, :n] = [float(e.n_evts) for e in flow]
+                    values["n_ind"][i, j, :n] = [float(e.n_ind) for e in flow]
+                    values["n_all"][i, j, :n] = [float(e.n_all) for e in flow]
+
+        for values in self.values.values():
+            values.update(calculate_fractions(values["n_evts"], values["n_ind"], values["n_all"]))
+
+    @classmethod
+    def from_output(cls, out):
+        """Make CutflowReport from processor output, {dataset: {"cutflow": ..., ...}}"""
+        return cls({dataset: dataset_out["cutflow"] for dataset, dataset_out in out.items()})
+
+    def get(self, quantity="n_all", weighting="weighted"):
+        """Return (dataset, channel, cut) array of one quantity"""
+        if weighting not in self.values:
+            raise ValueError(f"Unknown weighting {weighting}. Options are {self.weightings}")
+        if quantity not in quantities:
+            raise ValueError(f"Unknown quantity {quantity}. Options are {quantities}")
+        return self.values[weighting][quantity]
+
+    def table(self, channel, quantity="n_all", weighting="weighted", datasets=None):
+        """Return rows of [cut name, value for each dataset] for one channel"""
+        datasets = datasets or self.datasets
+        cuts = self.cuts[channel]
+        values = self.get(quantity, weighting)[[self.datasets.index(d) for d in datasets],
+                                               self.channels.index(channel), :len(cuts)]
+        return [[cut] + list(values[:, k]) for k, cut in enumerate(cuts)]
+
+    def headers(self, quantity, datasets=None):
+        """Return table headers for one quantity"""
+        unit = "%" if quantity in fractions else "N"
+        return ["cut name"] + [f"{d} {unit}" for d in datasets or self.datasets]
+
+    def formatted_table(self, channel, quantity, weighting, datasets):
+        """Return table rows with fractions given in percent"""
+        rows = self.table(channel, quantity, weighting, datasets)
+        if quantity in fractions:
+            rows = [[row[0]] + [100*v for v in row[1:]] for row in rows]
+        return rows
+
+    def print_table(self, channel, quantity="n_all", weighting="weighted", datasets=None):
+        """Print table of one quantity with one column per dataset"""
+        rows = self.formatted_table(channel, quantity, weighting, datasets)
+        print(tabulate(rows, self.headers(quantity, datasets), floatfmt=".2f"))
+
+    def records(self):
+        """Return list of dicts with all quantities, one per dataset, channel, weighting, and cut"""
+        records = []
+        for i, dataset in enumerate(self.datasets):
+            for j, channel in enumerate(self.channels):
+                for weighting in self.weightings:
+                    values = self.values[weighting]
+                    for k, cut in enumerate(self.cuts[channel]):
+                        if np.isnan(values["n_evts"][i, j, k]):
+                            continue # channel not run for this dataset
+                        record = {"dataset": dataset, "channel": channel,
+                                  "weighting": weighting, "cut_index": k, "cut": cut}
+                        record.update({q: float(values[q][i, j, k]) for q in quantities})
+                        records.append(record)
+        return records
+
+    def to_csv(self, path):
+        """Write all quantities to a CSV file, one row per dataset, channel, weighting, and cut"""
+        fields = ["dataset", "channel", "weighting", "cut_index", "cut"] + quantities
+        with open(path, "w", encoding="utf8", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fields)
+            writer.writeheader()
+            writer.writerows(self.records())
+
+    def to_dict(self):
+        """Return {dataset: {channel: {"cuts": [...], weighting: {quantity: [...]}}}}"""
+        report = {}
+        for i, dataset in enumerate(self.datasets):
+            report[dataset] = {}
+            for j, channel in enumerate(self.channels):
+                n_cuts = len(self.cuts[channel])
+                if np.isnan(self.values["weighted"]["n_evts"][i, j, 0]):
+                    continue # channel not run for this dataset
+                report[dataset][channel] = {"cuts": self.cuts[channel]}
+                for weighting in self.weightings:
+                    report[dataset][channel][weighting] = {
+                        # json has no nan, so undefined values (e.g. n_ind in cascade mode) are null
+                        q: [None if np.isnan(v) else float(v)
+                            for v in self.values[weighting][q][i, j, :n_cuts]]
+                        for q in quantities
+                    }
+        return report
+
+    def to_json(self, path):
+        """Write all quantities to a JSON file, nested as in to_dict"""
+        with open(path, "w", encoding="utf8") as json_file:
+            json.dump(self.to_dict(), json_file, indent=1)
+
+    def to_markdown(self, path=None, quantities_to_show=("n_all", "f_all"), weighting="weighted",
+                    datasets=None):
+        """Return Markdown with one table per channel and quantity; also write it to path if given"""
+        sections = []
+        for channel in self.channels:
+            for quantity in quantities_to_show:
+                rows = self.formatted_table(channel, quantity, weighting, datasets)
+                table = tabulate(rows, self.headers(quantity, datasets), tablefmt="github",
+                                 floatfmt=".2f")
+                sections.append(f"### {channel}: {quantity} ({weighting})\n\n{table}\n")
+        markdown = "\n".join(sections)
+        if path is not None:
+            with open(path, "w", encoding="utf8") as md_file:
+                md_file.write(markdown)
+        return markdown
+
+
+def flatten_cutflows(channels, prefix=""):
+    """Return {channel: Cutflow}, joining the keys of nested dicts with "/" """
+    flat = {}
+    for name, value in channels.items():
+        if isinstance(value, dict):
+            flat.update(flatten_cutflows(value, f"{prefix}{name}/"))
+        elif value is not None:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+def get_flow(cutflow, weighting):
+    """Return the rows of cutflow for a weighting name"""
+    if weighting == "weighted":
+        return cutflow.get_flow()
+    if weighting == "unweighted":
+        return cutflow.get_flow(unweighted=True)
+    return cutflow.get_flow(variation=weighting)
+
+
+def calculate_fractions(n_evts, n_ind, n_all):
+    """Return {"f_ind", "f_mar", "f_all"} arrays as in CutflowElement.calculate_fractions"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_ind = n_ind/n_evts
+        f_all = n_all/n_evts
+        previous = np.concatenate([n_all[..., :1], n_all[..., :-1]], axis=-1)
+        f_mar = np.where(previous == 0, 0.0, n_all/previous)
+    # the "No selection" row is 1 by definition
+    for f in (f_ind, f_mar, f_all):
+        f[..., 0] = np.where(np.isnan(n_evts[..., 0]), np.nan, 1.0)
+    return {"f_ind": f_ind, "f_mar": f_mar, "f_all": f_all}
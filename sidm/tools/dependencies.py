@@ -0,0 +1,70 @@
+"""Module to find which object collections a definition reads without evaluating it
+
+Cut, object, and histogram definitions are functions of objs, the dictionary of object
+collections, and read collections with objs["name"]. The names of the collections a definition
+can read are therefore among the string constants of its code, of any nested code (e.g. lambdas
+inside the definition), of its closure (e.g. the obj captured by Histogram.simple_hist), and of
+the sidm functions it calls. Lookups like derived_objs["name"](objs, r) are followed into the
+looked-up definition.
+
+The result is conservative: a string that happens to be a collection name is counted as a read
+even if it is never used as a key.
+"""
+
+# python
+import types
+# local
+from sidm.definitions.objects import preLj_objs, postLj_objs
+
+
+def known_collections():
+    """Return the names of all collections that can appear in objs"""
+    return set(preLj_objs) | {"ljs"} | set(postLj_objs)
+
+
+def strings_and_lookups(func, seen):
+    """Return string constants of func and the functions it calls or looks up by those strings"""
+    if not isinstance(func, types.FunctionType) or func in seen:
+        return set(), []
+    seen.add(func)
+    strings = set()
+    code_objects = [func.__code__]
+    names = set()
+    while code_objects:
+        code = code_objects.pop()
+        names |= set(code.co_names)
+        for const in code.co_consts:
+            if isinstance(const, str):
+                strings.add(const)
+            elif isinstance(const, types.CodeType):
+                code_objects.append(const)
+
+    # captured variables, e.g. the obj and attr of simple hists
+    referenced = [cell.cell_contents for cell in (func.__closure__ or [])
+                  if cell.cell_contents is not None]
+    referenced += [func.__globals__[n] for n in names if n in func.__globals__]
+
+    called = []
+    for ref in referenced:
+        if isinstance(ref, str):
+            strings.add(ref)
+        elif isinstance(ref, types.FunctionType) and ref.__module__.startswith("sidm"):
+            called.append(ref)
+        elif isinstance(ref, dict):
+            # follow definitions looked up by name, e.g. derived_objs["genAs_matched_lj"]
+            called += [f for key, f in ref.items() if isinstance(key, str) and key in strings
+                       and isinstance(f, types.FunctionType)]
+    return strings, called
+
+
+def collections_read(func, collections=None):
+    """Return the set of collections that func may read from objs"""
+    collections = known_collections() if collections is None else collections
+    reads = set()
+    seen = set()
+    pending = [func]
+    while pending:
+        strings, called = strings_and_lookups(pending.pop(), seen)
+        reads |= strings & collections
+        pending += called
+    return reads
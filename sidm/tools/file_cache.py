@@ -0,0 +1,336 @@
+"""Module to keep local copies of remote ntuples in an on-disk cache with a size cap
+
+Iterative studies read the same root://xcache//store/... files many times a day. FileCache copies
+each file once into a local directory and rewrites fileset paths to the local copies, so that
+later runs read from disk instead of the network. Copies are identified by the sha256 of their
+source path and evicted least recently used first once the cache grows beyond max_size bytes.
+Copies of XRootD urls are verified against the adler32 checksum reported by the server, if it
+reports one, and against the size of the source; copies of local files against the source size.
+
+The cache index is a json file in the cache directory with one entry per copy:
+{source: {"file", "size", "adler32", "stamp", "last_used"}}. Several processes may share a cache
+directory: the index is re-read and merged with their entries under a file lock whenever it is
+written. Sources may be XRootD urls, which
+need the XRootD python bindings (cmsenv or equivalent), or plain local paths, e.g. a mirrored
+directory that stands in for remote storage. Local sources are recopied when their size or
+modification time changes; remote files are assumed to be immutable once written, as for published
+ntuples.
+
+Local copies only exist on the machine that made them, so the cache is meant for running locally,
+not on Dask workers.
+
+Usage:
+    cache = FileCache(max_size=100e9)
+    fileset = utilities.make_fileset(["4Mu_500GeV_5p0GeV_0p08mm"], "ffntuple_v4", cache=cache)
+"""
+
+# python
+import concurrent.futures
+import fcntl
+import functools
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import zlib
+
+
+default_cache_dir = os.path.join(os.path.expanduser("~"), ".sidm", "file_cache")
+
+index_name = "index.json"
+block_size = 16*1024*1024
+
+
+def is_remote(path):
+    """Return True for paths that are read over XRootD"""
+    return path.startswith("root://")
+
+
+def source_stamp(path):
+    """Return [size, modification time] of a local source, or None for remote sources"""
+    if is_remote(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime]
+
+
+def xrootd_filesystem(url):
+    """Return XRootD FileSystem of the server of url and the path of the file on that server"""
+    # only import XRootD when it is needed, since it requires cmsenv or equivalent
+    from XRootD import client # pylint: disable=import-outside-toplevel
+    server, _, path = url[len("root://"):].partition("/")
+    return client.FileSystem(f"root://{server}"), path
+
+
+def source_size(path):
+    """Return size in bytes of a local file or XRootD url"""
+    if not is_remote(path):
+        return os.path.getsize(path)
+    filesystem, remote_path = xrootd_filesystem(path)
+    status, info = filesystem.stat(remote_path)
+    if not status.ok:
+        raise OSError(f"Cannot stat {path}: {status.message}")
+    return info.size
+
+
+def source_adler32(url):
+    """Return adler32 checksum of an XRootD url as reported by its server, as 8 hex digits, or None
+    if the server doesn't report adler32 checksums"""
+    from XRootD.client.flags import QueryCode # pylint: disable=import-outside-toplevel
+    filesystem, remote_path = xrootd_filesystem(url)
+    status, response = filesystem.query(QueryCode.CHECKSUM, remote_path)
+    if not status.ok or not response:
+        return None
+    # response is e.g. b"adler32 0a1b2c3d"
+    algorithm, _, value = response.decode().strip("\x00 \n").partition(" ")
+    if algorithm.lower() != "adler32":
+        return None
+    return value.strip().lower().zfill(8)
+
+
+def read_blocks(path):
+    """Yield the contents of a local file or XRootD url in blocks of block_size bytes"""
+    if not is_remote(path):
+        with open(path, "rb") as source:
+            yield from iter(lambda: source.read(block_size), b"")
+        return
+
+    from XRootD import client # pylint: disable=import-outside-toplevel
+    with client.File() as source:
+        status, _ = source.open(path)
+        if not status.ok:
+            raise OSError(f"Cannot open {path}: {status.message}")
+        offset = 0
+        while True:
+            status, block = source.read(offset, block_size)
+            if not status.ok:
+                raise OSError(f"Cannot read {path}: {status.message}")
+            if not block:
+                return
+            offset += len(block)
+            yield block
+
+
+def file_adler32(path):
+    """Return adler32 checksum of the contents of a local file or XRootD url as 8 hex digits"""
+    checksum = 1
+    for block in read_blocks(path):
+        checksum = zlib.adler32(block, checksum)
+    return f"{checksum:08x}"
+
+
+class FileCache:
+    """Class to copy files into a local directory and evict the least recently used copies
+
+    max_size is the total size of all copies in bytes. With fetch=False, paths are only rewritten
+    to copies that are already cached and missing files are read from their source.
+    """
+
+    def __init__(self, cache_dir=default_cache_dir, max_size=50e9, fetch=True, verify=False):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.fetch = fetch
+        # recompute the checksum of copies whenever they are used, rather than only checking size
+        self.verify = verify
+        self.lock = threading.Lock()
+        self.index_path = os.path.join(cache_dir, index_name)
+        self.index = self.read_index()
+
+    def __contains__(self, source):
+        return self.lookup(source) is not None
+
+    @property
+    def size(self):
+        """Total size of all copies in bytes"""
+        return sum(entry["size"] for entry in self.index.values())
+
+    def local_path(self, source):
+        """Return path of the local copy of source, whether or not it exists"""
+        digest = hashlib.sha256(source.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest[:16]}_{os.path.basename(source)}")
+
+    def lookup(self, source, in_use=None):
+        """Return path of a valid local copy of source, or None if there is none
+
+        Copies that are missing, were modified, or are out of date with their source are dropped.
+        Returned copies are added to the set in_use, if given, which protects them from eviction.
+        """
+        with self.lock:
+            entry = self.index.get(source)
+        if entry is None:
+            return None
+        path = os.path.join(self.cache_dir, entry["file"])
+        valid = (os.path.exists(path) and os.path.getsize(path) == entry["size"]
+                 and (not self.verify or file_adler32(path) == entry["adler32"]))
+        if valid and not is_remote(source):
+            valid = os.path.exists(source) and source_stamp(source) == entry["stamp"]
+        with self.lock:
+            if not valid:
+                self.remove(source)
+                return None
+            entry["last_used"] = time.time()
+            if in_use is not None:
+                in_use.add(source)
+        return path
+
+    def get(self, source, in_use=None):
+        """Return path of the local copy of source, copying it first if needed
+
+        Returns source itself if it can't be cached, so callers can always read the returned path.
+        Copies in the set in_use are never evicted to make room, and the returned copy is added to
+        it.
+        """
+        path = self.lookup(source, in_use)
+        if path is not None:
+            return path
+        if not self.fetch:
+            return source
+        try:
+            return self.copy(source, in_use)
+        except (OSError, ImportError) as e:
+            print(f"Warning: cannot cache {source}: {e}. Reading it from its source.")
+            return source
+
+    def copy(self, source, in_use=None):
+        """Copy source into the cache, verify the copy against source, and return its path
+
+        Raises OSError if source doesn't fit in the cache next to the copies in the set in_use,
+        which the new copy is added to.
+        """
+        in_use = set() if in_use is None else in_use
+        stamp = source_stamp(source)
+        expected_size = source_size(source)
+        with self.lock:
+            self.check_fits(expected_size, in_use)
+        path = self.local_path(source)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first so that an interrupted copy is never used
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            checksum = 1
+            size = 0
+            with open(tmp_path, "wb") as copy:
+                for block in read_blocks(source):
+                    checksum = zlib.adler32(block, checksum)
+                    size += len(block)
+                    copy.write(block)
+            checksum = f"{checksum:08x}"
+            if size != expected_size or os.path.getsize(tmp_path) != expected_size:
+                raise OSError(f"size of copy does not match source size of {expected_size} bytes")
+            expected_checksum = source_adler32(source) if is_remote(source) else None
+            if expected_checksum is not None and checksum != expected_checksum:
+                raise OSError(f"checksum of copy {checksum} does not match source checksum "
+                              f"{expected_checksum}")
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self.lock:
+            # other threads may have added copies in use while copying
+            try:
+                self.check_fits(size, in_use)
+            except OSError:
+                os.remove(path)
+                raise
+            self.index[source] = {
+                "file": os.path.relpath(path, self.cache_dir),
+                "size": size,
+                "adler32": checksum,
+                "stamp": stamp,
+                "last_used": time.time(),
+            }
+            in_use.add(source)
+            self.save(keep=in_use)
+        return path
+
+    def check_fits(self, size, in_use):
+        """Raise OSError if a copy of size bytes doesn't fit next to the copies in in_use; call
+        with lock held"""
+        if size > self.max_size:
+            raise OSError(f"file is larger than the cache size of {self.max_size:.0f} bytes")
+        used = sum(self.index[source]["size"] for source in in_use if source in self.index)
+        if used + size > self.max_size:
+            raise OSError(f"files in use fill the cache size of {self.max_size:.0f} bytes")
+
+    def remove(self, source):
+        """Delete the copy of source and its index entry; call with lock held"""
+        entry = self.index.pop(source, None)
+        if entry is not None:
+            path = os.path.join(self.cache_dir, entry["file"])
+            if os.path.exists(path):
+                os.remove(path)
+
+    def evict(self, keep=()):
+        """Remove least recently used copies, except those of sources in keep, until the cache fits
+        in max_size; call with lock held"""
+        total = self.size
+        by_use = sorted(self.index, key=lambda s: self.index[s]["last_used"])
+        for source in by_use:
+            if total <= self.max_size:
+                break
+            if source in keep:
+                continue
+            total -= self.index[source]["size"]
+            self.remove(source)
+
+    def read_index(self):
+        """Return the index as last written to disk"""
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, encoding="utf8") as index_file:
+            return json.load(index_file)
+
+    def merge(self, other):
+        """Return the index merged with other, e.g. the index written by another process
+
+        The most recently used entry of each source is kept, and entries whose copies no longer
+        exist are dropped.
+        """
+        merged = dict(other)
+        for source, entry in self.index.items():
+            if source not in merged or entry["last_used"] >= merged[source]["last_used"]:
+                merged[source] = entry
+        return {source: entry for source, entry in merged.items()
+                if os.path.exists(os.path.join(self.cache_dir, entry["file"]))}
+
+    def save(self, keep=()):
+        """Merge the index with the one on disk, evict copies beyond max_size, and write it; call
+        with lock held
+
+        The index on disk is locked while it is merged and written, so that processes sharing the
+        cache don't lose each other's entries.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(f"{self.index_path}.lock", "w", encoding="utf8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX) # released when lock_file is closed
+            self.index = self.merge(self.read_index())
+            self.evict(keep)
+            # write to a temporary file first so that an interrupted write can't corrupt the index
+            with open(f"{self.index_path}.tmp", "w", encoding="utf8") as index_file:
+                json.dump(self.index, index_file, indent=1, sort_keys=True)
+            os.replace(f"{self.index_path}.tmp", self.index_path)
+
+    def localize(self, fileset, workers=4):
+        """Return copy of {dataset: [files]} with files replaced by their local copies
+
+        Missing files are copied concurrently by workers threads unless fetch is False. Copies that
+        are returned are never evicted to make room for other files of fileset; files that don't
+        fit next to them are read from their source.
+        """
+        files = list(dict.fromkeys(f for paths in fileset.values() for f in paths))
+        in_use = set()
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            local = dict(zip(files, pool.map(functools.partial(self.get, in_use=in_use), files)))
+        with self.lock:
+            self.save(keep=in_use)
+        return {dataset: [local[f] for f in paths] for dataset, paths in fileset.items()}
+
+    def clear(self):
+        """Delete every copy and the index"""
+        with self.lock:
+            self.index = {}
+            if os.path.exists(self.cache_dir):
+                shutil.rmtree(self.cache_dir)
@@ -0,0 +1,240 @@
+"""Module to pack many small files of one dataset into shared work units
+
+coffea.processor.Runner makes at least one task per file, so a dataset split into dozens of small
+_part-N files (as most signal points are) is run as dozens of tasks that each pay for scheduling,
+opening a file, building the NanoEvents schema, and setting up the processor. FilesetPlanner
+instead packs consecutive files of the same dataset into work units of roughly target_entries
+events. Each work unit is a single task that opens its files one after the other and feeds them to
+the processor as one stream of chunks, accumulating the outputs before returning. Files larger
+than target_entries are split into several units, as Runner would split them into chunks.
+
+Work units are run with the coffea executors, so the same planner works locally and on Dask.
+
+Usage:
+    planner = FilesetPlanner(fileset, target_entries=100000)
+    out = planner.run(SidmProcessor(["4mu"], ["base"]), processor.FuturesExecutor(workers=4))
+"""
+
+# python
+import concurrent.futures
+import math
+# columnar analysis
+import cloudpickle
+import uproot
+from coffea import processor
+from coffea.nanoevents import NanoEventsFactory, NanoAODSchema
+# local
+from sidm.tools.io_profile import load_profile
+
+
+def is_parquet(path):
+    """Return True for files converted with sidm.tools.parquet_store rather than ROOT files"""
+    return path.endswith(".parquet")
+
+
+def count_entries(files, treepath="Events", workers=8):
+    """Return {file: number of entries in treepath}, opening files concurrently"""
+    def num_entries(path):
+        if is_parquet(path):
+            # only import pyarrow when it is needed
+            from sidm.tools import parquet_store # pylint: disable=import-outside-toplevel
+            return parquet_store.ParquetColumnSource(path).num_entries
+        with uproot.open(path) as root_file:
+            return root_file[treepath].num_entries
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        return dict(zip(files, pool.map(num_entries, files)))
+
+
+class WorkUnit:
+    """Slices of one or more files of a single dataset that are processed in one task
+
+    slices is a list of (file, entry start, entry stop).
+    """
+
+    def __init__(self, dataset, slices):
+        self.dataset = dataset
+        self.slices = slices
+
+    @property
+    def n_entries(self):
+        """Total number of entries in the work unit"""
+        return sum(stop - start for _, start, stop in self.slices)
+
+    def __repr__(self):
+        return (f"WorkUnit({self.dataset}, {len(self.slices)} slices, "
+                f"{self.n_entries} entries)")
+
+
+class WorkUnitProcessor:
+    """Picklable function that runs a processor over every slice of a work unit
+
+    The processor is serialized with cloudpickle, as Runner does, because its definitions include
+    lambdas that the standard pickle used by process pools can't handle.
+    """
+
+    def __init__(self, processor_instance, treepath="Events", schemaclass=NanoAODSchema,
+                 chunksize=None, io_profile=None):
+        self.processor = processor_instance
+        self.treepath = treepath
+        self.schemaclass = schemaclass
+        self.chunksize = chunksize
+        # sidm.tools.io_profile.IOProfile to open files with, or None for uproot defaults
+        self.io_profile = io_profile
+        # columns read by the previous chunk, which are prefetched if the profile coalesces reads
+        self.columns = []
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["processor"] = cloudpickle.dumps(self.processor)
+        return state
+
+    def __setstate__(self, state):
+        state["processor"] = cloudpickle.loads(state["processor"])
+        self.__dict__.update(state)
+
+    def chunks(self, unit):
+        """Yield (file, entry start, entry stop) with at most chunksize entries each"""
+        for path, start, stop in unit.slices:
+            step = stop - start if self.chunksize is None else self.chunksize
+            for chunk_start in range(start, stop, max(step, 1)):
+                yield path, chunk_start, min(chunk_start + step, stop)
+
+    def open(self, path):
+        """Return uproot file opened with the settings of the I/O profile"""
+        if self.io_profile is None:
+            return uproot.open(path)
+        return self.io_profile.open(path)
+
+    def process_chunk(self, path, dataset, start, stop):
+        """Return (processor output, {"bytes", "requests"} read from the file) for one chunk"""
+        access_log = []
+        metadata = {
+            "dataset": dataset,
+            "filename": path,
+            "treename": self.treepath,
+            "entrystart": start,
+            "entrystop": stop,
+        }
+        if is_parquet(path):
+            # only import pyarrow when it is needed
+            from sidm.tools import parquet_store # pylint: disable=import-outside-toplevel
+            # files converted with sidm.tools.parquet_store are memory-mapped
+            source = parquet_store.ParquetColumnSource(path)
+            events = parquet_store.events(source, self.treepath, start, stop, self.schemaclass,
+                                          metadata, access_log)
+            out = self.processor.process(events)
+            self.columns = list(dict.fromkeys(access_log))
+            return out, {"bytes": source.num_requested_bytes, "requests": source.num_requests}
+
+        with self.open(path) as root_file:
+            if self.io_profile is None:
+                events = NanoEventsFactory.from_root(
+                    root_file,
+                    treepath=self.treepath,
+                    entry_start=start,
+                    entry_stop=stop,
+                    schemaclass=self.schemaclass,
+                    metadata=metadata,
+                    access_log=access_log,
+                ).events()
+            else:
+                events = self.io_profile.events(root_file, self.treepath, start, stop,
+                                                self.schemaclass, metadata, self.columns,
+                                                access_log)
+            out = self.processor.process(events)
+            source = root_file.file.source
+            read_stats = {"bytes": source.num_requested_bytes, "requests": source.num_requests}
+        self.columns = list(dict.fromkeys(access_log))
+        return out, read_stats
+
+    def __call__(self, unit):
+        out = None
+        for path, start, stop in self.chunks(unit):
+            chunk_out, _ = self.process_chunk(path, unit.dataset, start, stop)
+            out = chunk_out if out is None else processor.accumulate([chunk_out], out)
+        return out
+
+
+class FilesetPlanner:
+    """Class to plan and run work units that group small files of the same dataset"""
+
+    def __init__(self, fileset, target_entries=100000, treepath="Events", entries=None,
+                 workers=8, cache=None):
+        # read local copies of the files if a sidm.tools.file_cache.FileCache is given
+        self.fileset = fileset if cache is None else cache.localize(fileset, workers)
+        self.target_entries = target_entries
+        self.treepath = treepath
+        # number of entries per file; counted on first use unless provided
+        self.entries = entries
+        self.workers = workers
+
+    def count_entries(self):
+        """Count entries in every file of the fileset that hasn't been counted yet"""
+        self.entries = {} if self.entries is None else self.entries
+        missing = [f for files in self.fileset.values() for f in files if f not in self.entries]
+        if missing:
+            self.entries.update(count_entries(missing, self.treepath, self.workers))
+        return self.entries
+
+    def plan(self):
+        """Return list of WorkUnits that cover every entry of every file exactly once"""
+        entries = self.count_entries()
+        units = []
+        for dataset, files in self.fileset.items():
+            slices = []
+            n_pending = 0
+            for path in files:
+                n_entries = entries[path]
+                if n_entries == 0:
+                    continue
+                if n_entries > self.target_entries:
+                    # large files are split evenly into units of about target_entries
+                    n_splits = math.ceil(n_entries/self.target_entries)
+                    step = math.ceil(n_entries/n_splits)
+                    units += [WorkUnit(dataset, [(path, start, min(start + step, n_entries))])
+                              for start in range(0, n_entries, step)]
+                    continue
+                if n_pending + n_entries > self.target_entries and slices:
+                    units.append(WorkUnit(dataset, slices))
+                    slices = []
+                    n_pending = 0
+                slices.append((path, 0, n_entries))
+                n_pending += n_entries
+            if slices:
+                units.append(WorkUnit(dataset, slices))
+        return units
+
+    def run(self, processor_instance, executor=None, schemaclass=NanoAODSchema, chunksize=None,
+            io_profile=None):
+        """Run processor_instance over all work units and return the accumulated output
+
+        chunksize optionally limits the number of entries passed to each process call within a
+        work unit, e.g. to bound memory when target_entries is large. io_profile is the name of a
+        profile in sidm/configs/io_profiles.yaml or a sidm.tools.io_profile.IOProfile, whose
+        chunksize is used unless chunksize is given.
+        """
+        executor = processor.IterativeExecutor() if executor is None else executor
+        units = self.plan()
+        if not units:
+            return {}
+        io_profile = load_profile(io_profile)
+        if chunksize is None and io_profile is not None:
+            chunksize = io_profile.chunksize
+        function = WorkUnitProcessor(processor_instance, self.treepath, schemaclass, chunksize,
+                                     io_profile)
+        out, _ = executor(units, function, None)
+        # as in Runner, postprocess may modify out in place
+        processor_instance.postprocess(out)
+        return out
+
+    def summary(self):
+        """Return {dataset: (number of files, number of work units, number of entries)}"""
+        units = self.plan()
+        return {
+            dataset: (
+                len(files),
+                sum(u.dataset == dataset for u in units),
+                sum(self.entries[f] for f in files),
+            )
+            for dataset, files in self.fileset.items()
+        }
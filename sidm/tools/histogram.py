@@ -1,7 +1,11 @@
-"""Module to define the Histogram and Axis classes"""
+"""Module to define the Histogram, EfficiencyHistogram, Axis, and HistogramRegistry classes, and
+select_for_yields"""
 
+# python
+import collections.abc
 # columnar analysis
 import hist
+import numpy as np
 import awkward as ak
 
 
@@ -19,6 +23,8 @@ class Histogram:
         self.storage = storage
         # Allow all events to pass if no mask is explicitly provided
         self.evt_mask = (lambda objs: slice(None)) if evt_mask is None else evt_mask
+        self.variations = None
+        self.regions = None
         self.hist = None
 
     @classmethod
@@ -36,12 +42,21 @@ class Histogram:
             Axis(hist.axis.Regular(nbins, xmin, xmax, name=f"{obj}_{attr}", label=label), f)
             ])
 
-    def make_hist(self, name, channels=None, lj_reco_choices=None):
+    def make_hist(self, name, channels=None, lj_reco_choices=None, variations=None, regions=None):
         """Build associated hist.Hist
 
         Perform outside __init__ because channels aren't known until runtime.
         """
         self.name = name
+        self.variations = variations
+        self.regions = regions
+
+        # optionally add ABCD region axis to hist; objs["abcd"]["region"] holds per-event indices
+        if regions is not None:
+            region_axis = hist.axis.StrCategory(regions, name="region")
+            self.axes = [
+                Axis(region_axis, lambda objs, mask: ak.Array(objs["abcd"]["region"])[mask])
+            ] + self.axes
 
         # optionally add channels axis to hist
         if channels is not None:
@@ -54,10 +69,17 @@ class Histogram:
             self.axes = [Axis(lj_reco_axis, lambda objs, mask: objs["lj_reco"])] + self.axes
 
         axes = [a.axis for a in self.axes]
+        # optionally add weight variation axis to hist; it is filled once per variation
+        if variations is not None:
+            axes = [hist.axis.StrCategory(variations, name="variation")] + axes
         self.hist = hist.Hist(*axes, storage=self.storage)
 
     def fill(self, objs, evt_weights):
-        """Fill associated hist.Hist"""
+        """Fill associated hist.Hist
+
+        If the hist has a variation axis, evt_weights is a dict of {variation: per-event weights},
+        and the hist is filled once per variation with the same values.
+        """
         # Create fill args, warning user and skipping hists that cannot be filled
         try:
             fill_args = {a.name: a.fill_func(objs, self.evt_mask(objs)) for a in self.axes}
@@ -66,17 +88,86 @@ class Histogram:
             return
 
         # Use last axis to define weight structure to avoid channels axis
-        masked_weights = evt_weights[self.evt_mask(objs)]
-        fill_args["weight"] = masked_weights*ak.ones_like(fill_args[self.axes[-1].name])
+        shape = ak.ones_like(fill_args[self.axes[-1].name])
         for name in fill_args.keys():
-            if name not in ("channel", "lj_reco"):
+            if name not in ("channel", "lj_reco", "region"):
                 fill_args[name] = ak.flatten(fill_args[name], axis=None)
 
-        # Fill hist, warning user and skipping hists that cannot be filled
-        try:
-            self.hist.fill(**fill_args)
-        except ValueError:
-            print(f"Warning: a histogram with the name {self.name} could not be filled and will be skipped")
+        # broadcast per-event region indices to the structure of the other fill args and convert
+        # them to labels; events in no region get a label outside the axis and go to overflow
+        if self.regions is not None:
+            region_labels = np.array(list(self.regions) + [""])
+            indices = ak.flatten(fill_args["region"]*shape, axis=None)
+            fill_args["region"] = region_labels[ak.to_numpy(indices).astype(int)]
+
+        if self.variations is None:
+            evt_weights = {None: evt_weights}
+        for variation, variation_weights in evt_weights.items():
+            if variation is not None:
+                fill_args["variation"] = variation
+
+            # Fill hist, warning user and skipping variations that cannot be filled; a single fill
+            # call either fills all entries of a variation or none of them
+            try:
+                masked_weights = variation_weights[self.evt_mask(objs)]
+                fill_args["weight"] = ak.flatten(masked_weights*shape, axis=None)
+                self.hist.fill(**fill_args)
+            except ValueError:
+                skipped = "" if variation is None else f" for variation {variation}"
+                print(f"Warning: a histogram with the name {self.name} could not be filled"
+                      f"{skipped} and will be skipped")
+
+class EfficiencyHistogram(Histogram):
+    """Class to represent efficiency histograms that are filled in one pass
+
+    An EfficiencyHistogram is the denominator histogram with an extra boolean "pass" axis, filled
+    from a predicate that returns whether each entry (e.g. each gen A) passes, e.g. whether it is
+    matched to a lepton jet. The numerator is the pass=True slice, so numerator and denominator
+    come from the same selection and the same fill. Use efficiency() to get the ratio and its
+    Clopper-Pearson interval from the resulting hist.Hist.
+    """
+
+    def __init__(self, axes, passed, storage="weight", evt_mask=None):
+        pass_axis = Axis(hist.axis.Boolean(name="pass"),
+                         lambda objs, mask: ak.fill_none(passed(objs, mask), False))
+        super().__init__(axes + [pass_axis], storage, evt_mask)
+
+
+def efficiency(h, coverage=0.682689492137086):
+    """Return efficiency hist.Hist and (2, ...) array of down/up errors from a hist with a pass axis
+
+    Works for any number of other axes at once. The interval is Clopper-Pearson at the given
+    coverage, evaluated with the effective number of entries sum(w)^2/sum(w^2) so that weighted
+    hists are handled; for unit weights this is the usual interval on raw counts. Negative weights
+    can push the efficiency outside [0, 1], in which case the interval is that of the nearest
+    physical efficiency. Pass the errors as yerr when plotting, as for get_eff_hist.
+    """
+    # scipy is only needed here; keep it out of the import of every module that defines hists
+    from scipy.stats import beta # pylint: disable=import-outside-toplevel
+
+    total = h[{"pass": sum}]
+    passed = h[{"pass": True}]
+    total_values = total.values()
+    passed_values = passed.values()
+    total_variances = total.variances()
+    if total_variances is None:
+        total_variances = total_values
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eff = passed_values/total_values
+        n_eff = np.where(total_variances > 0, total_values**2/total_variances, 0.0)
+        k_eff = np.clip(eff, 0, 1)*n_eff
+        alpha = (1 - coverage)/2
+        lower = np.where(k_eff > 0, beta.ppf(alpha, k_eff, n_eff - k_eff + 1), 0.0)
+        upper = np.where(n_eff - k_eff > 0,
+                         beta.ppf(1 - alpha, k_eff + 1, n_eff - k_eff), 1.0)
+    lower = np.where(n_eff > 0, lower, np.nan)
+    upper = np.where(n_eff > 0, upper, np.nan)
+
+    eff_hist = hist.Hist(*passed.axes)
+    eff_hist.values()[...] = eff
+    return eff_hist, np.stack([np.maximum(eff - lower, 0), np.maximum(upper - eff, 0)])
+
 
 class Axis:
     """Class to represent histogram axes
@@ -88,3 +179,45 @@ class Axis:
         self.axis = axis
         self.name = self.axis.name
         self.fill_func = fill_func
+
+
+class HistogramRegistry(collections.abc.Mapping):
+    """Class to hold histogram definitions that are only built when first requested
+
+    Each definition is a function that takes no arguments and returns a Histogram, so that
+    defining all available hists costs nothing until a hist is actually used. Built Histograms are
+    cached, so repeated lookups of the same name return the same object.
+    """
+
+    def __init__(self, factories):
+        self.factories = factories
+        self.built = {}
+
+    def __getitem__(self, name):
+        if name not in self.built:
+            self.built[name] = self.factories[name]()
+        return self.built[name]
+
+    def __iter__(self):
+        return iter(self.factories)
+
+    def __len__(self):
+        return len(self.factories)
+
+
+def select_for_yields(h, variation="nominal", **selection):
+    """Return h after applying selection and, if h has a variation axis, selecting variation
+
+    Yields are sums over the remaining axes, so this raises ValueError if an lj_reco axis with more
+    than one bin is left, which would count each event once per lepton jet reconstruction.
+    """
+    if "variation" in h.axes.name:
+        if variation not in h.axes["variation"]:
+            raise ValueError(f"Unknown variation {variation}. "
+                             f"Options are {list(h.axes['variation'])}")
+        selection = {"variation": variation, **selection}
+    h = h[selection] if selection else h
+    if "lj_reco" in h.axes.name and len(h.axes["lj_reco"]) > 1:
+        raise ValueError(f"Select one lj_reco, e.g. lj_reco=\"{h.axes['lj_reco'][0]}\", rather "
+                         f"than summing over {list(h.axes['lj_reco'])}")
+    return h
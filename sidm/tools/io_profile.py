@@ -0,0 +1,186 @@
+"""Module to tune how ntuples are read with named I/O profiles
+
+The best way to read a file over a high-latency link such as xcache is very different from the
+best way to read it from a local SSD: remote reads pay a round trip per request, so they should be
+few and large, while local reads are cheap and mostly limited by decompression. An IOProfile
+collects the knobs that control this, and profiles are defined by name in
+sidm/configs/io_profiles.yaml:
+- the uproot source and its options (file and XRootD handlers, timeout, parallel requests, and the
+  size of the first read when opening a file)
+- the size of the per-file cache of decompressed arrays
+- the number of entries per processor call (chunksize)
+- the number of threads that decompress baskets, which NanoEvents otherwise always does in the
+  calling thread
+- coalescing: before processing a chunk, read every column that the previous chunk used in one
+  vectorized request, rather than lazily with one request per column
+
+Profiles are used by sidm.tools.fileset_planner.FilesetPlanner, which reads files itself, and can
+partially configure coffea.processor.Runner, which only exposes chunksize, timeout, and memmap.
+
+Usage:
+    planner = FilesetPlanner(fileset)
+    out = planner.run(SidmProcessor(["4mu"], ["base"]), io_profile="remote-high-latency")
+    # or
+    runner = processor.Runner(executor, schema=NanoAODSchema,
+                              **load_profile("local-ssd").runner_options())
+"""
+
+# python
+import concurrent.futures
+# columnar analysis
+import uproot
+from coffea.nanoevents import NanoEventsFactory, NanoAODSchema
+from coffea.nanoevents.mapping.uproot import TrivialUprootOpener, UprootSourceMapping
+# local
+from sidm import BASE_DIR
+from sidm.tools import utilities
+
+
+file_handlers = {
+    "memmap": uproot.MemmapSource,
+    "multithreaded": uproot.MultithreadedFileSource,
+}
+
+xrootd_handlers = {
+    "xrootd": uproot.XRootDSource,
+    "multithreaded": uproot.MultithreadedXRootDSource,
+}
+
+
+class IOProfile:
+    """Class to hold the settings used to read ntuples; defaults are those of uproot and coffea"""
+
+    def __init__(self, name="default", chunksize=100000, array_cache="100 MB",
+                 decompression_workers=1, coalesce=False, file_handler="memmap",
+                 xrootd_handler="xrootd", timeout=60, num_workers=1, num_fallback_workers=10,
+                 begin_chunk_size=403):
+        if file_handler not in file_handlers:
+            raise ValueError(f"Unknown file_handler {file_handler}. Options are "
+                             f"{list(file_handlers)}")
+        if xrootd_handler not in xrootd_handlers:
+            raise ValueError(f"Unknown xrootd_handler {xrootd_handler}. Options are "
+                             f"{list(xrootd_handlers)}")
+        self.name = name
+        self.chunksize = chunksize
+        self.array_cache = array_cache
+        self.decompression_workers = decompression_workers
+        self.coalesce = coalesce
+        self.file_handler = file_handler
+        self.xrootd_handler = xrootd_handler
+        self.timeout = timeout
+        self.num_workers = num_workers
+        self.num_fallback_workers = num_fallback_workers
+        self.begin_chunk_size = begin_chunk_size
+        self._executor = None
+
+    def __getstate__(self):
+        # thread pools can't be pickled; each process makes its own
+        state = dict(self.__dict__)
+        state["_executor"] = None
+        return state
+
+    def __repr__(self):
+        return f"IOProfile({self.name})"
+
+    @classmethod
+    def from_config(cls, name, cfg="configs/io_profiles.yaml"):
+        """Make IOProfile from an entry of the profile config"""
+        profiles = utilities.load_yaml(f"{BASE_DIR}/{cfg}")
+        if name not in profiles:
+            raise ValueError(f"Unknown I/O profile {name}. Options are {list(profiles)}")
+        return cls(name, **(profiles[name] or {}))
+
+    def uproot_options(self):
+        """Return options to pass to uproot.open"""
+        return {
+            "array_cache": self.array_cache,
+            "file_handler": file_handlers[self.file_handler],
+            "xrootd_handler": xrootd_handlers[self.xrootd_handler],
+            "timeout": self.timeout,
+            "num_workers": self.num_workers,
+            "num_fallback_workers": self.num_fallback_workers,
+            "begin_chunk_size": self.begin_chunk_size,
+        }
+
+    def runner_options(self):
+        """Return the subset of settings that coffea.processor.Runner accepts"""
+        return {
+            "chunksize": self.chunksize,
+            "xrootdtimeout": self.timeout,
+            "mmap": self.file_handler == "memmap",
+        }
+
+    def open(self, path):
+        """Return uproot file opened with the settings of this profile"""
+        return uproot.open(path, **self.uproot_options())
+
+    @property
+    def executor(self):
+        """Executor that decompresses and interprets baskets"""
+        if self._executor is None:
+            if self.decompression_workers > 1:
+                self._executor = concurrent.futures.ThreadPoolExecutor(self.decompression_workers)
+            else:
+                self._executor = uproot.source.futures.TrivialExecutor()
+        return self._executor
+
+    def prefetch(self, tree, columns, entry_start, entry_stop):
+        """Return {column: array} of columns of tree read in one request, if reads are coalesced
+
+        Columns that aren't branches of tree are ignored.
+        """
+        branches = set(tree.keys())
+        columns = [c for c in columns if c in branches]
+        if not self.coalesce or not columns:
+            return {}
+        return tree.arrays(filter_name=columns, entry_start=entry_start, entry_stop=entry_stop,
+                           decompression_executor=self.executor,
+                           interpretation_executor=self.executor, how=dict)
+
+    def events(self, root_file, treepath="Events", entry_start=0, entry_stop=None,
+               schemaclass=NanoAODSchema, metadata=None, columns=(), access_log=None):
+        """Return NanoEvents of an open file, as NanoEventsFactory.from_root does
+
+        columns, e.g. the access log of the previous chunk, are prefetched if reads are coalesced.
+        """
+        tree = root_file[treepath]
+        entry_stop = tree.num_entries if entry_stop is None else min(entry_stop, tree.num_entries)
+        partition_key = (str(tree.file.uuid), tree.object_path, f"{entry_start}-{entry_stop}")
+        mapping = ProfiledSourceMapping(
+            TrivialUprootOpener({partition_key[0]: tree.file.file_path}, self.uproot_options()),
+            self.prefetch(tree, columns, entry_start, entry_stop),
+            self.executor,
+            cache={},
+            access_log=access_log,
+        )
+        mapping.preload_column_source(partition_key[0], partition_key[1], tree)
+        # pylint: disable=protected-access
+        base_form = mapping._extract_base_form(tree)
+        return NanoEventsFactory._from_mapping(mapping, partition_key, base_form, None, None,
+                                               schemaclass, metadata).events()
+
+
+class ProfiledSourceMapping(UprootSourceMapping): # pylint: disable=abstract-method
+    """NanoEvents column source that returns prefetched columns and reads the others with executor
+
+    coffea's UprootSourceMapping always decompresses in the calling thread.
+    """
+
+    def __init__(self, fileopener, prefetched, executor, cache=None, access_log=None):
+        self.prefetched = prefetched
+        self.executor = executor
+        super().__init__(fileopener, cache, access_log)
+
+    def extract_column(self, columnhandle, start, stop):
+        if columnhandle.name in self.prefetched:
+            return self.prefetched[columnhandle.name]
+        return columnhandle.array(entry_start=start, entry_stop=stop,
+                                  decompression_executor=self.executor,
+                                  interpretation_executor=self.executor)
+
+
+def load_profile(profile):
+    """Return IOProfile for a profile name; IOProfiles are returned unchanged"""
+    if profile is None or isinstance(profile, IOProfile):
+        return profile
+    return IOProfile.from_config(profile)
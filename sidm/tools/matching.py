@@ -0,0 +1,73 @@
+"""Module to share dR matching between two collections across all cuts, objects, and hists
+
+Matching helpers like dR(obj1, obj2), matched(obj1, obj2, r), and nearest(obj1, obj2, threshold)
+all start from the same metric table between obj1 and obj2, and the resolution and efficiency
+hists call them dozens of times per chunk with the same two collections. A MatchTable computes the
+nearest obj2 to every obj1 and its dR once, and answers every consumer at any radius by
+thresholding.
+
+Tables are only cached inside a caching() block, which SidmProcessor opens around each chunk.
+The cache is held in a context variable, so chunks processed concurrently in different threads
+(e.g. on a threaded Dask worker) each have their own cache, and it is dropped when the block exits.
+Entries are keyed on the identity of the two collections, so a collection that is filtered or
+rebuilt (e.g. per channel or per lj_reco) gets its own table. Consumers that slice their inputs,
+e.g. objs["muons"][mask, 0:1], should instead slice the result of matching the full collections
+to share the same table.
+"""
+
+# python
+import contextlib
+import contextvars
+# columnar analysis
+import awkward as ak
+
+
+class MatchTable:
+    """Class to hold the nearest obj2 to every obj1 and the dR between them"""
+
+    def __init__(self, obj1, obj2):
+        self.obj1 = obj1
+        self.obj2 = obj2
+        # nearest obj2 to every obj1 and the dR between them; None where an event has no obj2
+        self.nearest_obj, self.dr = obj1.nearest(obj2, return_metric=True)
+        self.matched_objs = {}
+
+    def nearest(self, threshold=None):
+        """Return nearest obj2 to every obj1, masked where dR > threshold"""
+        if threshold is None:
+            return self.nearest_obj
+        return self.nearest_obj.mask[self.dr <= threshold]
+
+    def matched(self, r):
+        """Return obj1 that have >=1 obj2 within r"""
+        if r not in self.matched_objs:
+            matched_objs = self.obj1[self.dr < r]
+            # events without obj2 leave None entries, which are removed as in utilities.drop_none
+            self.matched_objs[r] = matched_objs[~ak.is_none(matched_objs, axis=1)]
+        return self.matched_objs[r]
+
+
+# {(id(obj1), id(obj2)): MatchTable} inside a caching() block, otherwise None
+match_tables = contextvars.ContextVar("match_tables", default=None)
+
+
+@contextlib.contextmanager
+def caching():
+    """Share MatchTables between all matching calls inside the with block"""
+    token = match_tables.set({})
+    try:
+        yield
+    finally:
+        match_tables.reset(token)
+
+
+def match_table(obj1, obj2):
+    """Return MatchTable between obj1 and obj2, reusing it if it was already computed"""
+    tables = match_tables.get()
+    if tables is None:
+        return MatchTable(obj1, obj2)
+    # the table keeps references to obj1 and obj2, so their ids can't be reused while cached
+    key = (id(obj1), id(obj2))
+    if key not in tables:
+        tables[key] = MatchTable(obj1, obj2)
+    return tables[key]
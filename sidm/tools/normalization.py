@@ -0,0 +1,170 @@
+"""Module to normalize hists and cutflows to cross section times luminosity
+
+The normalization factor of a dataset is xsec*lumi/sum(genWeight), where the sum runs over every
+event of every file in the dataset. sum_of_weights computes it in a pre-pass that reads only the
+genWeight branch, opening files concurrently, and caches the sum of each file in a json file so
+that later runs (and other datasets sharing files) don't read them again. Cross sections are
+stored as "xsec" (in pb) next to the files of each sample in sidm/configs/ntuples/*.yaml.
+
+The factors can either be passed to SidmProcessor as normalization, so that hists and cutflows are
+accumulated already scaled, or applied afterwards to existing output with normalize. Either way,
+the factor only applies to genWeight-based weights: unweighted cutflow rows and the weight
+variations that count events (sidm.definitions.weights.unnormalized_variations, e.g. "unit") are
+left unscaled.
+
+Usage:
+    samples = ["TTJets", "DYJetsToMuMu_M50"]
+    fileset = utilities.make_fileset(samples, "llpNanoAOD_v2", location_cfg="backgrounds.yaml")
+    xsecs = cross_sections(samples, "llpNanoAOD_v2", location_cfg="backgrounds.yaml")
+    p = SidmProcessor(["base"], ["base"], normalization=normalization_factors(fileset, xsecs))
+"""
+
+# python
+import concurrent.futures
+import copy
+import json
+import os
+# columnar analysis
+import numpy as np
+import uproot
+# local
+from sidm import BASE_DIR
+from sidm.tools import utilities
+from sidm.definitions.weights import unnormalized_variations
+
+
+lumi_2018 = 59.83 # fb^-1
+
+default_cache = os.path.join(os.path.expanduser("~"), ".sidm", "sum_of_weights.json")
+
+
+def file_stamp(path):
+    """Return [size, modification time] of a local file, or None for remote files
+
+    Remote files are assumed to be immutable once written, as for published ntuples.
+    """
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime]
+
+
+def file_sum_of_weights(path, treepath="Events", branch="genWeight"):
+    """Return sum of branch over all entries of treepath, reading only that branch"""
+    with uproot.open(path) as root_file:
+        weights = root_file[treepath][branch].array(library="np")
+    return float(np.sum(weights, dtype=np.float64))
+
+
+def sum_of_weights(fileset, treepath="Events", branch="genWeight", workers=8,
+                   cache_path=default_cache):
+    """Return {dataset: sum of branch over all files}, reusing and updating per-file cached sums
+
+    Set cache_path to None to neither read nor write the cache.
+    """
+    cache = {}
+    if cache_path is not None and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf8") as cache_file:
+            cache = json.load(cache_file)
+
+    # key cached sums on the tree and branch as well, in case other weights are summed
+    def key(path):
+        return f"{path}:{treepath}/{branch}"
+
+    files = {f for paths in fileset.values() for f in paths}
+    todo = [f for f in files
+            if key(f) not in cache or cache[key(f)]["stamp"] != file_stamp(f)]
+    if todo:
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            sums = pool.map(lambda f: file_sum_of_weights(f, treepath, branch), todo)
+            for f, sumw in zip(todo, sums):
+                cache[key(f)] = {"sumw": sumw, "stamp": file_stamp(f)}
+        if cache_path is not None:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            # write to a temporary file first so that an interrupted write can't corrupt the cache
+            with open(f"{cache_path}.tmp", "w", encoding="utf8") as cache_file:
+                json.dump(cache, cache_file, indent=1, sort_keys=True)
+            os.replace(f"{cache_path}.tmp", cache_path)
+
+    return {dataset: sum(cache[key(f)]["sumw"] for f in paths)
+            for dataset, paths in fileset.items()}
+
+
+def cross_sections(samples, ntuple_version, location_cfg="backgrounds.yaml"):
+    """Return {sample: cross section in pb} for samples that have one in location_cfg"""
+    locations = utilities.load_yaml(f"{BASE_DIR}/configs/ntuples/{location_cfg}")[ntuple_version]
+    xsecs = {}
+    for sample in samples:
+        xsec = locations["samples"][sample].get("xsec")
+        if xsec is None:
+            print(f"Warning: no cross section for {sample} in {location_cfg}. Skipping.")
+            continue
+        xsecs[sample] = xsec
+    return xsecs
+
+
+def normalization_factors(fileset, xsecs, lumi=lumi_2018, **kwargs):
+    """Return {dataset: xsec*lumi/sum of genWeight} for datasets with a cross section
+
+    xsecs are in pb and lumi is in fb^-1. kwargs are passed to sum_of_weights.
+    """
+    datasets = {d: files for d, files in fileset.items() if d in xsecs}
+    for dataset in set(fileset) - set(datasets):
+        print(f"Warning: no cross section for {dataset}. Skipping.")
+    sumws = sum_of_weights(datasets, **kwargs)
+    factors = {}
+    for dataset, sumw in sumws.items():
+        if sumw == 0:
+            print(f"Warning: sum of weights of {dataset} is zero. Skipping.")
+            continue
+        factors[dataset] = xsecs[dataset]*1000*lumi/sumw
+    return factors
+
+
+def scale_hist(h, factor, unscaled_variations=()):
+    """Return copy of h scaled by factor, except for the bins of unscaled_variations if h has a
+    variation axis"""
+    if "variation" not in h.axes.name:
+        return h*factor
+    h = h.copy()
+    view = h.view(flow=True)
+    axis = h.axes.name.index("variation")
+    for i, variation in enumerate(h.axes["variation"]):
+        if variation in unscaled_variations:
+            continue
+        index = (slice(None),)*axis + (i,)
+        if view.dtype.names: # weight storage holds sums of weights and of squared weights
+            view["value"][index] *= factor
+            view["variance"][index] *= factor**2
+        else:
+            view[index] *= factor
+    return h
+
+
+def normalize(out, factors, unweighted=False):
+    """Return copy of processor output with hists and cutflows of each dataset scaled by its factor
+
+    For output of a processor that was run without normalization. Datasets without a factor are
+    copied unchanged, and variations that count events are left unscaled, as in SidmProcessor.
+    The output doesn't record whether hists were filled with unweighted_hist=True, so pass
+    unweighted=True for such output to leave its hists unscaled, as SidmProcessor does; hists with
+    a variation axis are scaled either way, since unweighted_hist is ignored for them.
+    """
+    normalized = {}
+    for dataset, dataset_out in out.items():
+        dataset_out = copy.deepcopy(dataset_out)
+        if dataset not in factors:
+            print(f"Warning: no normalization for {dataset}. Leaving it unnormalized.")
+            normalized[dataset] = dataset_out
+            continue
+        factor = factors[dataset]
+        dataset_out["hists"] = {
+            name: h if unweighted and "variation" not in h.axes.name
+            else scale_hist(h, factor, unnormalized_variations)
+            for name, h in dataset_out["hists"].items()
+        }
+        for cutflow in utilities.flatten(dataset_out["cutflow"]):
+            if cutflow is not None:
+                cutflow.scale(factor, unnormalized_variations)
+        normalized[dataset] = dataset_out
+    return normalized
@@ -0,0 +1,321 @@
+"""Module to convert ntuples to a Parquet store once and read it back as NanoEvents
+
+Reading ROOT ntuples is dominated by decompression, and studies reprocess the same signal samples
+many times. ParquetConverter writes every file of a fileset to its own Parquet file under
+output_dir/<dataset>/, keeping only the branches a processor can use, with one row group per
+row_group_entries events. Files are converted in parallel worker processes, and a manifest in
+output_dir records every finished file, so an interrupted conversion resumes where it stopped and
+later runs only convert new or changed files.
+
+Each column keeps its ROOT type and title, so the store has the same NanoAOD schema as the
+ntuples and SidmProcessor runs on it unchanged: FilesetPlanner and WorkUnitProcessor read any
+path ending in .parquet with events() below, which memory-maps the file and reads only the row
+groups of the requested entries. coffea's own Parquet reader can't be used, because it
+misinterprets boolean columns and entry ranges that don't start at zero.
+
+Usage:
+    converter = ParquetConverter(fileset, "/data/sidm_parquet",
+                                 branches=processor_branches(SidmProcessor(["4mu"], ["base"]),
+                                                             fileset["4Mu_500GeV_5p0GeV_0p08mm"][0]))
+    converter.run(workers=8)
+    out = FilesetPlanner(converter.parquet_fileset()).run(SidmProcessor(["4mu"], ["base"]))
+"""
+
+# python
+import concurrent.futures
+import hashlib
+import json
+import os
+# columnar analysis
+import awkward as ak
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import uproot
+from coffea.nanoevents import NanoEventsFactory, NanoAODSchema
+from coffea.nanoevents.mapping.parquet import ParquetSourceMapping, TrivialParquetOpener
+
+
+manifest_name = "parquet_manifest.json"
+
+# event identifiers and weights are kept even if the probed processor doesn't read them
+always_keep = ["run", "luminosityBlock", "event", "genWeight"]
+
+
+def file_stamp(path):
+    """Return [size, modification time] of a local file, or None for remote files"""
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime]
+
+
+def collection(branch):
+    """Return NanoAOD collection of a branch, e.g. Muon for Muon_pt and nMuon"""
+    return branch.split("_")[0]
+
+
+def expand_collections(accessed, available):
+    """Return branches of available that belong to a collection with an accessed branch
+
+    Whole collections are kept rather than only the accessed branches, since which branches are
+    read can depend on the events, e.g. when a cut short-circuits.
+    """
+    names = {collection(b) for b in accessed} | {b[1:] for b in accessed if b.startswith("n")}
+    return [b for b in available
+            if collection(b) in names or (b.startswith("n") and b[1:] in names)
+            or b in always_keep]
+
+
+def processor_branches(processor_instance, path, entry_stop=1000, treepath="Events"):
+    """Return branches of path that processor_instance reads, expanded to whole collections"""
+    access_log = []
+    with uproot.open(path) as root_file:
+        events = NanoEventsFactory.from_root(root_file, treepath=treepath, entry_stop=entry_stop,
+                                             metadata={"dataset": "probe"},
+                                             access_log=access_log).events()
+        processor_instance.process(events)
+        return expand_collections(access_log, root_file[treepath].keys())
+
+
+def arrow_column(branch, array):
+    """Return (pyarrow field, pyarrow array) of one branch, keeping its type and title"""
+    layout = ak.to_layout(array)
+    metadata = {"title": branch.title}
+    if isinstance(layout, ak.layout.NumpyArray):
+        values = np.asarray(layout)
+        return pa.field(branch.name, pa.from_numpy_dtype(values.dtype), False, metadata), \
+            pa.array(values)
+    if isinstance(layout, (ak.layout.ListOffsetArray32, ak.layout.ListOffsetArray64)) \
+            and isinstance(layout.content, ak.layout.NumpyArray):
+        offsets = np.asarray(layout.offsets)
+        values = np.asarray(layout.content)[offsets[0]:offsets[-1]]
+        offsets = (offsets - offsets[0]).astype(np.int32)
+        values_type = pa.from_numpy_dtype(values.dtype)
+        field_type = pa.list_(pa.field("item", values_type, False))
+        return pa.field(branch.name, field_type, False, metadata), \
+            pa.ListArray.from_arrays(pa.array(offsets), pa.array(values), type=field_type)
+    raise TypeError(f"{branch.name} is neither a flat nor a singly jagged numeric branch")
+
+
+def convert_file(source, output, branches, treepath="Events", row_group_entries=100000):
+    """Write branches of one ROOT file to a Parquet file and return the number of entries
+
+    The file is written to a temporary path first, so an interrupted conversion leaves no output.
+    """
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    tmp_output = f"{output}.{os.getpid()}.tmp"
+    try:
+        with uproot.open(source) as root_file:
+            tree = root_file[treepath]
+            schema_metadata = {"uuid": str(tree.file.uuid), "object_path": tree.object_path}
+            writer = None
+            for start in range(0, tree.num_entries, row_group_entries):
+                stop = min(start + row_group_entries, tree.num_entries)
+                arrays = tree.arrays(branches, entry_start=start, entry_stop=stop, how=dict)
+                fields, columns = zip(*[arrow_column(tree[b], arrays[b]) for b in branches])
+                table = pa.Table.from_arrays(list(columns),
+                                             schema=pa.schema(fields, schema_metadata))
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_output, table.schema)
+                writer.write_table(table, row_group_size=row_group_entries)
+            if writer is None:
+                # no entries; write an empty file so the manifest stays complete
+                writer = pq.ParquetWriter(tmp_output, pa.schema([]))
+            writer.close()
+            num_entries = tree.num_entries
+        os.replace(tmp_output, output)
+    finally:
+        if os.path.exists(tmp_output):
+            os.remove(tmp_output)
+    return num_entries
+
+
+def convert_job(args):
+    """Convert one file for a process pool; return (source, entries or error message)"""
+    source = args[0]
+    try:
+        return source, convert_file(*args)
+    except (OSError, KeyError, ValueError, TypeError) as e:
+        return source, f"{type(e).__name__}: {e}"
+
+
+class ParquetConverter:
+    """Class to convert a fileset to one Parquet file per ROOT file, skipping finished files"""
+
+    def __init__(self, fileset, output_dir, branches=None, treepath="Events",
+                 row_group_entries=100000):
+        self.fileset = fileset # {dataset: [ROOT files]}
+        self.output_dir = output_dir
+        # None keeps every branch
+        self.branches = branches
+        self.treepath = treepath
+        self.row_group_entries = row_group_entries
+        self.manifest_path = os.path.join(output_dir, manifest_name)
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf8") as manifest_file:
+                self.manifest = json.load(manifest_file)
+
+    def output_path(self, dataset, source):
+        """Return path of the Parquet file for one source file, relative to output_dir"""
+        stem = os.path.splitext(os.path.basename(source))[0]
+        return os.path.join(dataset, f"{stem}.parquet")
+
+    def file_branches(self, source):
+        """Return branches to convert for one file"""
+        with uproot.open(source) as root_file:
+            available = root_file[self.treepath].keys()
+        if self.branches is None:
+            return available
+        missing = [b for b in self.branches if b not in available and b not in always_keep]
+        if missing:
+            print(f"Warning: {missing} not found in {source}. Skipping these branches.")
+        return [b for b in available if b in self.branches]
+
+    def digest(self):
+        """Return hash of the settings that determine the content of every output file"""
+        settings = [self.branches, self.treepath, self.row_group_entries]
+        return hashlib.sha256(json.dumps(settings).encode()).hexdigest()
+
+    def is_done(self, dataset, source):
+        """Return True if source was converted with the current settings and hasn't changed"""
+        entry = self.manifest.get(source)
+        return (entry is not None and entry["digest"] == self.digest()
+                and entry["output"] == self.output_path(dataset, source)
+                and entry["stamp"] == file_stamp(source)
+                and os.path.exists(os.path.join(self.output_dir, entry["output"])))
+
+    def run(self, workers=1):
+        """Convert every file that isn't done yet; return {"converted", "skipped", "failed"}"""
+        todo = []
+        outputs = {}
+        for dataset, files in self.fileset.items():
+            for source in files:
+                output = self.output_path(dataset, source)
+                if outputs.setdefault(output, source) != source:
+                    raise ValueError(f"{source} and {outputs[output]} would both be written to "
+                                     f"{output}")
+                if not self.is_done(dataset, source):
+                    todo.append((dataset, source))
+        skipped = sum(len(files) for files in self.fileset.values()) - len(todo)
+
+        jobs = [(source, os.path.join(self.output_dir, self.output_path(dataset, source)),
+                 self.file_branches(source), self.treepath, self.row_group_entries)
+                for dataset, source in todo]
+        datasets = {source: dataset for dataset, source in todo}
+        failed = 0
+        if workers == 1:
+            results = map(convert_job, jobs)
+        else:
+            pool = concurrent.futures.ProcessPoolExecutor(workers)
+            results = (f.result() for f in
+                       concurrent.futures.as_completed([pool.submit(convert_job, j)
+                                                        for j in jobs]))
+        try:
+            for source, result in results:
+                if isinstance(result, str):
+                    failed += 1
+                    print(f"Warning: cannot convert {source}: {result}. Skipping.")
+                    continue
+                # record each file as soon as it is done, so that a rerun can resume
+                self.manifest[source] = {
+                    "output": self.output_path(datasets[source], source),
+                    "entries": result,
+                    "digest": self.digest(),
+                    "stamp": file_stamp(source),
+                }
+                self.save()
+        finally:
+            if workers != 1:
+                pool.shutdown()
+        return {"converted": len(todo) - failed, "skipped": skipped, "failed": failed}
+
+    def save(self):
+        """Write the manifest"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        # write to a temporary file first so that an interrupted write can't corrupt the manifest
+        with open(f"{self.manifest_path}.tmp", "w", encoding="utf8") as manifest_file:
+            json.dump(self.manifest, manifest_file, indent=1, sort_keys=True)
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+    def parquet_fileset(self):
+        """Return {dataset: [Parquet files]} of the converted files, in the order of the fileset"""
+        return {
+            dataset: [os.path.join(self.output_dir, self.manifest[f]["output"]) for f in files
+                      if self.is_done(dataset, f)]
+            for dataset, files in self.fileset.items()
+        }
+
+
+class ParquetColumnSource:
+    """Memory-mapped Parquet file that reads one column for a range of entries at a time"""
+
+    def __init__(self, path):
+        self.file = pq.ParquetFile(path, memory_map=True)
+        metadata = self.file.metadata
+        # first entry of every row group, and the entry after the last one
+        self.boundaries = np.cumsum([0] + [metadata.row_group(i).num_rows
+                                           for i in range(metadata.num_row_groups)])
+        self.column_index = {name: i for i, name in enumerate(self.file.schema_arrow.names)}
+        self.num_requested_bytes = 0
+        self.num_requests = 0
+
+    @property
+    def num_entries(self):
+        """Number of entries in the file"""
+        return int(self.boundaries[-1])
+
+    @property
+    def uuid(self):
+        """uuid of the ROOT file that was converted"""
+        metadata = self.file.schema_arrow.metadata or {}
+        return metadata.get(b"uuid", b"None").decode()
+
+    def read(self, name, entry_start, entry_stop):
+        """Return awkward array of one column for entries [entry_start, entry_stop)"""
+        first = int(np.searchsorted(self.boundaries, entry_start, side="right")) - 1
+        last = int(np.searchsorted(self.boundaries, entry_stop, side="left"))
+        row_groups = list(range(max(first, 0), last))
+        self.num_requests += 1
+        self.num_requested_bytes += sum(
+            self.file.metadata.row_group(i).column(self.column_index[name]).total_compressed_size
+            for i in row_groups
+        )
+        offset = int(self.boundaries[row_groups[0]]) if row_groups else 0
+        column = self.file.read_row_groups(row_groups, columns=[name], use_threads=False)
+        column = column.column(0).combine_chunks()
+        column = column.slice(entry_start - offset, entry_stop - entry_start)
+
+        if isinstance(column, pa.ListArray):
+            offsets = column.offsets.to_numpy().astype(np.int64)
+            values = column.flatten().to_numpy(zero_copy_only=False)
+            layout = ak.layout.ListOffsetArray64(ak.layout.Index64(offsets - offsets[0]),
+                                                 ak.layout.NumpyArray(values))
+        else:
+            layout = ak.layout.NumpyArray(column.to_numpy(zero_copy_only=False))
+        return ak.Array(layout)
+
+
+class ParquetColumnMapping(ParquetSourceMapping): # pylint: disable=abstract-method
+    """NanoEvents column source that reads columns of a ParquetColumnSource"""
+
+    def get_column_handle(self, columnsource, name):
+        return columnsource, name
+
+    def extract_column(self, columnhandle, start, stop):
+        columnsource, name = columnhandle
+        return columnsource.read(name, start, stop)
+
+
+def events(source, treepath="Events", entry_start=0, entry_stop=None,
+           schemaclass=NanoAODSchema, metadata=None, access_log=None):
+    """Return NanoEvents of a ParquetColumnSource, as NanoEventsFactory.from_root does for ROOT"""
+    entry_stop = source.num_entries if entry_stop is None else min(entry_stop, source.num_entries)
+    partition_key = (source.uuid, treepath, f"{entry_start}-{entry_stop}")
+    mapping = ParquetColumnMapping(TrivialParquetOpener({}), cache={}, access_log=access_log)
+    mapping.preload_column_source(partition_key[0], partition_key[1], source)
+    # pylint: disable=protected-access
+    base_form = mapping._extract_base_form(source.file.schema_arrow)
+    return NanoEventsFactory._from_mapping(mapping, partition_key, base_form, None, None,
+                                           schemaclass, metadata).events()
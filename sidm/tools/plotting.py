@@ -0,0 +1,64 @@
+"""Module to define plotting helper methods
+
+These are kept separate from utilities so that processing code (e.g. on Dask workers) doesn't pay
+the cost of importing matplotlib and mplhep. They remain accessible as utilities.<name>.
+"""
+
+import hist
+import hist.intervals
+import matplotlib.pyplot as plt
+import mplhep as hep
+
+def set_plot_style(style='cms', dpi=50):
+    """Set plotting style using mplhep"""
+    if style == 'cms':
+        plt.style.use(hep.style.CMS)
+    else:
+        raise NotImplementedError
+    plt.rcParams['figure.dpi'] = dpi
+
+def plot(hists, skip_label=False, **kwargs):
+    """Plot using hep.hist(2d)plot and add cms labels"""
+
+    # set default arguments
+    default_kwargs = {
+        'flow': "sum",
+    }
+    kwargs = {**default_kwargs, **kwargs}
+
+    dim = len(hists[0].axes) if isinstance(hists, list) else len(hists.axes)
+    if dim == 1:
+        h = hep.histplot(hists, **kwargs)
+    elif dim == 2:
+        h = hep.hist2dplot(hists, **kwargs)
+    else:
+        raise NotImplementedError(f"Cannot plot {dim}-dimensional hist")
+    if not skip_label:
+        hep.cms.label()
+    return h
+
+def get_eff_hist(num_hist, denom_hist):
+    """Returns the histogram of num_hist/denom_hist and a 2D numpy array of the up/down errors on the efficiency. Plot the errors using yerr=errors when plotting. """
+    denom_vals  = denom_hist.values()
+    num_vals   = num_hist.values()
+
+    errors = hist.intervals.ratio_uncertainty(num_vals,denom_vals,'efficiency')
+    eff_values = num_vals/denom_vals
+
+    eff_hist = hist.Hist(*num_hist.axes)
+    eff_hist.values()[:] = eff_values
+    return eff_hist, errors
+
+def plot_ratio(num, den, **kwargs):
+    plt.subplots(2, 1, figsize=(10, 10), sharex=True,
+                      gridspec_kw={'height_ratios': [2, 1],'hspace':0})
+    plt.subplot(2, 1, 1)
+    plot(num, flow='none')
+    plot(den, flow='none')
+    if "legend" in kwargs:
+        plt.legend(kwargs["legend"])
+    plt.subplot(2, 1, 2)
+    eff, errors = get_eff_hist(num, den)
+    plot(eff,yerr=errors,skip_label=True,color="black")
+    plt.ylabel("Efficiency")
+    plt.ylim(0, 1.2)
@@ -0,0 +1,103 @@
+"""Module to scan cut thresholds in a single pass with cumulative histograms
+
+A Scan declares a variable and a grid of thresholds instead of one hand-written cut per threshold.
+SidmProcessor fills one histogram per scan whose bin edges are the thresholds, and the number of
+events passing "var < t" (keep="below") or "var >= t" (keep="above") at every threshold t follows
+exactly from cumulative sums over those bins, so an N-point scan costs one fill rather than N
+selections and N reruns.
+
+Variables that return one value per object (e.g. lxy of every genA) are reduced to one value per
+event that decides whether at least min_count objects pass: the min_count-th smallest value for
+keep="below" and the min_count-th largest for keep="above". Events with fewer objects are kept in
+the denominator and never pass.
+"""
+
+# columnar analysis
+import numpy as np
+import awkward as ak
+import hist
+from tabulate import tabulate
+# local
+from sidm.tools.histogram import Histogram, Axis, select_for_yields
+
+
+class Scan:
+    """Class to represent a variable and the thresholds at which a cut on it is evaluated"""
+
+    def __init__(self, var, thresholds, keep="below", min_count=1, label=None):
+        if keep not in ("below", "above"):
+            raise ValueError(f"Unknown keep option {keep}. Options are below, above")
+        edges = np.unique(thresholds)
+        if len(edges) < 2:
+            raise ValueError("A scan needs at least two distinct thresholds")
+        self.var = var
+        self.thresholds = edges
+        self.keep = keep
+        self.min_count = min_count
+        self.label = label
+
+    def histogram(self, name):
+        """Return Histogram of the per-event scan variable with the thresholds as bin edges"""
+        # bind attributes locally so that dependency analysis sees the variable definition
+        var = self.var
+        keep = self.keep
+        min_count = self.min_count
+
+        def f(objs, mask):
+            vals = var(objs)[mask]
+            if vals.ndim > 1:
+                vals = ak.sort(vals, ascending=keep == "below")
+                vals = ak.pad_none(vals, min_count, axis=1)[:, min_count - 1]
+            # events without a value fall in the flow bin that never passes
+            return ak.fill_none(vals, np.inf if keep == "below" else -np.inf)
+
+        axis = hist.axis.Variable(self.thresholds, name=name, label=self.label or name)
+        return Histogram([Axis(axis, f)])
+
+    def results(self, h, variation="nominal", **selection):
+        """Return {"thresholds", "n_pass", "n_pass_err", "n_total", "efficiency"} from a scan hist
+
+        All axes other than the scan axis are summed over after applying selection and choosing
+        variation if h has a variation axis, e.g. scan.results(h, channel="4mu"). If h has an
+        lj_reco axis, one lj_reco must be selected.
+        """
+        h = select_for_yields(h, variation, **selection)
+        h = h.project(h.axes[-1].name)
+        view = h.view(flow=True)
+        values = view.value if h.storage_type is hist.storage.Weight else view
+        variances = view.variance if h.storage_type is hist.storage.Weight else view
+
+        # flow bins are [underflow, bins, overflow], so threshold i separates flow bins i and i+1
+        cum_values = np.cumsum(values)
+        cum_variances = np.cumsum(variances)
+        n_total = cum_values[-1]
+        if self.keep == "below":
+            n_pass = cum_values[:-1]
+            var_pass = cum_variances[:-1]
+        else:
+            n_pass = n_total - cum_values[:-1]
+            var_pass = cum_variances[-1] - cum_variances[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiency = n_pass/n_total
+        return {
+            "thresholds": self.thresholds,
+            "n_pass": n_pass,
+            "n_pass_err": np.sqrt(var_pass),
+            "n_total": n_total,
+            "efficiency": efficiency,
+        }
+
+    def print_table(self, h, channels, variation="nominal", **selection):
+        """Print pass yield and efficiency at each threshold for each channel"""
+        results = [self.results(h, variation, channel=c, **selection) for c in channels]
+        op = "<" if self.keep == "below" else ">="
+        headers = ["threshold"]
+        for channel in channels:
+            headers += [f"{channel} N", f"{channel} eff"]
+        rows = []
+        for i, threshold in enumerate(self.thresholds):
+            row = [f"{op} {threshold:g}"]
+            for result in results:
+                row += [result["n_pass"][i], result["efficiency"][i]]
+            rows.append(row)
+        print(tabulate(rows, headers, floatfmt=".3g"))
@@ -1,9 +1,15 @@
-"""Module to define the Selection and JaggedSelection classes"""
+"""Module to define the Selection, JaggedSelection, JaggedPackedSelection, EvtCutCache, and
+SelectionTree classes"""
 
+# python
+import collections.abc
+import time
 # columnar analysis
+import numpy as np
+import awkward as ak
 from coffea.analysis_tools import PackedSelection
 # local
-from sidm.definitions.cuts import evt_cut_defs, obj_cut_defs
+from sidm.tools import cut_expr
 
 
 class Selection:
@@ -13,95 +19,233 @@ class Selection:
     Cuts are stored as a PackedSelection.
 
     All available cuts are defined in sidm.definitions.cuts. The specific cuts that define each
-    selection are accepted by Selection() as lists of strings.
+    selection are accepted by Selection() as lists of strings. Cuts that aren't defined there are
+    compiled as expressions (see cut_expr).
+
+    If an EvtCutCache is provided, cuts are looked up there before being evaluated, so that
+    Selections of different channels share the results of cuts on identical collections.
+
+    If cascade is True, each cut is only evaluated on the events that passed all preceding cuts and
+    is recorded as failed for all other events. The cumulative result of every cut is unchanged,
+    but the individual result of all cuts after the first is not available. If stats is given,
+    the time spent in each cut and the number of events it was evaluated on and passed are added
+    to stats[cut] (see order_by_cost).
     """
 
-    def __init__(self, cuts, verbose=False):
+    def __init__(self, cuts, verbose=False, cache=None, cascade=False, stats=None):
         self.evt_cuts = cuts # list of names of cuts to be applied
         self.all_evt_cuts = PackedSelection() # will be filled later when cuts are evaluated
         self.verbose = verbose
+        self.cache = cache
+        self.cascade = cascade
+        self.stats = stats
+        # subexpressions of expression cuts are shared between all cuts of the chunk
+        self.expr_memo = cache.expr_memo if cache is not None else {}
 
-    def apply_evt_cuts(self, objs):
-        """Evaluate all event cuts and apply results to object collections"""
-
-        # evaluate all selected cuts
+    def evaluate_evt_cuts(self, objs):
+        """Evaluate all event cuts without applying them"""
+        if self.cascade:
+            self.evaluate_evt_cuts_in_cascade(objs)
+            return
         for cut in self.evt_cuts:
             if self.verbose:
                 print("Applying cut:", cut)
             try:
-                self.all_evt_cuts.add(cut, evt_cut_defs[cut](objs))
+                if self.cache is None:
+                    self.all_evt_cuts.add(cut, cut_expr.evaluate(cut_expr.evt_cut_def(cut), objs,
+                                                                 self.expr_memo))
+                else:
+                    self.all_evt_cuts.add(cut, self.cache.evaluate(cut, objs))
             except:
                 print(f"Warning: Unable to evaluate {cut} Skipping.")
 
-        # apply event cuts to object collections
-        sel_objs = {}
-        for name, obj in objs.items():
+    def evaluate_evt_cuts_in_cascade(self, objs):
+        """Evaluate each event cut only on events that passed all preceding cuts"""
+        alive = None # mask of events that passed all cuts so far
+        for cut in self.evt_cuts:
+            if self.verbose:
+                print("Applying cut:", cut)
             try:
-                sel_objs[name] = obj[self.all_evt_cuts.all(*self.evt_cuts)]
-            except:
+                start = time.perf_counter()
+                if alive is None:
+                    if self.cache is None:
+                        result = cut_expr.evaluate(cut_expr.evt_cut_def(cut), objs, self.expr_memo)
+                    else:
+                        result = self.cache.evaluate(cut, objs)
+                    result = ak.to_numpy(ak.fill_none(result, False))
+                    passed = result
+                else:
+                    result = cut_expr.evaluate(cut_expr.evt_cut_def(cut), MaskedObjs(objs, alive),
+                                               self.expr_memo)
+                    passed = np.zeros(len(alive), dtype=bool)
+                    passed[alive] = ak.to_numpy(ak.fill_none(result, False))
+                elapsed = time.perf_counter() - start
+                self.all_evt_cuts.add(cut, passed)
+            except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+                print(f"Warning: Unable to evaluate {cut} Skipping.")
+                continue
+
+            if self.stats is not None:
+                cut_stats = self.stats.setdefault(cut, {"seconds": 0.0, "n_evaluated": 0,
+                                                        "n_passed": 0})
+                cut_stats["seconds"] += elapsed
+                cut_stats["n_evaluated"] += len(result)
+                cut_stats["n_passed"] += int(np.count_nonzero(passed))
+            alive = passed if alive is None else alive & passed
+
+    def apply_evt_cuts(self, objs):
+        """Evaluate all event cuts and apply results to object collections"""
+
+        # evaluate all selected cuts
+        self.evaluate_evt_cuts(objs)
+
+        # apply event cuts to object collections, deferring the work until each is used
+        try:
+            evt_mask = self.all_evt_cuts.all(*self.evt_cuts)
+        except:
+            for name in objs:
                 print(f"Warning: Unable to apply event cuts to {name}. Skipping.")
-        return sel_objs
+            return {}
+        return MaskedObjs(objs, evt_mask)
+
+
+def order_by_cost(cuts, stats):
+    """Return cuts ordered to minimize the cost of evaluating them in cascade
+
+    Cuts are sorted by their cost per evaluated event divided by the fraction of events they
+    reject, as measured in stats (see Selection), which is optimal for independent cuts. Cuts
+    without stats or that rejected no events keep their relative order after all other cuts.
+    Reordering assumes that no cut relies on a preceding cut, e.g. to guarantee that a collection
+    is not empty.
+    """
+    def rank(cut):
+        cut_stats = stats.get(cut)
+        if not cut_stats or cut_stats["n_evaluated"] == 0:
+            return float("inf")
+        cost = cut_stats["seconds"]/cut_stats["n_evaluated"]
+        rejection = 1 - cut_stats["n_passed"]/cut_stats["n_evaluated"]
+        return cost/rejection if rejection > 0 else float("inf")
+    return sorted(cuts, key=rank)
+
+
+class MaskedObjs(collections.abc.MutableMapping):
+    """Object dictionary with an event mask applied to each collection when it is first used
+
+    Applying the event mask to every collection of a channel is wasteful when only a few of them
+    are read by hists and counters, so the mask is only applied to a collection when it is first
+    looked up, and the masked collection is cached. Values that are set after creation, e.g. the
+    channel name, are stored as given.
+    """
+
+    def __init__(self, objs, mask):
+        self.objs = objs
+        self.mask = mask
+        self.names = list(objs)
+        self.masked = {}
+
+    def __getitem__(self, name):
+        if name not in self.masked:
+            if name not in self.names:
+                raise KeyError(name)
+            try:
+                self.masked[name] = self.objs[name][self.mask]
+            except Exception as e:
+                print(f"Warning: Unable to apply event cuts to {name}. Skipping.")
+                raise KeyError(name) from e
+        return self.masked[name]
+
+    def __setitem__(self, name, value):
+        if name not in self.names:
+            self.names.append(name)
+        self.masked[name] = value
+
+    def __delitem__(self, name):
+        self.names.remove(name)
+        self.masked.pop(name, None)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
 
 
 class JaggedSelection:
     """Class to represent the collection of cuts that define a JaggedSelection
 
     A JaggedSelection consists of object-level cuts (for example, electron or lepton-jet-level cuts).
-    Object-level cuts slim object collections and are stored as a dictionary of masks.
+    Object-level cuts slim object collections and are stored as a JaggedPackedSelection, so that
+    the mask for any subset of cuts on a collection is a single bitwise test.
 
     All available cuts are defined in sidm.definitions.cuts. The specific cuts that define each
-    selection are accepted by JaggedSelection() as lists of strings.
+    selection are accepted by JaggedSelection() as lists of strings. Cuts that aren't defined there
+    are compiled as expressions (see cut_expr), which share subexpressions within each call of
+    evaluate_obj_cuts.
     """
 
     def __init__(self, cuts, verbose=False):
         self.obj_cuts = cuts # dict of names of cuts to be applied
-        self.evaluated_obj_cuts = {}
+        self.evaluated_obj_cuts = JaggedPackedSelection()
         self.verbose = verbose
+        # masks and masked collections are reused by channels that share the same cuts, so that
+        # shared collections keep the same identity (see EvtCutCache)
+        self.masks = {} # (obj, cuts): mask
+        self.masked_objs = {} # (id(collection), id(mask)): (collection, mask, masked collection)
 
     def evaluate_obj_cuts(self, objs):
         """Evaluate all relevant object-level cuts that have not already been evaluated"""
+        expr_memo = {}
         for obj, cuts in self.obj_cuts.items():
             if obj not in objs:
                 print(f"Warning: {obj} not found in sample. "
                       f"The following cuts will not be applied: {cuts}")
                 continue
-            if obj not in self.evaluated_obj_cuts:
-                self.evaluated_obj_cuts[obj] = {}
+            counts = object_counts(objs[obj])
             for cut in cuts:
-                if cut not in self.evaluated_obj_cuts[obj]:
+                if not self.evaluated_obj_cuts.contains(obj, cut):
                     if self.verbose:
                         print(f"Evaluating {obj} {cut}")
                     try:
-                        self.evaluated_obj_cuts[obj][cut] = obj_cut_defs[obj][cut](objs)
-                    except:
-                        print(f"Warning: Unable to apply {cut} for {obj}. Skipping.")
+                        result = cut_expr.evaluate(cut_expr.obj_cut_def(obj, cut), objs, expr_memo)
+                        self.evaluated_obj_cuts.add(obj, cut, result, counts)
+                    except (AttributeError, IndexError, KeyError, TypeError, ValueError,
+                            RuntimeError) as e:
+                        print(f"Warning: Unable to apply {cut} for {obj}: {e}. Skipping.")
 
     def make_obj_masks(self, channel_cut_list):
         """Create one mask per object, using the subset of cuts specified in channel_cut_list"""
         obj_masks = {}
         for obj, cuts in channel_cut_list.items():
-            if obj not in self.evaluated_obj_cuts:
+            if obj not in self.evaluated_obj_cuts.names:
                 print(f"Warning: {obj} not found in sample. "
                       f"The following cuts will not be applied: {cuts}")
                 continue
+            mask_cuts = []
             for cut in cuts:
-                if cut not in self.evaluated_obj_cuts[obj]:
+                if not self.evaluated_obj_cuts.contains(obj, cut):
                     print(f"Uh oh, haven't evaluated this cut yet! Make sure it was included in the list of cuts you used to initialize this JaggedSelection. {obj}: {cut}")
                 else:
                     if self.verbose:
                         print(f"Adding the following cut on {obj} to the mask: {cut}")
-                    if obj not in obj_masks:
-                        obj_masks[obj] = self.evaluated_obj_cuts[obj][cut]
-                    else:
-                        obj_masks[obj] = obj_masks[obj] & self.evaluated_obj_cuts[obj][cut]
+                    mask_cuts.append(cut)
+            if mask_cuts:
+                key = (obj, tuple(mask_cuts))
+                if key not in self.masks:
+                    self.masks[key] = self.evaluated_obj_cuts.all(obj, *mask_cuts)
+                obj_masks[obj] = self.masks[key]
         return obj_masks
-
     def apply_obj_masks(self, objs, obj_masks):
         """Filter object collections based on object masks """
         sel_objs = {}
         for name, obj in objs.items():
             # filter objects if mask exists, return collection unfiltered if mask does not exist
-            sel_objs[name] = obj[obj_masks[name]] if name in obj_masks else obj
+            if name in obj_masks:
+                key = (id(obj), id(obj_masks[name]))
+                if key not in self.masked_objs:
+                    self.masked_objs[key] = (obj, obj_masks[name], obj[obj_masks[name]])
+                sel_objs[name] = self.masked_objs[key][2]
+            else:
+                sel_objs[name] = obj
 
             if self.verbose:
                 if name in obj_masks:
@@ -114,4 +258,273 @@ class JaggedSelection:
         return sel_objs
 
     def make_and_apply_obj_masks(self, objs, channel_cut_list):
+        """Create object masks and filter object collections with them"""
         return self.apply_obj_masks(objs, self.make_obj_masks(channel_cut_list))
+
+
+def object_counts(collection):
+    """Return numpy array of objects per event of a jagged collection, or None if it has one entry
+    per event"""
+    if collection.ndim < 2:
+        return None
+    return ak.to_numpy(ak.fill_none(ak.num(collection, axis=1), 0))
+
+
+class JaggedPackedSelection:
+    """Class to store the results of object-level cuts as bits of one uint64 per object
+
+    This is the object-level counterpart of coffea's PackedSelection: the boolean results of up to
+    64 cuts on one collection are packed into a flat array of uint64 words, one word per object,
+    that shares the collection's offsets. The mask for any subset of cuts is then a single bitwise
+    comparison against a precomputed bit pattern instead of a chain of jagged ANDs.
+
+    Cut results may be one-dimensional (one value per event) or jagged (one value per object). As
+    when ANDing the original arrays, one-per-event results apply to every object of the event once
+    the collection is known to be jagged. Results may contain None, e.g. dR-based cuts for objects
+    with no partner. None entries are recorded in a second word per object so that masks made from
+    such cuts contain None exactly where ANDing the original arrays would have. Missing lists, i.e.
+    events without any result, are filled with False for every object of the event.
+    """
+
+    max_cuts = 64
+
+    def __init__(self):
+        self.names = {} # obj: list of cut names; bit i of the words of obj holds names[obj][i]
+        self.counts = {} # obj: numpy array of objects per event, or None for one-per-event masks
+        self.words = {} # obj: flat uint64 array with one word per object
+        self.missing = {} # obj: flat uint64 array; bit i is set where cut i is None
+        self.optional = {} # obj: bit pattern of cuts whose results have option type
+
+    def contains(self, obj, cut):
+        """Return True if cut has already been added for obj"""
+        return cut in self.names.get(obj, [])
+
+    def add(self, obj, cut, mask, counts=None):
+        """Store mask, a boolean array with one entry per object or per event of obj, as the result
+        of cut
+
+        counts is the number of objects of obj per event, if obj is jagged. It is needed to pack
+        masks with missing lists, and otherwise taken from the first jagged mask.
+        """
+        mask = ak.Array(mask)
+        if self.contains(obj, cut):
+            raise ValueError(f"Cut {cut} has already been added for {obj}")
+        if len(self.names.get(obj, [])) == self.max_cuts:
+            raise RuntimeError(f"JaggedPackedSelection only supports up to {self.max_cuts} cuts "
+                               f"per collection; cannot add {cut} for {obj}")
+        if self.counts.get(obj) is not None:
+            if counts is not None and not np.array_equal(counts, self.counts[obj]):
+                raise ValueError(f"Cannot pack {cut} for {obj}: counts do not match previous "
+                                 f"cuts {self.names[obj]}")
+            counts = self.counts[obj]
+
+        passes, is_none, counts, optional = self.flatten(obj, cut, mask, counts)
+
+        if obj not in self.names:
+            self.names[obj] = []
+            self.counts[obj] = counts
+            self.words[obj] = np.zeros(len(passes), dtype=np.uint64)
+            self.missing[obj] = np.zeros(len(passes), dtype=np.uint64)
+            self.optional[obj] = np.uint64(0)
+        elif self.counts[obj] is None and counts is not None:
+            # previous cuts have one result per event, which applies to every object of the event
+            self.words[obj] = np.repeat(self.words[obj], counts)
+            self.missing[obj] = np.repeat(self.missing[obj], counts)
+            self.counts[obj] = counts
+        if len(passes) != len(self.words[obj]):
+            raise ValueError(f"Cannot pack {cut} for {obj}: mask structure does not match "
+                             f"previous cuts {self.names[obj]}")
+
+        bit = np.uint64(1) << np.uint64(len(self.names[obj]))
+        self.words[obj][passes] |= bit
+        self.missing[obj][is_none] |= bit
+        if optional:
+            self.optional[obj] |= bit
+        self.names[obj].append(cut)
+
+    @staticmethod
+    def flatten(obj, cut, mask, counts=None):
+        """Return (passes, is_none, counts, optional) of mask, where passes and is_none are flat
+        numpy arrays with one entry per object if counts is given or mask is jagged, and one entry
+        per event otherwise, and optional is True if the results have option type"""
+        if mask.ndim == 1:
+            is_none = ak.to_numpy(ak.is_none(mask))
+            passes = ak.to_numpy(ak.fill_none(mask, False)).astype(bool)
+            if counts is not None:
+                is_none = np.repeat(is_none, counts)
+                passes = np.repeat(passes, counts)
+            return passes, is_none, counts, isinstance(ak.type(mask).type, ak.types.OptionType)
+        if mask.ndim != 2:
+            raise ValueError(f"Cannot pack {cut} for {obj}: mask has {mask.ndim} dimensions")
+
+        missing_lists = ak.to_numpy(ak.is_none(mask))
+        mask_counts = ak.to_numpy(ak.fill_none(ak.num(mask, axis=1), 0))
+        if counts is None:
+            if missing_lists.any():
+                raise ValueError(f"Cannot pack {cut} for {obj}: mask has missing lists and the "
+                                 f"number of objects per event is unknown")
+            counts = mask_counts
+        elif (len(mask_counts) != len(counts)
+              or not np.array_equal(mask_counts[~missing_lists], counts[~missing_lists])):
+            raise ValueError(f"Cannot pack {cut} for {obj}: mask structure does not match the "
+                             f"number of objects per event")
+
+        if missing_lists.any():
+            content = ak.flatten(mask[~missing_lists], axis=1)
+        else:
+            content = ak.flatten(mask, axis=1)
+        content_is_none = ak.to_numpy(ak.is_none(content))
+        content_passes = ak.to_numpy(ak.fill_none(content, False)).astype(bool)
+        optional = isinstance(ak.type(content).type, ak.types.OptionType)
+        if not missing_lists.any():
+            return content_passes, content_is_none, counts, optional
+
+        # objects of events with missing lists fail the cut
+        present = ~np.repeat(missing_lists, counts)
+        passes = np.zeros(len(present), dtype=bool)
+        is_none = np.zeros(len(present), dtype=bool)
+        passes[present] = content_passes
+        is_none[present] = content_is_none
+        return passes, is_none, counts, optional
+
+    def pattern(self, obj, *cuts):
+        """Return the bit pattern that selects cuts for obj"""
+        pattern = np.uint64(0)
+        for cut in cuts:
+            pattern |= np.uint64(1) << np.uint64(self.names[obj].index(cut))
+        return pattern
+
+    def all(self, obj, *cuts):
+        """Return mask of objects of obj that pass all cuts, with the structure of the cut results"""
+        pattern = self.pattern(obj, *cuts)
+        mask = ak.Array((self.words[obj] & pattern) == pattern)
+        if self.optional[obj] & pattern:
+            mask = ak.mask(mask, (self.missing[obj] & pattern) == 0)
+        if self.counts[obj] is not None:
+            mask = ak.unflatten(mask, self.counts[obj])
+        return mask
+
+
+class ReadRecorder(collections.abc.Mapping):
+    """Read-only view of an object dictionary that records which collections are looked up"""
+
+    def __init__(self, objs):
+        self.objs = objs
+        self.reads = []
+
+    def __getitem__(self, name):
+        if name not in self.reads:
+            self.reads.append(name)
+        return self.objs[name]
+
+    def __contains__(self, name):
+        if name not in self.reads:
+            self.reads.append(name)
+        return name in self.objs
+
+    def __iter__(self):
+        return iter(self.objs)
+
+    def __len__(self):
+        return len(self.objs)
+
+
+class EvtCutCache:
+    """Class to share evaluated event-level cuts between the Selections of one chunk
+
+    Results are keyed on the cut name and the identity of the collections the cut reads, so a cut
+    is only evaluated once for all channels whose objs share those collections, e.g. "pass
+    triggers" reads hlt, which is never masked. The collections a cut reads are recorded the first
+    time it is evaluated. Cached entries keep references to the collections they were computed
+    from, so their ids cannot be reused by other arrays while the cache exists. Create one
+    EvtCutCache per chunk.
+    """
+
+    def __init__(self):
+        self.reads = {} # cut name: names of collections read by the cut
+        self.results = {} # (cut name, collection ids): (collections, result)
+        self.expr_memo = {} # shared subexpressions of expression cuts; see cut_expr
+
+    def key(self, cut, objs):
+        """Return the cache key of cut for objs and the collections it is computed from"""
+        inputs = tuple(objs.get(name) for name in self.reads[cut])
+        return (cut, tuple(id(c) for c in inputs)), inputs
+
+    def evaluate(self, cut, objs):
+        """Return the result of cut on objs, evaluating it only if it hasn't been evaluated for the
+        same collections yet"""
+        cut_def = cut_expr.evt_cut_def(cut)
+        if cut not in self.reads:
+            recorder = ReadRecorder(objs)
+            result = cut_expr.evaluate(cut_def, recorder, self.expr_memo)
+            self.reads[cut] = recorder.reads
+            key, inputs = self.key(cut, objs)
+            self.results[key] = (inputs, result)
+            return result
+        key, inputs = self.key(cut, objs)
+        if key not in self.results:
+            self.results[key] = (inputs, cut_expr.evaluate(cut_def, objs, self.expr_memo))
+        return self.results[key][1]
+
+
+class SelectionNode:
+    """Class to represent one processing stage shared by all channels below it in a SelectionTree"""
+
+    def __init__(self, cuts):
+        self.cuts = cuts # cuts applied at this stage, or the lj_reco choice for clustering stages
+        self.children = {} # stage key: SelectionNode
+        self.channels = [] # (channel, lj_reco) pairs whose last shared stage is this one
+
+    def child(self, key, cuts):
+        """Return the child with the given key, creating it if needed"""
+        if key not in self.children:
+            self.children[key] = SelectionNode(cuts)
+        return self.children[key]
+
+
+class SelectionTree:
+    """Class to arrange channels into a prefix tree of processing stages
+
+    Most selections extend a few common ones, so many channels share their pre-LJ object cuts,
+    lepton jet clustering, and LJ and post-LJ object cuts. Each level of the tree holds one of
+    these stages, in the order in which SidmProcessor runs them, and channels with identical
+    stages share a node, so each shared stage only needs to be run once. Channels branch off below
+    the post-LJ object cut stage, where their event cuts are applied; evaluated event cuts are
+    shared separately through EvtCutCache.
+
+    Stage keys are built from sorted cut lists so that channels listing the same collections in a
+    different order still share a node.
+
+    Channels that are not in lj_channels never read lepton jets, so their clustering stage is None
+    and they share a single path through the tree for all lj_reco choices.
+    """
+
+    stages = ["obj", "lj_reco", "lj", "postLj_obj"]
+
+    def __init__(self, ch_cuts, lj_reco_choices, lj_channels=None):
+        self.root = SelectionNode(None)
+        for channel, cuts in ch_cuts.items():
+            uses_ljs = lj_channels is None or channel in lj_channels
+            for lj_reco in lj_reco_choices:
+                node = self.root
+                for stage in self.stages:
+                    if stage == "lj_reco":
+                        stage_cuts = lj_reco if uses_ljs else None
+                    else:
+                        stage_cuts = cuts[stage]
+                    node = node.child(self.key(stage_cuts), stage_cuts)
+                node.channels.append((channel, lj_reco))
+
+    @staticmethod
+    def key(stage_cuts):
+        """Return hashable key that is identical for identical stages"""
+        if isinstance(stage_cuts, dict):
+            return tuple(sorted((obj, tuple(cuts)) for obj, cuts in stage_cuts.items()))
+        return stage_cuts
+
+    def count(self, stage):
+        """Return the number of distinct nodes at a given stage"""
+        nodes = [self.root]
+        for _ in range(self.stages.index(stage) + 1):
+            nodes = [c for n in nodes for c in n.children.values()]
+        return len(nodes)
@@ -5,6 +5,7 @@ import copy
 import numpy as np
 # columnar analysis
 from coffea import processor
+from coffea.analysis_tools import PackedSelection
 from coffea.nanoevents.methods import nanoaod
 from coffea.nanoevents.methods import vector as cvec
 import awkward as ak
@@ -12,9 +13,13 @@ import fastjet
 import vector
 #local
 from sidm import BASE_DIR
-from sidm.tools import selection, cutflow, utilities
+from sidm.tools import selection, cutflow, utilities, matching
+from sidm.tools.dependencies import collections_read
+from sidm.definitions.cuts import obj_cut_defs, evt_cut_defs
 from sidm.definitions.hists import hist_defs, counter_defs
 from sidm.definitions.objects import preLj_objs, postLj_objs
+from sidm.definitions.weights import weight_defs, unnormalized_variations
+from sidm.definitions.scans import scan_defs
 
 class SidmProcessor(processor.ProcessorABC):
     """Class to apply selections, make histograms, and make cutflows
@@ -23,6 +28,50 @@ class SidmProcessor(processor.ProcessorABC):
     chosen by supplying a list of selection names (as defined in selections.yaml), and histograms
     are chosen by providing a list of histogram collection names (as definined in
     hist_collections.yaml).
+
+    If profile is True, the wall time spent in each processing stage is added to the output under
+    "timing" as {stage: seconds}, summed over all chunks.
+
+    If pushdown is True, the leading event cuts that every channel shares and that only read pre-LJ
+    collections with the same object cuts in every channel (e.g. "pass triggers" and "PV filter")
+    are applied before any other object is built, so that clustering and everything else only run
+    on events that pass them. Cutflow "No selection" and cumulative numbers are unchanged, while
+    individual numbers are dropped as in cascade mode, because later cuts are never evaluated on
+    the events removed by the pushed-down cuts.
+
+    If cascade is True, each event cut is only evaluated on events that passed all preceding cuts
+    of the channel, so expensive cuts late in the list run on few events. Cumulative cutflow
+    numbers are unchanged, while individual numbers are dropped. The time spent in each cut and
+    its pass rate are added to the output under "evt_cut_stats". Passing these stats from a previous
+    run as evt_cut_stats reorders each channel's cuts so that cheap cuts that reject many events
+    come first (see selection.order_by_cost). Cutflow rows then follow the new order, because the
+    cumulative numbers of the listed order cannot be recovered from a reordered cascade.
+
+    weight_variations fills hists and cutflows for several per-event weights in one pass. It is
+    either a list of names from sidm.definitions.weights (e.g. ["nominal", "unit"]) or a dict of
+    {name: function of events that returns per-event weights}, e.g. for systematic up/down
+    variations. All hists then gain a "variation" axis, and cutflows keep rows per variation
+    (see Cutflow). unweighted_hist is ignored in this case; use the "unit" variation instead.
+
+    abcd takes an abcd.ABCD that defines two discriminating variables and their boundaries. Every
+    event is then assigned to one of the regions A-D, all hists gain a "region" axis, and the
+    per-event plane of the two variables is filled as an extra hist (ABCD.hist_name), from which
+    abcd.print_closure computes the predicted-vs-observed closure. Events in which either variable
+    is undefined go to the region overflow bin.
+
+    scans takes a list of names from sidm.definitions.scans. Each scan is filled as a hist named
+    "scan_<name>" whose bin edges are the scan thresholds, and Scan.results turns it into the pass
+    yield and efficiency at every threshold, replacing one selection and rerun per threshold.
+
+    normalization takes {dataset: factor}, e.g. from normalization.normalization_factors, by which
+    all weights of the dataset's events are multiplied, so that weighted hists and cutflows are
+    accumulated already scaled to cross section times luminosity. Unweighted cutflow rows,
+    unweighted_hist hists, and weight variations that count events ("unit" and "genWeight sign",
+    see sidm.definitions.weights) are left unscaled.
+
+    counter_names takes a list of names from sidm.definitions.hists.counter_defs to fill (default:
+    all). Lepton jets are only skipped for channels whose cuts, hists, and counters never read them,
+    so leaving out counters that read lepton jets lets channels without LJ cuts skip clustering.
     """
 
     def __init__(
@@ -34,6 +83,15 @@ class SidmProcessor(processor.ProcessorABC):
         histograms_cfg="configs/hist_collections.yaml",
         unweighted_hist=False,
         verbose=False,
+        profile=False,
+        pushdown=False,
+        cascade=False,
+        evt_cut_stats=None,
+        weight_variations=None,
+        abcd=None,
+        scans=None,
+        normalization=None,
+        counter_names=None,
     ):
         self.channel_names = channel_names
         self.hist_collection_names = hist_collection_names
@@ -43,13 +101,237 @@ class SidmProcessor(processor.ProcessorABC):
         self.unweighted_hist = unweighted_hist
         self.obj_defs = preLj_objs
         self.verbose = verbose
+        self.profile = profile
+        self.pushdown = pushdown
+        self.cascade = cascade
+        self.evt_cut_stats = evt_cut_stats
+        if weight_variations is None or isinstance(weight_variations, dict):
+            self.weight_variations = weight_variations
+        else:
+            unknown = [v for v in weight_variations if v not in weight_defs]
+            if unknown:
+                raise ValueError(f"Unknown weight variations {unknown}. "
+                                 f"Options are {list(weight_defs)}")
+            self.weight_variations = {v: weight_defs[v] for v in weight_variations}
+        self.abcd = abcd
+        unknown = [scan for scan in scans or [] if scan not in scan_defs]
+        if unknown:
+            raise ValueError(f"Unknown scans {unknown}. Options are {list(scan_defs)}")
+        self.scans = scans or []
+        self.normalization = normalization
+        if counter_names is None:
+            counter_names = list(counter_defs)
+        unknown = [name for name in counter_names if name not in counter_defs]
+        if unknown:
+            raise ValueError(f"Unknown counters {unknown}. Options are {list(counter_defs)}")
+        self.counter_names = counter_names
 
     def process(self, events):
         """Apply selections, make histograms and cutflow"""
+        # compute dR matching between each pair of collections once for the whole chunk
+        with matching.caching():
+            return self.process_chunk(events)
+
+    def process_chunk(self, events):
+        """Apply selections, make histograms and cutflow for one chunk of events"""
+
+        timings = {}
+
+        ### Make list of all object-level cuts; define object-level, post-lj-level, and event-level cuts per channel
+        all_obj_cuts, ch_cuts = self.build_cuts()
+
+        # optionally apply cheap event cuts shared by all channels before anything else
+        all_events = events
+        pushed_cuts = []
+        if self.pushdown:
+            with utilities.timed(timings, "push down evt cuts"):
+                pushed_cuts = self.find_pushdown_cuts(ch_cuts)
+                if pushed_cuts:
+                    pushed_selection = self.push_down_evt_cuts(events, pushed_cuts, ch_cuts)
+                    pushed_mask = pushed_selection.all(*pushed_cuts)
+                    events = events[pushed_mask]
+                    for cuts in ch_cuts.values():
+                        cuts["evt"] = cuts["evt"][len(pushed_cuts):]
 
         # create object collections
+        with utilities.timed(timings, "build objects"):
+            objs = self.build_objects(events)
+
+        cutflows = {}
+        counters = {}
+
+        # define histograms
+        hists = self.build_histograms()
+
+        # evaluate event weights for hists and for cutflows, which count all input events
+        weights = self.obj_defs["weight"](events)
+        all_weights = self.obj_defs["weight"](all_events)
+        variation_weights = None
+        all_variation_weights = None
+        if self.weight_variations is not None:
+            variation_weights = {v: f(events) for v, f in self.weight_variations.items()}
+            all_variation_weights = {v: f(all_events) for v, f in self.weight_variations.items()}
+
+        # optionally scale weights to cross section times luminosity, in double precision so that
+        # sums of many non-integer weights stay accurate
+        norm = self.normalization_factor(events.metadata["dataset"])
+        if norm is not None:
+            def scale(w):
+                return norm*ak.values_astype(w, np.float64)
+            weights = scale(weights)
+            all_weights = scale(all_weights)
+            if variation_weights is not None:
+                variation_weights = {v: w if v in unnormalized_variations else scale(w)
+                                     for v, w in variation_weights.items()}
+                all_variation_weights = {v: w if v in unnormalized_variations else scale(w)
+                                         for v, w in all_variation_weights.items()}
+
+        # evaluate all object-level cuts
+        with utilities.timed(timings, "evaluate obj cuts"):
+            obj_selection = selection.JaggedSelection(all_obj_cuts, self.verbose)
+            obj_selection.evaluate_obj_cuts(objs)
+
+        # share event-level cut results between channels that read the same collections
+        evt_cut_cache = selection.EvtCutCache()
+        measured_evt_cut_stats = {}
+
+        # skip lj clustering and post-lj objects for channels that never read them
+        lj_names = {"ljs"} | set(postLj_objs)
+        lj_channels = self.channels_using_ljs(ch_cuts, hists, lj_names)
+
+        # run each stage shared by several channels (obj cuts, lj clustering, lj and post-lj obj
+        # cuts) only once, branching into individual lj+channel pairs at the event selection
+        tree = selection.SelectionTree(ch_cuts, self.lj_reco_choices, lj_channels)
+        for lj_reco in self.lj_reco_choices:
+            cutflows[str(lj_reco)] = dict.fromkeys(self.channel_names)
+            counters[lj_reco] = dict.fromkeys(self.channel_names)
+
+        for obj_node in tree.root.children.values():
+
+            # apply object selection
+            with utilities.timed(timings, "apply obj cuts"):
+                channel_objs = obj_selection.make_and_apply_obj_masks(objs, obj_node.cuts)
+
+            for lj_reco_node in obj_node.children.values():
+                build_ljs = lj_reco_node.cuts is not None
+
+                # reconstruct lepton jets
+                with utilities.timed(timings, "build lepton jets"):
+                    lj_objs = dict(channel_objs)
+                    if build_ljs:
+                        lj_objs["ljs"] = self.build_lepton_jets(channel_objs, float(lj_reco_node.cuts))
+
+                for lj_node in lj_reco_node.children.values():
+
+                    with utilities.timed(timings, "apply post-lj obj cuts"):
+                        # apply obj selection to ljs
+                        lj_selection = selection.JaggedSelection(lj_node.cuts, self.verbose)
+                        lj_selection.evaluate_obj_cuts(lj_objs)
+                        post_lj_input_objs = lj_selection.make_and_apply_obj_masks(lj_objs, lj_node.cuts)
+
+                        # add post-lj objects to sel_objs
+                        if build_ljs:
+                            for obj in postLj_objs:
+                                post_lj_input_objs[obj] = postLj_objs[obj](post_lj_input_objs)
+
+                    for post_lj_node in lj_node.children.values():
+
+                        # apply post-lj obj selection
+                        with utilities.timed(timings, "apply post-lj obj cuts"):
+                            postLj_selection = selection.JaggedSelection(post_lj_node.cuts, self.verbose)
+                            postLj_selection.evaluate_obj_cuts(post_lj_input_objs)
+                            post_lj_sel_objs = postLj_selection.make_and_apply_obj_masks(post_lj_input_objs, post_lj_node.cuts)
+
+                        for channel, lj_reco in post_lj_node.channels:
+
+                            # build Selection objects and apply event selection
+                            with utilities.timed(timings, "apply evt cuts"):
+                                evt_cuts = ch_cuts[channel]["evt"]
+                                if self.cascade and self.evt_cut_stats is not None:
+                                    evt_cuts = selection.order_by_cost(evt_cuts, self.evt_cut_stats)
+                                evt_selection = selection.Selection(evt_cuts, self.verbose, evt_cut_cache,
+                                                                    self.cascade, measured_evt_cut_stats)
+                                if evt_cuts:
+                                    sel_objs = evt_selection.apply_evt_cuts(post_lj_sel_objs)
+                                    evt_mask = evt_selection.all_evt_cuts.all(*evt_selection.evt_cuts)
+                                else:
+                                    # no cuts left, e.g. all were pushed down, so every event passes
+                                    sel_objs = dict(post_lj_sel_objs)
+                                    evt_mask = np.ones(len(events), dtype=bool)
+
+                            # fill all hists
+                            sel_objs["ch"] = channel
+                            sel_objs["lj_reco"] = lj_reco
+                            if self.abcd is not None:
+                                try:
+                                    sel_objs["abcd"] = self.abcd.evaluate(sel_objs)
+                                except (AttributeError, KeyError, ValueError):
+                                    print(f"Warning: cannot assign ABCD regions in channel {channel}")
+
+                            # define event weights
+                            if variation_weights is not None:
+                                evt_weights = {v: w[evt_mask] for v, w in variation_weights.items()}
+                            elif self.unweighted_hist:
+                                evt_weights =  ak.ones_like(weights[evt_mask])
+                            else:
+                                evt_weights = weights[evt_mask]
+
+                            # fill histograms for this channel+lj_reco pair
+                            with utilities.timed(timings, "fill hists"):
+                                for h in hists.values():
+                                    h.fill(sel_objs, evt_weights)
+
+                            # make cutflow
+                            with utilities.timed(timings, "make cutflow"):
+                                if pushed_cuts:
+                                    all_evt_cuts = self.merge_pushed_cuts(pushed_selection, pushed_cuts,
+                                                                          pushed_mask, evt_selection)
+                                    # later cuts weren't evaluated on events removed by the pushed-down
+                                    # cuts, so their individual numbers are unknown
+                                    cutflows[str(lj_reco)][channel] = cutflow.Cutflow(all_evt_cuts, pushed_cuts + evt_selection.evt_cuts, all_weights, False, all_variation_weights)
+                                else:
+                                    cutflows[str(lj_reco)][channel] = cutflow.Cutflow(evt_selection.all_evt_cuts, evt_selection.evt_cuts, weights, not self.cascade, all_variation_weights)
+
+                            # Fill counters
+                            counters[lj_reco][channel] = {}
+                            with utilities.timed(timings, "fill counters"):
+                                for name in self.counter_names:
+                                    try:
+                                        counters[lj_reco][channel][name] = counter_defs[name](sel_objs)
+                                    except (KeyError, AttributeError):
+                                        print(f"Warning: cannot fill counter {name}. Skipping.")
+
+        # lose lj_reco dimension to cutflows if only one reco was run
+        if len(self.lj_reco_choices) == 1:
+            cutflows = cutflows[self.lj_reco_choices[0]]
+
+        out = {
+            "cutflow": cutflows,
+            "hists": {n: h.hist for n, h in hists.items()}, # output hist.Hists, not Histograms
+            "counters": counters
+        }
+        if self.profile:
+            out["timing"] = timings
+        if self.cascade:
+            out["evt_cut_stats"] = measured_evt_cut_stats
+
+        return {events.metadata["dataset"]: out}
+
+    def normalization_factor(self, dataset):
+        """Return factor by which to scale the weights of dataset, or None to leave them as is"""
+        if self.normalization is None:
+            return None
+        if dataset not in self.normalization:
+            print(f"Warning: no normalization for {dataset}. Leaving it unnormalized.")
+            return None
+        return self.normalization[dataset]
+
+    def build_objects(self, events, names=None):
+        """Create dictionary of pre-LJ object collections, optionally only those listed in names"""
         objs = {}
         for obj_name, obj_def in self.obj_defs.items():
+            if names is not None and obj_name not in names:
+                continue
             try:
                 obj = obj_def(events)
             except AttributeError:
@@ -79,91 +361,7 @@ class SidmProcessor(processor.ProcessorABC):
                 counts = ak.ones_like(objs[obj_name].x, dtype=np.int32)
                 objs[obj_name] = ak.unflatten(objs[obj_name], counts)
 
-        cutflows = {}
-        counters = {}
-
-        # define histograms
-        hists = self.build_histograms()
-
-        ### Make list of all object-level cuts; define object-level, post-lj-level, and event-level cuts per channel
-        all_obj_cuts, ch_cuts = self.build_cuts()
-
-        # evaluate all object-level cuts
-        obj_selection = selection.JaggedSelection(all_obj_cuts, self.verbose)
-        obj_selection.evaluate_obj_cuts(objs)
-
-        # loop through lj reco choices and channels, treating each lj+channel pair as a unique Selection
-        for channel in self.channel_names:
-
-            # apply object selection
-            channel_objs = obj_selection.make_and_apply_obj_masks(objs, ch_cuts[channel]["obj"])
-
-            for lj_reco in self.lj_reco_choices:
-
-                sel_objs = channel_objs
-
-                # reconstruct lepton jets
-                sel_objs["ljs"] = self.build_lepton_jets(channel_objs, float(lj_reco))
-
-                # apply obj selection to ljs
-                lj_selection = selection.JaggedSelection(ch_cuts[channel]["lj"], self.verbose)
-                lj_selection.evaluate_obj_cuts(sel_objs)
-                sel_objs = lj_selection.make_and_apply_obj_masks(sel_objs, ch_cuts[channel]["lj"])
-
-                # add post-lj objects to sel_objs
-                for obj in postLj_objs:
-                    sel_objs[obj] = postLj_objs[obj](sel_objs)
-
-                # apply post-lj obj selection
-                postLj_selection = selection.JaggedSelection(ch_cuts[channel]["postLj_obj"], self.verbose)
-                postLj_selection.evaluate_obj_cuts(sel_objs)
-                sel_objs = postLj_selection.make_and_apply_obj_masks(sel_objs, ch_cuts[channel]["postLj_obj"])
-
-                # build Selection objects and apply event selection
-                evt_selection = selection.Selection(ch_cuts[channel]["evt"], self.verbose)
-                sel_objs = evt_selection.apply_evt_cuts(sel_objs)
-
-                # fill all hists
-                sel_objs["ch"] = channel
-                sel_objs["lj_reco"] = lj_reco
-
-                # define event weights
-                if self.unweighted_hist:
-                    evt_weights =  ak.ones_like(self.obj_defs["weight"](events)[evt_selection.all_evt_cuts.all(*evt_selection.evt_cuts)])
-                else:
-                    evt_weights = self.obj_defs["weight"](events)[evt_selection.all_evt_cuts.all(*evt_selection.evt_cuts)]
-
-                # fill histograms for this channel+lj_reco pair
-                for h in hists.values():
-                    h.fill(sel_objs, evt_weights)
-
-                # make cutflow
-                if lj_reco not in cutflows:
-                    cutflows[str(lj_reco)] = {}
-                cutflows[str(lj_reco)][channel] = cutflow.Cutflow(evt_selection.all_evt_cuts, evt_selection.evt_cuts, self.obj_defs["weight"](events))
-
-                # Fill counters
-                if lj_reco not in counters:
-                    counters[lj_reco] = {}
-                counters[lj_reco][channel] = {}
-
-                for name, counter in counter_defs.items():
-                    try:
-                        counters[lj_reco][channel][name] = counter(sel_objs)
-                    except (KeyError, AttributeError) as e:
-                        print(f"Warning: cannot fill counter {name}. Skipping.")
-
-        # lose lj_reco dimension to cutflows if only one reco was run
-        if len(self.lj_reco_choices) == 1:
-            cutflows = cutflows[self.lj_reco_choices[0]]
-
-        out = {
-            "cutflow": cutflows,
-            "hists": {n: h.hist for n, h in hists.items()}, # output hist.Hists, not Histograms
-            "counters": counters
-        }
-
-        return {events.metadata["dataset"]: out}
+        return objs
 
     def make_vector(self, objs, collection, fields, type_id=None, mass=None):
         shape = ak.ones_like(objs[collection].pt)
@@ -285,18 +483,120 @@ class SidmProcessor(processor.ProcessorABC):
 
         return all_obj_cuts, ch_cuts
 
+    def channels_using_ljs(self, ch_cuts, hists, lj_names):
+        """Return the channels whose cuts, hists, or counters may read lepton jets or post-LJ objects
+
+        Hists and counters are filled for every channel, so all channels use LJs if any hist or
+        counter reads them.
+        """
+        hist_funcs = [f for h in hists.values() for f in [h.evt_mask] + [a.fill_func for a in h.axes]]
+        if self.abcd is not None:
+            hist_funcs += self.abcd.funcs()
+        funcs = hist_funcs + [counter_defs[name] for name in self.counter_names]
+        if any(collections_read(f) & lj_names for f in funcs):
+            return set(ch_cuts)
+
+        lj_channels = set()
+        for channel, cuts in ch_cuts.items():
+            if (cuts["lj"] or cuts["postLj_obj"]
+                    or any(cut not in evt_cut_defs or collections_read(evt_cut_defs[cut]) & lj_names
+                           for cut in cuts["evt"])):
+                lj_channels.add(channel)
+        return lj_channels
+
+    def find_pushdown_cuts(self, ch_cuts):
+        """Return the leading event cuts that can be applied before building all objects
+
+        A cut qualifies if every channel starts with it (after any preceding qualifying cuts) and
+        it only reads pre-LJ collections that every channel selects with the same object cuts,
+        which themselves only read pre-LJ collections.
+        """
+        channel_cuts = list(ch_cuts.values())
+        pre_lj_names = set(self.obj_defs)
+        eligible = set()
+        for obj in pre_lj_names:
+            cuts = channel_cuts[0]["obj"].get(obj, [])
+            if any(c["obj"].get(obj, []) != cuts for c in channel_cuts):
+                continue
+            if any(obj in c["lj"] or obj in c["postLj_obj"] for c in channel_cuts):
+                continue
+            if any(cut not in obj_cut_defs.get(obj, {})
+                   or not collections_read(obj_cut_defs[obj][cut]) <= pre_lj_names for cut in cuts):
+                continue
+            eligible.add(obj)
+
+        pushed_cuts = []
+        for cuts in zip(*[c["evt"] for c in channel_cuts]):
+            cut = cuts[0]
+            if any(c != cut for c in cuts) or cut not in evt_cut_defs:
+                break
+            reads = collections_read(evt_cut_defs[cut])
+            if not reads or not reads <= eligible:
+                break
+            pushed_cuts.append(cut)
+        return pushed_cuts
+
+    def push_down_evt_cuts(self, events, pushed_cuts, ch_cuts):
+        """Evaluate pushed-down event cuts on all events, building only the objects they need"""
+        reads = set().union(*[collections_read(evt_cut_defs[cut]) for cut in pushed_cuts])
+        first_channel = next(iter(ch_cuts.values()))
+        obj_cuts = {obj: cuts for obj, cuts in first_channel["obj"].items() if obj in reads}
+        for obj, cuts in obj_cuts.items():
+            for cut in cuts:
+                reads |= collections_read(obj_cut_defs[obj][cut])
+
+        # beamspot is needed to add dxy to collections
+        objs = self.build_objects(events, reads | {"bs"})
+        obj_selection = selection.JaggedSelection(obj_cuts, self.verbose)
+        obj_selection.evaluate_obj_cuts(objs)
+        objs = obj_selection.make_and_apply_obj_masks(objs, obj_cuts)
+
+        evt_selection = selection.Selection(pushed_cuts, self.verbose)
+        evt_selection.evaluate_evt_cuts(objs)
+        return evt_selection.all_evt_cuts
+
+    @staticmethod
+    def merge_pushed_cuts(pushed_selection, pushed_cuts, pushed_mask, evt_selection):
+        """Return PackedSelection over all events of the pushed-down cuts followed by a channel's
+        remaining cuts, which are recorded as failed for events removed by the pushed-down cuts
+
+        Only cumulative results are meaningful, as for Selections evaluated in cascade.
+        """
+        all_evt_cuts = PackedSelection()
+        for cut in pushed_cuts:
+            all_evt_cuts.add(cut, pushed_selection.all(cut))
+        for cut in evt_selection.evt_cuts:
+            result = np.zeros(len(pushed_mask), dtype=bool)
+            result[pushed_mask] = evt_selection.all_evt_cuts.all(cut)
+            all_evt_cuts.add(cut, result)
+        return all_evt_cuts
+
     def build_histograms(self):
         """Create dictionary of Histogram objects"""
         hist_menu = utilities.load_yaml(f"{BASE_DIR}/{self.histograms_cfg}")
         # build dictionary and create hist.Hist objects
         hists = {}
+        # Add lj_reco axis only when more than one reco is run
+        lj_reco_names = self.lj_reco_choices if len(self.lj_reco_choices) > 1 else None
+        variation_names = list(self.weight_variations) if self.weight_variations else None
+        region_names = self.abcd.regions if self.abcd is not None else None
         for collection in self.hist_collection_names:
             collection = utilities.flatten(hist_menu[collection])
             for hist_name in collection:
                 hists[hist_name] = copy.deepcopy(hist_defs[hist_name])
-                # Add lj_reco axis only when more than one reco is run
-                lj_reco_names = self.lj_reco_choices if len(self.lj_reco_choices) > 1 else None
-                hists[hist_name].make_hist(hist_name, self.channel_names, lj_reco_names)
+                hists[hist_name].make_hist(hist_name, self.channel_names, lj_reco_names,
+                                           variation_names, region_names)
+        # add plane of the ABCD variables, filled once per event in each region
+        if self.abcd is not None:
+            hists[self.abcd.hist_name] = self.abcd.plane_hist()
+            hists[self.abcd.hist_name].make_hist(self.abcd.hist_name, self.channel_names,
+                                                 lj_reco_names, variation_names, region_names)
+        # add one hist per threshold scan
+        for scan in self.scans:
+            hist_name = f"scan_{scan}"
+            hists[hist_name] = scan_defs[scan].histogram(hist_name)
+            hists[hist_name].make_hist(hist_name, self.channel_names, lj_reco_names,
+                                       variation_names, region_names)
         return hists
 
     def order(self, obj):
@@ -0,0 +1,332 @@
+"""Module to generate synthetic events for offline testing and benchmarking
+
+The generated events follow the LLPNanoAOD branch layout read by SidmProcessor (e.g. Electron_pt,
+nElectron, DSAMuon_normChi2, GenPart_genPartIdxMother), so that they can be opened with
+NanoAODSchema exactly like real ntuples. Each event contains a configurable number of dark photons
+(genAs) that decay to muon or electron pairs at an exponentially distributed displacement. Reco
+objects are produced with Poisson-distributed multiplicities, and a fraction of them are placed near
+the generated leptons so that lepton-jet clustering sees realistic collimated pairs.
+"""
+
+# python
+import atexit
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+# columnar analysis
+import numpy as np
+import awkward as ak
+import uproot
+from coffea.nanoevents import NanoEventsFactory, NanoAODSchema
+
+
+# mean number of objects per event
+default_multiplicities = {
+    "muons": 2.0,
+    "dsaMuons": 2.0,
+    "electrons": 1.5,
+    "photons": 1.0,
+    "genAs": 2,
+}
+
+triggers = [
+    "DoubleL2Mu23NoVtx_2Cha",
+    "DoubleL2Mu23NoVtx_2Cha_NoL2Matched",
+    "DoubleL2Mu23NoVtx_2Cha_CosmicSeed",
+    "DoubleL2Mu23NoVtx_2Cha_CosmicSeed_NoL2Matched",
+    "DoubleL2Mu25NoVtx_2Cha_Eta2p4",
+    "DoubleL2Mu25NoVtx_2Cha_CosmicSeed_Eta2p4",
+]
+
+electron_id_branches = [
+    "GsfEleDEtaInSeedCut_0",
+    "GsfEleDPhiInCut_0",
+    "GsfEleEInverseMinusPInverseCut_0",
+    "GsfEleFull5x5SigmaIEtaIEtaCut_0",
+    "GsfEleRelPFIsoScaledCut_0",
+    "GsfEleConversionVetoCut_0",
+    "GsfEleHadronicOverEMEnergyScaledCut_0",
+    "GsfEleMissingHitsCut_0",
+]
+
+
+def make_gen_particles(rng, n_events, n_as, mu_fraction=0.5, mean_lxy=20.0):
+    """Return GenPart branches for n_as dark photons per event decaying to lepton pairs
+
+    Each event is stored as [bound state, A_1, ..., A_n, l_1+, l_1-, ..., l_n+, l_n-] so that
+    genPartIdxMother can be used by NanoAODSchema to build children and distinctParent.
+    """
+    n_gen = 1 + 3*n_as
+    counts = np.full(n_events, n_gen)
+    a_pt = rng.exponential(60.0, (n_events, n_as)) + 10.0
+    a_eta = rng.uniform(-2.4, 2.4, (n_events, n_as))
+    a_phi = rng.uniform(-np.pi, np.pi, (n_events, n_as))
+    to_mu = rng.uniform(size=(n_events, n_as)) < mu_fraction
+    lxy = rng.exponential(mean_lxy, (n_events, n_as))
+
+    pdg_id = np.zeros((n_events, n_gen), dtype=np.int32)
+    mother = np.full((n_events, n_gen), -1, dtype=np.int32)
+    status = np.full((n_events, n_gen), 62, dtype=np.int32)
+    pt = np.zeros((n_events, n_gen), dtype=np.float32)
+    eta = np.zeros((n_events, n_gen), dtype=np.float32)
+    phi = np.zeros((n_events, n_gen), dtype=np.float32)
+    mass = np.zeros((n_events, n_gen), dtype=np.float32)
+    vx = np.zeros((n_events, n_gen), dtype=np.float32)
+    vy = np.zeros((n_events, n_gen), dtype=np.float32)
+    vz = np.zeros((n_events, n_gen), dtype=np.float32)
+
+    # bound state
+    pdg_id[:, 0] = 35
+    mass[:, 0] = 500.0
+    # dark photons
+    pdg_id[:, 1:n_as + 1] = 32
+    mother[:, 1:n_as + 1] = 0
+    pt[:, 1:n_as + 1] = a_pt
+    eta[:, 1:n_as + 1] = a_eta
+    phi[:, 1:n_as + 1] = a_phi
+    mass[:, 1:n_as + 1] = 1.2
+    # leptons, produced at the dark photon decay vertex with a small opening angle
+    lep_id = np.where(to_mu, 13, 11)
+    for i in range(n_as):
+        for j, sign in enumerate((1, -1)):
+            ix = 1 + n_as + 2*i + j
+            pdg_id[:, ix] = sign*lep_id[:, i]
+            mother[:, ix] = 1 + i
+            status[:, ix] = 1
+            pt[:, ix] = a_pt[:, i]*rng.uniform(0.2, 0.8, n_events)
+            eta[:, ix] = a_eta[:, i] + rng.normal(0, 0.02, n_events)
+            phi[:, ix] = a_phi[:, i] + rng.normal(0, 0.02, n_events)
+            mass[:, ix] = np.where(to_mu[:, i], 0.106, 0.000511)
+            vx[:, ix] = lxy[:, i]*np.cos(a_phi[:, i])
+            vy[:, ix] = lxy[:, i]*np.sin(a_phi[:, i])
+            vz[:, ix] = lxy[:, i]*np.sinh(a_eta[:, i])
+
+    def jagged(x):
+        return ak.unflatten(x.ravel(), counts)
+
+    gens = {
+        "pt": jagged(pt),
+        "eta": jagged(eta),
+        "phi": jagged(phi),
+        "mass": jagged(mass),
+        "pdgId": jagged(pdg_id),
+        "status": jagged(status),
+        "genPartIdxMother": jagged(mother),
+        "vx": jagged(vx),
+        "vy": jagged(vy),
+        "vz": jagged(vz),
+    }
+    # flattened lepton directions, used to seed collimated reco objects
+    leptons = {
+        "eta": eta[:, n_as + 1:],
+        "phi": phi[:, n_as + 1:],
+        "pt": pt[:, n_as + 1:],
+        "is_mu": np.abs(pdg_id[:, n_as + 1:]) == 13,
+    }
+    return gens, leptons
+
+
+def make_kinematics(rng, counts, leptons, lepton_type, matched_fraction=0.7):
+    """Return pt, eta, and phi of reco objects, placing a fraction of them near gen leptons"""
+    n_total = int(np.sum(counts))
+    evt_ix = np.repeat(np.arange(len(counts)), counts)
+    pt = rng.exponential(25.0, n_total) + 3.0
+    eta = rng.uniform(-2.5, 2.5, n_total)
+    phi = rng.uniform(-np.pi, np.pi, n_total)
+
+    # choose a random lepton of the requested type in the same event, where one exists
+    n_leps = leptons["eta"].shape[1]
+    lep_ix = rng.integers(0, n_leps, n_total)
+    is_type = leptons["is_mu"][evt_ix, lep_ix] == (lepton_type == "mu")
+    near = (rng.uniform(size=n_total) < matched_fraction) & is_type
+    eta = np.where(near, leptons["eta"][evt_ix, lep_ix] + rng.normal(0, 0.01, n_total), eta)
+    phi = np.where(near, leptons["phi"][evt_ix, lep_ix] + rng.normal(0, 0.01, n_total), phi)
+    pt = np.where(near, leptons["pt"][evt_ix, lep_ix]*rng.normal(1.0, 0.05, n_total), pt)
+    phi = (phi + np.pi) % (2*np.pi) - np.pi
+    return pt.astype(np.float32), eta.astype(np.float32), phi.astype(np.float32)
+
+
+def make_branches(n_events, multiplicities=None, seed=0, mu_fraction=0.5):
+    """Return dict of LLPNanoAOD-like branches for n_events synthetic events
+
+    multiplicities maps "muons", "dsaMuons", "electrons", and "photons" to their mean number per
+    event and "genAs" to the fixed number of dark photons per event.
+    """
+    multiplicities = {**default_multiplicities, **(multiplicities or {})}
+    rng = np.random.default_rng(seed)
+    gens, leptons = make_gen_particles(rng, n_events, int(multiplicities["genAs"]), mu_fraction)
+
+    def counts(name):
+        return rng.poisson(multiplicities[name], n_events)
+
+    def uniform(low, high, n, dtype=np.float32):
+        return rng.uniform(low, high, n).astype(dtype)
+
+    def randint(low, high, n):
+        return rng.integers(low, high, n).astype(np.int32)
+
+    def boolean(p, n):
+        return rng.uniform(size=n) < p
+
+    branches = {}
+
+    # muons
+    n_mu = counts("muons")
+    pt, eta, phi = make_kinematics(rng, n_mu, leptons, "mu")
+    n = len(pt)
+    branches["Muon"] = ak.unflatten(ak.zip({
+        "pt": pt,
+        "eta": eta,
+        "phi": phi,
+        "mass": np.full(n, 0.106, dtype=np.float32),
+        "charge": rng.choice(np.array([-1, 1], dtype=np.int32), n),
+        "looseId": boolean(0.9, n),
+        "dxy": rng.normal(0, 0.5, n).astype(np.float32),
+        "dz": rng.normal(0, 1.0, n).astype(np.float32),
+    }), n_mu)
+
+    # displaced standalone muons
+    n_dsa = counts("dsaMuons")
+    pt, eta, phi = make_kinematics(rng, n_dsa, leptons, "mu")
+    n = len(pt)
+    branches["DSAMuon"] = ak.unflatten(ak.zip({
+        "pt": pt,
+        "eta": eta,
+        "phi": phi,
+        "charge": rng.choice(np.array([-1, 1], dtype=np.int32), n),
+        "dxy": rng.normal(0, 20.0, n).astype(np.float32),
+        "d0": rng.exponential(10.0, n).astype(np.float32),
+        "displacedID": boolean(0.8, n),
+        "trkNumDTHits": randint(0, 40, n),
+        "trkNumCSCHits": randint(0, 20, n),
+        "normChi2": rng.exponential(1.5, n).astype(np.float32),
+        "ptErr": (pt*rng.exponential(0.3, n)).astype(np.float32),
+        "muonMatch1": randint(0, 4, n),
+        "nSegments": randint(1, 8, n),
+    }), n_dsa)
+
+    # electrons
+    n_ele = counts("electrons")
+    pt, eta, phi = make_kinematics(rng, n_ele, leptons, "e")
+    n = len(pt)
+    electrons = {
+        "pt": pt,
+        "eta": eta,
+        "phi": phi,
+        "mass": np.full(n, 0.000511, dtype=np.float32),
+        "charge": rng.choice(np.array([-1, 1], dtype=np.int32), n),
+        "cutBased": randint(0, 5, n),
+        "idbit": randint(0, 1024, n),
+        "dxy": rng.normal(0, 0.5, n).astype(np.float32),
+        "dz": rng.normal(0, 1.0, n).astype(np.float32),
+    }
+    for branch in electron_id_branches:
+        electrons[branch] = rng.exponential(0.05, n).astype(np.float32)
+    branches["Electron"] = ak.unflatten(ak.zip(electrons), n_ele)
+
+    # photons
+    n_pho = counts("photons")
+    pt, eta, phi = make_kinematics(rng, n_pho, leptons, "e", matched_fraction=0.3)
+    n = len(pt)
+    barrel = np.abs(eta) < 1.479
+    branches["Photon"] = ak.unflatten(ak.zip({
+        "pt": pt,
+        "eta": eta,
+        "phi": phi,
+        "mass": np.zeros(n, dtype=np.float32),
+        "cutBased": randint(0, 4, n),
+        "pixelSeed": boolean(0.3, n),
+        "electronVeto": boolean(0.7, n),
+        "isScEtaEB": barrel,
+        "isScEtaEE": ~barrel & (np.abs(eta) < 2.5),
+    }), n_pho)
+
+    # generator-level particles
+    branches["GenPart"] = ak.zip(gens)
+
+    # one-per-event quantities
+    branches["PV_npvs"] = randint(1, 60, n_events)
+    branches["PV_ndof"] = uniform(0, 100, n_events)
+    branches["PV_x"] = rng.normal(0, 0.01, n_events).astype(np.float32)
+    branches["PV_y"] = rng.normal(0, 0.01, n_events).astype(np.float32)
+    branches["PV_z"] = rng.normal(0, 10.0, n_events).astype(np.float32)
+    branches["BS_x"] = np.zeros(n_events, dtype=np.float32)
+    branches["BS_y"] = np.zeros(n_events, dtype=np.float32)
+    branches["BS_z"] = np.zeros(n_events, dtype=np.float32)
+    branches["MET_pt"] = rng.exponential(30.0, n_events).astype(np.float32)
+    branches["MET_phi"] = uniform(-np.pi, np.pi, n_events)
+    for trigger in triggers:
+        branches[f"HLT_{trigger}"] = boolean(0.3, n_events)
+    # mostly positive generator weights, as in NLO samples
+    branches["genWeight"] = np.where(boolean(0.9, n_events), 1.0, -1.0).astype(np.float32)
+
+    return branches
+
+
+def generation_params(n_events, multiplicities=None, seed=0, mu_fraction=0.5):
+    """Return the parameters that determine a set of synthetic events as a JSON string"""
+    return json.dumps({
+        "n_events": n_events,
+        "multiplicities": {**default_multiplicities, **(multiplicities or {})},
+        "seed": seed,
+        "mu_fraction": mu_fraction,
+    }, sort_keys=True)
+
+
+def write_root(path, n_events, multiplicities=None, seed=0, mu_fraction=0.5):
+    """Write synthetic events to an Events tree in a new ROOT file and return its path
+
+    The generation parameters are stored next to the tree, so that make_events can tell whether an
+    existing file holds the events it was asked for.
+    """
+    branches = make_branches(n_events, multiplicities, seed, mu_fraction)
+    with uproot.recreate(path) as out_file:
+        out_file["Events"] = branches
+        out_file["synthetic_params"] = generation_params(n_events, multiplicities, seed,
+                                                         mu_fraction)
+    return path
+
+
+def read_params(path):
+    """Return the generation parameters stored in a synthetic ROOT file, or None if it has none"""
+    try:
+        with uproot.open(path) as in_file:
+            return str(in_file["synthetic_params"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def temp_dir():
+    """Return a temporary directory for synthetic files that is removed when python exits"""
+    path = tempfile.mkdtemp(prefix="sidm_synthetic_")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+def make_events(n_events, multiplicities=None, seed=0, mu_fraction=0.5, path=None,
+                schemaclass=NanoAODSchema, metadata=None):
+    """Return NanoEvents built from synthetic events
+
+    Events are written to path and read back lazily, so that column loading behaves as it does for
+    real ntuples. An existing file at path is reused only if it was written with the same
+    n_events, multiplicities, seed, and mu_fraction, and is regenerated otherwise; the caller owns
+    files at an explicit path. Without a path, events are written to a file named after their
+    parameters in a temporary directory that is shared between calls and removed when python
+    exits.
+    """
+    params = generation_params(n_events, multiplicities, seed, mu_fraction)
+    if path is None:
+        name = hashlib.sha1(params.encode()).hexdigest()[:16]
+        path = os.path.join(temp_dir(), f"synthetic_{name}.root")
+    if read_params(path) != params:
+        write_root(path, n_events, multiplicities, seed, mu_fraction)
+    metadata = {"dataset": "synthetic", **(metadata or {})}
+    return NanoEventsFactory.from_root(
+        path,
+        schemaclass=schemaclass,
+        metadata=metadata,
+    ).events()
@@ -1,12 +1,22 @@
 """Module to define miscellaneous helper methods"""
 
+import contextlib
+import importlib
+import time
 import yaml
 import numpy as np
 import awkward as ak
-import matplotlib.pyplot as plt
-import mplhep as hep
-import hist.intervals
 from sidm import BASE_DIR
+from sidm.tools import matching
+
+# plotting helpers live in sidm.tools.plotting and are only imported when first used
+plotting_names = ["set_plot_style", "plot", "get_eff_hist", "plot_ratio"]
+
+def __getattr__(name):
+    """Import plotting helpers on first access, e.g. utilities.plot"""
+    if name in plotting_names:
+        return getattr(importlib.import_module("sidm.tools.plotting"), name)
+    raise AttributeError(f"module {__name__} has no attribute {name}")
 
 def print_list(l):
     """Print one list element per line"""
@@ -17,6 +27,15 @@ def print_debug(name, val, print_mode=True):
     if print_mode:
         print(f"{name}: {val}")
 
+@contextlib.contextmanager
+def timed(timings, name):
+    """Add the wall time spent inside the with block to timings[name]"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
 def partition_list(l, condition):
     """Given a single list, return separate lists of elements that pass or fail a condition"""
     passes = []
@@ -63,7 +82,11 @@ def as_int(array):
 
 def dR(obj1, obj2):
     """Return dR between obj1 and the nearest obj2; returns None if no obj2 is found"""
-    return obj1.nearest(obj2, return_metric=True)[1]
+    return matching.match_table(obj1, obj2).dr
+
+def nearest(obj1, obj2, threshold=None):
+    """Return nearest obj2 to each obj1; returns None if it is farther than threshold"""
+    return matching.match_table(obj1, obj2).nearest(threshold)
 
 def dR_outer(obj1, obj2):
     """Return dR between outer tracks of obj1 and obj2"""
@@ -75,7 +98,7 @@ def drop_none(obj):
 
 def matched(obj1, obj2, r):
     """Return set of obj1 that have >=1 obj2 within r; remove None entries before returning"""
-    return drop_none(obj1[dR(obj1, obj2) < r])
+    return matching.match_table(obj1, obj2).matched(r)
 
 def rho(obj, ref=None, use_v=False):
     """Return transverse distance between object and reference (default reference is 0,0)"""
@@ -105,53 +128,17 @@ def lxy(obj):
     """Return transverse distance between production and decay vertices"""
     return rho(obj, ak.firsts(obj.children, axis=2), use_v=True)
 
-def set_plot_style(style='cms', dpi=50):
-    """Set plotting style using mplhep"""
-    if style == 'cms':
-        plt.style.use(hep.style.CMS)
-    else:
-        raise NotImplementedError
-    plt.rcParams['figure.dpi'] = dpi
-
-def plot(hists, skip_label=False, **kwargs):
-    """Plot using hep.hist(2d)plot and add cms labels"""
-
-    # set default arguments
-    default_kwargs = {
-        'flow': "sum",
-    }
-    kwargs = {**default_kwargs, **kwargs}
-
-    dim = len(hists[0].axes) if isinstance(hists, list) else len(hists.axes)
-    if dim == 1:
-        h = hep.histplot(hists, **kwargs)
-    elif dim == 2:
-        h = hep.hist2dplot(hists, **kwargs)
-    else:
-        raise NotImplementedError(f"Cannot plot {dim}-dimensional hist")
-    if not skip_label:
-        hep.cms.label()
-    return h
-
-def get_eff_hist(num_hist, denom_hist):
-    """Returns the histogram of num_hist/denom_hist and a 2D numpy array of the up/down errors on the efficiency. Plot the errors using yerr=errors when plotting. """
-    denom_vals  = denom_hist.values()
-    num_vals   = num_hist.values()
-
-    errors = hist.intervals.ratio_uncertainty(num_vals,denom_vals,'efficiency')
-    eff_values = num_vals/denom_vals
-
-    eff_hist = hist.Hist(*num_hist.axes)
-    eff_hist.values()[:] = eff_values
-    return eff_hist, errors
-
 def load_yaml(cfg):
     """Load yaml files and return corresponding dict"""
     with open(cfg, encoding="utf8") as yaml_cfg:
         return yaml.safe_load(yaml_cfg)
 
-def make_fileset(samples, ntuple_version, max_files=-1, location_cfg="signal_v8.yaml", fileset=None):
-    """Make fileset to pass to processor.runner"""
+def make_fileset(samples, ntuple_version, max_files=-1, location_cfg="signal_v8.yaml", fileset=None,
+                 cache=None):
+    """Make fileset to pass to processor.runner
+
+    If cache, a sidm.tools.file_cache.FileCache, is given, files are replaced by their local copies.
+    """
     # assume location_cfg is stored in sidm/configs/ntuples/
     location_cfg = f"{BASE_DIR}/configs/ntuples/" + location_cfg
     locations = load_yaml(location_cfg)[ntuple_version]
@@ -163,6 +150,8 @@ def make_fileset(samples, ntuple_version, max_files=-1, location_cfg="signal_v8.
         if max_files != -1:
             file_list = file_list[:max_files]
         fileset[sample] = file_list
+    if cache is not None:
+        fileset.update(cache.localize({sample: fileset[sample] for sample in samples}))
     return fileset
 
 def check_bit(array, bit_num):
@@ -179,20 +168,6 @@ def get_hist_mean(h):
     """Return mean of 1D histogram"""
     return np.atleast_1d(h.profile(axis=0).view())[0].value
 
-def plot_ratio(num, den, **kwargs):
-    plt.subplots(2, 1, figsize=(10, 10), sharex=True,
-                      gridspec_kw={'height_ratios': [2, 1],'hspace':0})
-    plt.subplot(2, 1, 1)
-    plot(num, flow='none')
-    plot(den, flow='none')
-    if "legend" in kwargs:
-        plt.legend(kwargs["legend"])
-    plt.subplot(2, 1, 2)
-    eff, errors = get_eff_hist(num, den)
-    plot(eff,yerr=errors,skip_label=True,color="black")
-    plt.ylabel("Efficiency")
-    plt.ylim(0, 1.2)
-
 def round_sigfig(val, digits=1):
     """Return a number rounded to a given number of significant figures. Uses magic copied from
     https://stackoverflow.com/questions/3410976/how-to-round-a-number-to-significant-figures-in-python"""
@@ -0,0 +1,28 @@
+"""Test that pushing down event cuts doesn't change the output of SidmProcessor"""
+
+# columnar analysis
+import numpy as np
+import pytest
+# local
+from sidm.tools import synthetic
+from sidm.tools.sidm_processor import SidmProcessor
+
+
+@pytest.fixture(scope="module")
+def events():
+    return synthetic.make_events(500, seed=1)
+
+
+@pytest.mark.parametrize("channels", [["baseNoLj"], ["baseNoLj", "4mu"]])
+def test_pushdown_matches_baseline(events, channels):
+    baseline = SidmProcessor(channels, ["base"]).process(events)["synthetic"]
+    pushed = SidmProcessor(channels, ["base"], pushdown=True).process(events)["synthetic"]
+
+    for name, h in baseline["hists"].items():
+        np.testing.assert_array_equal(h.values(flow=True), pushed["hists"][name].values(flow=True),
+                                      err_msg=name)
+    for channel in channels:
+        expected = [(e.cut, e.n_evts, e.n_all) for e in baseline["cutflow"][channel].flow]
+        assert [(e.cut, e.n_evts, e.n_all) for e in pushed["cutflow"][channel].flow] == expected
+        # later cuts only see events that passed the pushed-down cuts
+        assert not pushed["cutflow"][channel].individual